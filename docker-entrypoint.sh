@@ -20,10 +20,19 @@ if [ "$REVISION_COUNT" -eq "0" ]; then
     alembic revision --autogenerate -m "Initial migration"
 fi
 
-# Apply migrations
-echo "Applying migrations..."
-alembic upgrade head
+# Apply migrations; RUN_MIGRATIONS=false skips the extra Python process when
+# the schema is managed elsewhere (the app still creates missing tables)
+if [ "${RUN_MIGRATIONS:-true}" = "true" ]; then
+    echo "Applying migrations..."
+    alembic upgrade head
+fi
+
+# --reload runs the app under a file watcher in a second process; only for development
+RELOAD_FLAG=""
+if [ "${RELOAD:-false}" = "true" ]; then
+    RELOAD_FLAG="--reload"
+fi
 
 # Start the API server
 echo "Starting API server..."
-exec uvicorn src.main:app --host 0.0.0.0 --port 8000 --reload
+exec uvicorn src.main:app --host 0.0.0.0 --port 8000 $RELOAD_FLAG
@@ -14,11 +14,10 @@ config = context.config
 if config.config_file_name is not None:
     fileConfig(config.config_file_name)
 
-# Import the SQLALCHEMY_DATABASE_URL from database.py
-from src.infrastructure.database.database import SQLALCHEMY_DATABASE_URL
+# Override the sqlalchemy.url from alembic.ini with the application's DATABASE_URL
+from src.settings import Settings
 
-# Override the sqlalchemy.url from alembic.ini with the one from database.py
-config.set_main_option("sqlalchemy.url", SQLALCHEMY_DATABASE_URL)
+config.set_main_option("sqlalchemy.url", Settings().database_url)
 
 # add your model's MetaData object here
 # for 'autogenerate' support
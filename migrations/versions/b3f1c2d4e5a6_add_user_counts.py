@@ -0,0 +1,77 @@
+"""Add maintained user counts
+
+Revision ID: b3f1c2d4e5a6
+Revises: 60d6118f18af
+Create Date: 2026-10-17 09:12:04.318842
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3f1c2d4e5a6'
+down_revision: Union[str, None] = '60d6118f18af'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+TRIGGERS = [
+    """
+    CREATE TRIGGER IF NOT EXISTS users_count_insert AFTER INSERT ON users
+    BEGIN
+        UPDATE user_counts SET count = count + 1 WHERE is_active = COALESCE(NEW.is_active, 1);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS users_count_delete AFTER DELETE ON users
+    BEGIN
+        UPDATE user_counts SET count = count - 1 WHERE is_active = COALESCE(OLD.is_active, 1);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS users_count_update AFTER UPDATE OF is_active ON users
+    WHEN COALESCE(OLD.is_active, 1) <> COALESCE(NEW.is_active, 1)
+    BEGIN
+        UPDATE user_counts SET count = count - 1 WHERE is_active = COALESCE(OLD.is_active, 1);
+        UPDATE user_counts SET count = count + 1 WHERE is_active = COALESCE(NEW.is_active, 1);
+    END
+    """,
+]
+
+
+def upgrade() -> None:
+    tables = sa.inspect(op.get_bind()).get_table_names()
+    if "users" not in tables:
+        # Fresh database: create_tables() builds users, user_counts and the triggers
+        return
+
+    if "user_counts" not in tables:
+        op.create_table(
+            "user_counts",
+            sa.Column("is_active", sa.Boolean(), nullable=False),
+            sa.Column("count", sa.Integer(), nullable=False),
+            sa.PrimaryKeyConstraint("is_active"),
+        )
+
+    for trigger in TRIGGERS:
+        op.execute(trigger)
+
+    # Backfill from the live table
+    op.execute("DELETE FROM user_counts")
+    op.execute(
+        """
+        INSERT INTO user_counts (is_active, count)
+        SELECT flag, (SELECT COUNT(*) FROM users WHERE COALESCE(is_active, 1) = flag)
+        FROM (SELECT 0 AS flag UNION ALL SELECT 1)
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS users_count_insert")
+    op.execute("DROP TRIGGER IF EXISTS users_count_delete")
+    op.execute("DROP TRIGGER IF EXISTS users_count_update")
+    op.drop_table("user_counts")
@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import List, Optional
 
-from pydantic import BaseModel, EmailStr, Field
+from pydantic import BaseModel, EmailStr, Field, model_validator
 
 
 class UserCreate(BaseModel):
@@ -10,12 +10,34 @@ class UserCreate(BaseModel):
     password: str = Field(..., min_length=8)
 
 
+class UserImport(UserCreate):
+    """A row of a bulk import; carries either a plain password or an existing hash."""
+    password: Optional[str] = Field(None, min_length=8)
+    hashed_password: Optional[str] = None
+    is_active: bool = True
+
+    @model_validator(mode="after")
+    def check_single_password(self) -> "UserImport":
+        if (self.password is None) == (self.hashed_password is None):
+            raise ValueError("Provide exactly one of password or hashed_password")
+        return self
+
+
 class UserUpdate(BaseModel):
+    """Fields to change; omitted fields are left as they are."""
     username: Optional[str] = Field(None, min_length=3, max_length=50)
     email: Optional[EmailStr] = None
     password: Optional[str] = Field(None, min_length=8)
     is_active: Optional[bool] = None
 
+    @model_validator(mode="after")
+    def check_no_nulls(self) -> "UserUpdate":
+        # None only means "not given"; every column is NOT NULL
+        nulls = sorted(name for name in self.model_fields_set if getattr(self, name) is None)
+        if nulls:
+            raise ValueError(f"{', '.join(nulls)} cannot be null")
+        return self
+
 
 class UserResponse(BaseModel):
     id: int
@@ -26,6 +48,42 @@ class UserResponse(BaseModel):
     updated_at: datetime
 
 
+class UsersBulkCreate(BaseModel):
+    items: List[UserCreate] = Field(..., min_length=1)
+
+
+class BulkUserResult(BaseModel):
+    index: int
+    user: Optional[UserResponse] = None
+    error: Optional[str] = None
+
+
+class UsersBulkCreateResponse(BaseModel):
+    created: int
+    failed: int
+    results: List[BulkUserResult]
+
+
+class UsersBulkDeactivate(BaseModel):
+    """Selects the users matching every given filter."""
+    ids: Optional[List[int]] = Field(None, min_length=1)
+    created_before: Optional[datetime] = None
+
+    @model_validator(mode="after")
+    def check_selection(self) -> "UsersBulkDeactivate":
+        if self.ids is None and self.created_before is None:
+            raise ValueError("Provide ids or created_before")
+        return self
+
+
+class UsersBulkDelete(UsersBulkDeactivate):
+    is_active: Optional[bool] = None
+
+
+class UsersBulkActionResponse(BaseModel):
+    affected: int
+
+
 class UsersPage(BaseModel):
     items: List[UserResponse]
     total: int
@@ -34,6 +92,13 @@ class UsersPage(BaseModel):
     pages: int
 
 
+class UsersCursorPage(BaseModel):
+    items: List[UserResponse]
+    size: int
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
+
+
 class Token(BaseModel):
     access_token: str
     token_type: str
@@ -1,8 +1,9 @@
+import asyncio
 from typing import Optional
 
 from src.application.dtos.user_dto import Token
 from src.domain.entities.user import User
-from src.domain.repositories.user_repository import UserRepository
+from src.domain.repositories.user_repository import AsyncUserRepository, UserRepository
 from src.domain.services.auth_service import AuthService
 
 
@@ -11,13 +12,32 @@ class AuthUseCase:
         self.user_repository = user_repository
         self.auth_service = auth_service
 
-    def authenticate(self, username: str, password: str) -> Optional[Token]:
+    async def authenticate(self, username: str, password: str) -> Optional[Token]:
         """Authenticate user and return token."""
-        user = self.user_repository.get_by_username(username)
+        user = await asyncio.to_thread(self.user_repository.get_by_username, username)
         if not user:
             return None
 
-        user = self.auth_service.authenticate_user(user, password)
+        user = await self.auth_service.authenticate_user_async(user, password)
+        if not user:
+            return None
+
+        access_token = self.auth_service.create_access_token(data={"sub": str(user.id)})
+        return Token(access_token=access_token, token_type="bearer")
+
+
+class AsyncAuthUseCase:
+    def __init__(self, user_repository: AsyncUserRepository, auth_service: AuthService):
+        self.user_repository = user_repository
+        self.auth_service = auth_service
+
+    async def authenticate(self, username: str, password: str) -> Optional[Token]:
+        """Authenticate user and return token."""
+        user = await self.user_repository.get_by_username(username)
+        if not user:
+            return None
+
+        user = await self.auth_service.authenticate_user_async(user, password)
         if not user:
             return None
 
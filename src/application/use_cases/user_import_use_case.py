@@ -0,0 +1,209 @@
+import asyncio
+import csv
+import json
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from pydantic import ValidationError
+
+from src.application.dtos.user_dto import UserImport
+from src.application.use_cases.user_use_case import hash_pending_passwords
+from src.domain.entities.user import User
+from src.domain.services.auth_service import AuthService
+from src.domain.services.user_service import AsyncUserService, UserService
+
+IMPORT_FORMATS = ("csv", "ndjson")
+
+
+class ImportFileError(ValueError):
+    """The file cannot be read past this line, e.g. it is not UTF-8 or not valid CSV."""
+
+
+def read_import_rows(lines: Iterable[str], import_format: str) -> Iterator[Tuple[int, Any]]:
+    """
+    Lazily parse CSV or NDJSON lines into (line number, row) pairs.
+
+    A file that cannot be decoded or parsed ends the rows with an
+    ``ImportFileError`` in place of the row.
+    """
+    line_number = 0
+    try:
+        if import_format == "csv":
+            reader = csv.DictReader(lines)
+            for row in reader:
+                line_number = reader.line_num
+                # Empty cells mean "not provided", so optional columns can be left blank
+                yield line_number, {key: value for key, value in row.items() if key and value}
+            return
+
+        for line_number, line in enumerate(lines, 1):
+            if not line.strip():
+                continue
+            try:
+                yield line_number, json.loads(line)
+            except ValueError:
+                yield line_number, line
+    except UnicodeDecodeError as e:
+        yield line_number + 1, ImportFileError(f"File is not valid UTF-8: {e.reason} at byte {e.start}")
+    except csv.Error as e:
+        yield line_number + 1, ImportFileError(f"File is not valid CSV: {e}")
+
+
+def _format_error(error: Exception) -> str:
+    if isinstance(error, ValidationError):
+        return "; ".join(
+            f"{'.'.join(str(part) for part in item['loc']) or 'row'}: {item['msg']}" for item in error.errors()
+        )
+    return str(error)
+
+
+def _rejected(line: int, row: Any, error: Union[str, Exception]) -> dict:
+    # Plain passwords are never echoed back into reports
+    if isinstance(row, dict):
+        row = {key: value for key, value in row.items() if key != "password"}
+    return {"type": "rejected", "line": line, "error": _format_error(error), "row": row}
+
+
+class UserImportUseCase:
+    """
+    Imports users from a stream of parsed rows in chunks.
+
+    Each chunk is validated off the event loop, rows whose identity is taken
+    are rejected, the remaining plain passwords are hashed in parallel
+    (pre-hashed argon2/bcrypt values are stored as-is), and valid rows are
+    inserted in one transaction per chunk. Progress is reported as a stream
+    of event dicts: ``rejected`` for each bad row, ``progress`` after each
+    chunk and a final ``summary``.
+
+    ``max_plain_passwords`` caps the passwords hashed per import, and
+    ``admit_hashes`` is asked before each chunk's batch is hashed; rows over
+    either bound are rejected rather than hashed.
+    """
+
+    def __init__(
+        self,
+        user_service: UserService,
+        auth_service: AuthService,
+        chunk_size: int = 1000,
+        max_plain_passwords: Optional[int] = None,
+        admit_hashes: Optional[Callable[[int], Awaitable[bool]]] = None,
+    ):
+        self.user_service = user_service
+        self.auth_service = auth_service
+        self.chunk_size = chunk_size
+        self.max_plain_passwords = max_plain_passwords
+        self.admit_hashes = admit_hashes
+
+    async def _find_conflicts(self, users: List[User]) -> Dict[int, ValueError]:
+        return await asyncio.to_thread(self.user_service.find_conflicts, users)
+
+    async def _create_users(self, users: List[User], conflicts: Dict[int, ValueError]) -> List[Union[User, ValueError]]:
+        return await asyncio.to_thread(self.user_service.create_users, users, conflicts)
+
+    async def _refuse_over_budget(
+        self, plain: List[int], conflicts: Dict[int, ValueError], hashed_so_far: int
+    ) -> int:
+        """Add the plain-password rows that may not be hashed to ``conflicts``; returns how many may."""
+        allowed = len(plain)
+        if self.max_plain_passwords is not None:
+            allowed = max(0, min(allowed, self.max_plain_passwords - hashed_so_far))
+            for index in plain[allowed:]:
+                conflicts[index] = ValueError(
+                    f"At most {self.max_plain_passwords} plain passwords can be hashed per import, "
+                    "send hashed_password instead"
+                )
+            plain = plain[:allowed]
+        if plain and self.admit_hashes is not None and not await self.admit_hashes(len(plain)):
+            for index in plain:
+                conflicts[index] = ValueError("Rate limit exceeded for plain passwords, send hashed_password instead")
+            allowed = 0
+        return allowed
+
+    def _read_chunk(self, rows: Iterator[Tuple[int, Any]]) -> Tuple[List[Tuple[int, UserImport]], List[dict], int]:
+        valid, rejected, consumed = [], [], 0
+        for line, row in rows:
+            consumed += 1
+            if isinstance(row, ImportFileError):
+                # Nothing after this point can be read, so the import stops here
+                rejected.append(_rejected(line, None, row))
+                break
+            if not isinstance(row, dict):
+                rejected.append(_rejected(line, row, "Expected a JSON object"))
+            else:
+                try:
+                    item = UserImport.model_validate(row)
+                except ValidationError as e:
+                    rejected.append(_rejected(line, row, e))
+                else:
+                    if item.hashed_password is not None and not self.auth_service.is_supported_hash(item.hashed_password):
+                        rejected.append(_rejected(line, row, "Unsupported password hash scheme"))
+                    else:
+                        valid.append((line, item))
+            if consumed == self.chunk_size:
+                break
+        return valid, rejected, consumed
+
+    async def import_users(self, rows: Iterable[Tuple[int, Any]]) -> AsyncIterator[dict]:
+        """Import rows and yield progress events."""
+        rows = iter(rows)
+        processed = imported = rejected = hashed = 0
+
+        while True:
+            valid, rejected_rows, consumed = await asyncio.to_thread(self._read_chunk, rows)
+            if not consumed:
+                break
+
+            users = [
+                User(
+                    username=item.username,
+                    email=item.email,
+                    hashed_password=item.hashed_password or "",
+                    is_active=item.is_active,
+                )
+                for _, item in valid
+            ]
+            passwords = [item.password for _, item in valid]
+
+            try:
+                # Only rows that will be inserted are worth hashing
+                conflicts = await self._find_conflicts(users)
+                plain = [
+                    index for index, password in enumerate(passwords)
+                    if password is not None and index not in conflicts
+                ]
+                hashed += await self._refuse_over_budget(plain, conflicts, hashed)
+                await hash_pending_passwords(self.auth_service, users, passwords, conflicts)
+                results = await self._create_users(users, conflicts)
+            except ValueError as e:
+                results = [e] * len(users)
+
+            for (line, item), result in zip(valid, results):
+                if isinstance(result, ValueError):
+                    rejected_rows.append(_rejected(line, item.model_dump(exclude_none=True), result))
+
+            for event in rejected_rows:
+                yield event
+
+            processed += consumed
+            rejected += len(rejected_rows)
+            imported = processed - rejected
+            yield {"type": "progress", "processed": processed, "imported": imported, "rejected": rejected}
+
+        yield {"type": "summary", "processed": processed, "imported": imported, "rejected": rejected}
+
+
+class AsyncUserImportUseCase(UserImportUseCase):
+    def __init__(
+        self,
+        user_service: AsyncUserService,
+        auth_service: AuthService,
+        chunk_size: int = 1000,
+        max_plain_passwords: Optional[int] = None,
+        admit_hashes: Optional[Callable[[int], Awaitable[bool]]] = None,
+    ):
+        super().__init__(user_service, auth_service, chunk_size, max_plain_passwords, admit_hashes)
+
+    async def _find_conflicts(self, users: List[User]) -> Dict[int, ValueError]:
+        return await self.user_service.find_conflicts(users)
+
+    async def _create_users(self, users: List[User], conflicts: Dict[int, ValueError]) -> List[Union[User, ValueError]]:
+        return await self.user_service.create_users(users, conflicts)
@@ -1,19 +1,138 @@
-from typing import Optional
+import asyncio
+import base64
+import binascii
+from datetime import datetime, timezone
+from typing import AsyncIterator, Dict, Iterator, List, Optional, Tuple, Union
 
-from src.application.dtos.user_dto import UserCreate, UserResponse, UserUpdate, UsersPage
-from src.domain.entities.user import User
+from src.application.dtos.user_dto import (
+    BulkUserResult,
+    UserCreate,
+    UserResponse,
+    UsersBulkActionResponse,
+    UsersBulkCreateResponse,
+    UsersBulkDeactivate,
+    UsersBulkDelete,
+    UsersCursorPage,
+    UserUpdate,
+    UsersPage,
+)
+from src.domain.entities.user import User, UserView
 from src.domain.services.auth_service import AuthService
-from src.domain.services.user_service import UserService
+from src.domain.services.user_service import AsyncUserService, UserService
+
+
+def _to_response(user: Union[User, UserView]) -> UserResponse:
+    return UserResponse(
+        id=user.id,
+        username=user.username,
+        email=user.email,
+        is_active=user.is_active,
+        created_at=user.created_at,
+        updated_at=user.updated_at,
+    )
+
+
+def _encode_cursor(direction: str, user_id: int) -> str:
+    return base64.urlsafe_b64encode(f"{direction}:{user_id}".encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> Tuple[str, Optional[int]]:
+    """Return ("after" | "before", user ID); an empty cursor starts at the beginning."""
+    if not cursor:
+        return "after", None
+    try:
+        direction, user_id = base64.urlsafe_b64decode(cursor.encode()).decode().split(":")
+        if direction in ("after", "before"):
+            return direction, int(user_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        pass
+    raise ValueError("Invalid cursor")
+
+
+def _cursor_page(users: List[UserView], size: int, direction: str, cursor_id: Optional[int]) -> UsersCursorPage:
+    # One extra row was fetched to learn whether the walk can go further
+    has_more = len(users) > size
+    if direction == "before":
+        users = users[-size:] if has_more else users
+    else:
+        users = users[:size]
+
+    next_cursor = prev_cursor = None
+    if users:
+        if direction == "before":
+            next_cursor = _encode_cursor("after", users[-1].id)
+            prev_cursor = _encode_cursor("before", users[0].id) if has_more else None
+        else:
+            next_cursor = _encode_cursor("after", users[-1].id) if has_more else None
+            prev_cursor = _encode_cursor("before", users[0].id) if cursor_id is not None else None
+
+    return UsersCursorPage(
+        items=[_to_response(user) for user in users],
+        size=size,
+        next_cursor=next_cursor,
+        prev_cursor=prev_cursor,
+    )
+
+
+def _bulk_response(results: List[Union[User, ValueError]]) -> UsersBulkCreateResponse:
+    items = [
+        BulkUserResult(index=index, error=str(result))
+        if isinstance(result, ValueError)
+        else BulkUserResult(index=index, user=_to_response(result))
+        for index, result in enumerate(results)
+    ]
+    failed = sum(1 for item in items if item.error)
+    return UsersBulkCreateResponse(created=len(items) - failed, failed=failed, results=items)
+
+
+async def hash_pending_passwords(
+    auth_service: AuthService,
+    users: List[User],
+    passwords: List[Optional[str]],
+    conflicts: Dict[int, ValueError],
+) -> None:
+    """
+    Hash the plain passwords of the users that will be inserted, in parallel.
+
+    Rejected items and items without a plain password keep their
+    ``hashed_password``, so a batch of taken identities costs no hashing.
+    """
+    pending = [
+        index for index, password in enumerate(passwords) if password is not None and index not in conflicts
+    ]
+    hashes = await auth_service.hash_many_async([passwords[index] for index in pending])
+    for index, hashed_password in zip(pending, hashes):
+        users[index].hashed_password = hashed_password
+
+
+def _naive_utc(value: Optional[datetime]) -> Optional[datetime]:
+    # Timestamps are stored as naive UTC
+    if value is not None and value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
 
 
 class UserUseCase:
+    """
+    User use cases over a synchronous repository.
+
+    The contract is mixed: methods that hash passwords (``create_user``,
+    ``create_users``, ``update_user``) are coroutines, because hashing runs
+    on the async, admission-controlled hashing pool; they move their
+    database work to a thread themselves. Every other method is plain
+    synchronous code that blocks on the database. Call them through
+    ``run_use_case``, which awaits the former and runs the latter in the
+    threadpool; calling a coroutine method from sync code only returns an
+    un-awaited coroutine.
+    """
+
     def __init__(self, user_service: UserService, auth_service: AuthService):
         self.user_service = user_service
         self.auth_service = auth_service
 
-    def create_user(self, user_create: UserCreate) -> UserResponse:
+    async def create_user(self, user_create: UserCreate) -> UserResponse:
         """Create a new user."""
-        hashed_password = self.auth_service.get_password_hash(user_create.password)
+        hashed_password = await self.auth_service.hash_async(user_create.password)
         
         user = User(
             username=user_create.username,
@@ -21,16 +140,19 @@ class UserUseCase:
             hashed_password=hashed_password,
         )
         
-        created_user = self.user_service.create_user(user)
+        created_user = await asyncio.to_thread(self.user_service.create_user, user)
         
-        return UserResponse(
-            id=created_user.id,
-            username=created_user.username,
-            email=created_user.email,
-            is_active=created_user.is_active,
-            created_at=created_user.created_at,
-            updated_at=created_user.updated_at,
-        )
+        return _to_response(created_user)
+
+    async def create_users(self, user_creates: List[UserCreate]) -> UsersBulkCreateResponse:
+        """Create several users, hashing the passwords of the insertable ones in parallel."""
+        users = [User(username=item.username, email=item.email) for item in user_creates]
+        conflicts = await asyncio.to_thread(self.user_service.find_conflicts, users)
+        await hash_pending_passwords(self.auth_service, users, [item.password for item in user_creates], conflicts)
+        
+        results = await asyncio.to_thread(self.user_service.create_users, users, conflicts)
+        
+        return _bulk_response(results)
 
     def get_user(self, user_id: int) -> Optional[UserResponse]:
         """Get a user by ID."""
@@ -39,58 +161,46 @@ class UserUseCase:
         if not user:
             return None
             
-        return UserResponse(
-            id=user.id,
-            username=user.username,
-            email=user.email,
-            is_active=user.is_active,
-            created_at=user.created_at,
-            updated_at=user.updated_at,
-        )
+        return _to_response(user)
 
-    def update_user(self, user_id: int, user_update: UserUpdate) -> Optional[UserResponse]:
+    async def update_user(self, user_id: int, user_update: UserUpdate) -> Optional[UserResponse]:
         """Update a user."""
         update_data = user_update.dict(exclude_unset=True)
         
         if "password" in update_data:
-            update_data["hashed_password"] = self.auth_service.get_password_hash(update_data.pop("password"))
+            update_data["hashed_password"] = await self.auth_service.hash_async(update_data.pop("password"))
             
-        updated_user = self.user_service.update_user(user_id, update_data)
+        updated_user = await asyncio.to_thread(self.user_service.update_user, user_id, update_data)
         
         if not updated_user:
             return None
             
-        return UserResponse(
-            id=updated_user.id,
-            username=updated_user.username,
-            email=updated_user.email,
-            is_active=updated_user.is_active,
-            created_at=updated_user.created_at,
-            updated_at=updated_user.updated_at,
-        )
+        return _to_response(updated_user)
 
     def delete_user(self, user_id: int) -> bool:
         """Delete a user."""
         return self.user_service.delete_user(user_id)
 
-    def list_users(self, page: int = 1, size: int = 10) -> UsersPage:
+    def deactivate_users(self, selection: UsersBulkDeactivate, chunk_size: int = 1000) -> UsersBulkActionResponse:
+        """Deactivate the selected users in set-based chunks."""
+        affected = self.user_service.deactivate_users(selection.ids, _naive_utc(selection.created_before), chunk_size)
+        return UsersBulkActionResponse(affected=affected)
+
+    def delete_users(self, selection: UsersBulkDelete, chunk_size: int = 1000) -> UsersBulkActionResponse:
+        """Delete the selected users in set-based chunks."""
+        affected = self.user_service.delete_users(
+            selection.ids, _naive_utc(selection.created_before), selection.is_active, chunk_size
+        )
+        return UsersBulkActionResponse(affected=affected)
+
+    def list_users(self, page: int = 1, size: int = 10, exact: bool = False) -> UsersPage:
         """List users with pagination."""
         skip = (page - 1) * size
-        users, total = self.user_service.list_users(skip=skip, limit=size)
+        users, total = self.user_service.list_users(skip=skip, limit=size, exact=exact)
         
         total_pages = (total + size - 1) // size
         
-        items = [
-            UserResponse(
-                id=user.id,
-                username=user.username,
-                email=user.email,
-                is_active=user.is_active,
-                created_at=user.created_at,
-                updated_at=user.updated_at,
-            )
-            for user in users
-        ]
+        items = [_to_response(user) for user in users]
         
         return UsersPage(
             items=items,
@@ -99,3 +209,123 @@ class UserUseCase:
             size=size,
             pages=total_pages,
         )
+
+    def list_users_by_cursor(self, cursor: str = "", size: int = 10) -> UsersCursorPage:
+        """List users with keyset pagination using opaque cursors."""
+        direction, cursor_id = _decode_cursor(cursor)
+        users = self.user_service.list_users_keyset(
+            size + 1,
+            after_id=cursor_id if direction == "after" else None,
+            before_id=cursor_id if direction == "before" else None,
+        )
+        return _cursor_page(users, size, direction, cursor_id)
+
+    def export_users(
+        self, updated_since: Optional[datetime] = None, batch_size: int = 1000
+    ) -> Iterator[List[tuple]]:
+        """Stream all users, optionally only those updated since a point in time."""
+        return self.user_service.stream_users(_naive_utc(updated_since), batch_size)
+
+
+class AsyncUserUseCase:
+    """User use cases over an async repository; every method is a coroutine."""
+
+    def __init__(self, user_service: AsyncUserService, auth_service: AuthService):
+        self.user_service = user_service
+        self.auth_service = auth_service
+
+    async def create_user(self, user_create: UserCreate) -> UserResponse:
+        """Create a new user."""
+        hashed_password = await self.auth_service.hash_async(user_create.password)
+        
+        user = User(
+            username=user_create.username,
+            email=user_create.email,
+            hashed_password=hashed_password,
+        )
+        
+        created_user = await self.user_service.create_user(user)
+        
+        return _to_response(created_user)
+
+    async def create_users(self, user_creates: List[UserCreate]) -> UsersBulkCreateResponse:
+        """Create several users, hashing the passwords of the insertable ones in parallel."""
+        users = [User(username=item.username, email=item.email) for item in user_creates]
+        conflicts = await self.user_service.find_conflicts(users)
+        await hash_pending_passwords(self.auth_service, users, [item.password for item in user_creates], conflicts)
+        
+        results = await self.user_service.create_users(users, conflicts)
+        
+        return _bulk_response(results)
+
+    async def get_user(self, user_id: int) -> Optional[UserResponse]:
+        """Get a user by ID."""
+        user = await self.user_service.get_user(user_id)
+        
+        if not user:
+            return None
+            
+        return _to_response(user)
+
+    async def update_user(self, user_id: int, user_update: UserUpdate) -> Optional[UserResponse]:
+        """Update a user."""
+        update_data = user_update.dict(exclude_unset=True)
+        
+        if "password" in update_data:
+            update_data["hashed_password"] = await self.auth_service.hash_async(update_data.pop("password"))
+            
+        updated_user = await self.user_service.update_user(user_id, update_data)
+        
+        if not updated_user:
+            return None
+            
+        return _to_response(updated_user)
+
+    async def delete_user(self, user_id: int) -> bool:
+        """Delete a user."""
+        return await self.user_service.delete_user(user_id)
+
+    async def deactivate_users(self, selection: UsersBulkDeactivate, chunk_size: int = 1000) -> UsersBulkActionResponse:
+        """Deactivate the selected users in set-based chunks."""
+        affected = await self.user_service.deactivate_users(selection.ids, _naive_utc(selection.created_before), chunk_size)
+        return UsersBulkActionResponse(affected=affected)
+
+    async def delete_users(self, selection: UsersBulkDelete, chunk_size: int = 1000) -> UsersBulkActionResponse:
+        """Delete the selected users in set-based chunks."""
+        affected = await self.user_service.delete_users(
+            selection.ids, _naive_utc(selection.created_before), selection.is_active, chunk_size
+        )
+        return UsersBulkActionResponse(affected=affected)
+
+    async def list_users(self, page: int = 1, size: int = 10, exact: bool = False) -> UsersPage:
+        """List users with pagination."""
+        skip = (page - 1) * size
+        users, total = await self.user_service.list_users(skip=skip, limit=size, exact=exact)
+        
+        total_pages = (total + size - 1) // size
+        
+        items = [_to_response(user) for user in users]
+        
+        return UsersPage(
+            items=items,
+            total=total,
+            page=page,
+            size=size,
+            pages=total_pages,
+        )
+
+    async def list_users_by_cursor(self, cursor: str = "", size: int = 10) -> UsersCursorPage:
+        """List users with keyset pagination using opaque cursors."""
+        direction, cursor_id = _decode_cursor(cursor)
+        users = await self.user_service.list_users_keyset(
+            size + 1,
+            after_id=cursor_id if direction == "after" else None,
+            before_id=cursor_id if direction == "before" else None,
+        )
+        return _cursor_page(users, size, direction, cursor_id)
+
+    async def export_users(
+        self, updated_since: Optional[datetime] = None, batch_size: int = 1000
+    ) -> AsyncIterator[List[tuple]]:
+        """Stream all users, optionally only those updated since a point in time."""
+        return self.user_service.stream_users(_naive_utc(updated_since), batch_size)
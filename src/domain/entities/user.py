@@ -1,10 +1,12 @@
 from datetime import datetime, timezone
-from typing import Optional
+from typing import NamedTuple, Optional
 
 
 class User:
     """User entity representing a user in the domain."""
 
+    __slots__ = ("id", "username", "email", "hashed_password", "is_active", "created_at", "updated_at")
+
     def __init__(
         self,
         id: Optional[int] = None,
@@ -22,3 +24,14 @@ class User:
         self.is_active = is_active
         self.created_at = created_at or datetime.now(timezone.utc)
         self.updated_at = updated_at or datetime.now(timezone.utc)
+
+
+class UserView(NamedTuple):
+    """Read-only user row for listings; carries no credentials."""
+
+    id: int
+    username: str
+    email: str
+    is_active: bool
+    created_at: datetime
+    updated_at: datetime
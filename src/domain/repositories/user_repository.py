@@ -1,7 +1,11 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional, Tuple
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Set, Tuple
 
-from src.domain.entities.user import User
+from src.domain.entities.user import User, UserView
+
+# Column order of the plain rows yielded by stream_users
+USER_EXPORT_COLUMNS = UserView._fields
 
 
 class UserRepository(ABC):
@@ -9,7 +13,17 @@ class UserRepository(ABC):
 
     @abstractmethod
     def create(self, user: User) -> User:
-        """Create a new user."""
+        """Create a new user; raises ValueError if the email or username is taken."""
+        pass
+
+    @abstractmethod
+    def create_many(self, users: List[User]) -> List[User]:
+        """Create several users in one transaction."""
+        pass
+
+    @abstractmethod
+    def find_existing_identities(self, usernames: List[str], emails: List[str]) -> Tuple[Set[str], Set[str]]:
+        """Return which of the given usernames and emails are already taken."""
         pass
 
     @abstractmethod
@@ -32,12 +46,173 @@ class UserRepository(ABC):
         """Update an existing user."""
         pass
 
+    @abstractmethod
+    def update_fields(self, user_id: int, changes: Dict[str, Any]) -> Optional[User]:
+        """
+        Set only the given columns of one user and return the updated user.
+
+        Returns None if the user does not exist; raises ValueError if the
+        new email or username is taken.
+        """
+        pass
+
     @abstractmethod
     def delete(self, user_id: int) -> bool:
         """Delete a user."""
         pass
 
     @abstractmethod
-    def list_users(self, skip: int = 0, limit: int = 100) -> Tuple[List[User], int]:
+    def update_fields_where(
+        self,
+        changes: Dict[str, Any],
+        user_ids: Optional[List[int]] = None,
+        created_before: Optional[datetime] = None,
+        is_active: Optional[bool] = None,
+        chunk_size: int = 1000,
+    ) -> int:
+        """
+        Set the given columns of every user matching all filters; returns how many changed.
+
+        Runs as one statement per ``chunk_size`` users, each committed on its own.
+        """
+        pass
+
+    @abstractmethod
+    def delete_where(
+        self,
+        user_ids: Optional[List[int]] = None,
+        created_before: Optional[datetime] = None,
+        is_active: Optional[bool] = None,
+        chunk_size: int = 1000,
+    ) -> int:
+        """Delete every user matching all filters, ``chunk_size`` per statement; returns how many."""
+        pass
+
+    @abstractmethod
+    def count_users(self, is_active: Optional[bool] = None, exact: bool = False) -> int:
+        """Count users, optionally by is_active; ``exact`` bypasses the maintained counter."""
+        pass
+
+    @abstractmethod
+    def list_users(self, skip: int = 0, limit: int = 100, exact: bool = False) -> Tuple[List[UserView], int]:
+        """List users with pagination."""
+        pass
+
+    @abstractmethod
+    def stream_users(
+        self, updated_since: Optional[datetime] = None, batch_size: int = 1000
+    ) -> Iterator[List[tuple]]:
+        """Yield batches of plain USER_EXPORT_COLUMNS rows ordered by ID."""
+        pass
+
+    @abstractmethod
+    def list_users_keyset(
+        self, limit: int = 100, after_id: Optional[int] = None, before_id: Optional[int] = None
+    ) -> List[UserView]:
+        """List users ordered by ID, strictly after ``after_id`` or before ``before_id``."""
+        pass
+
+
+class AsyncUserRepository(ABC):
+    """Abstract interface for user repository with non-blocking I/O."""
+
+    @abstractmethod
+    async def create(self, user: User) -> User:
+        """Create a new user; raises ValueError if the email or username is taken."""
+        pass
+
+    @abstractmethod
+    async def create_many(self, users: List[User]) -> List[User]:
+        """Create several users in one transaction."""
+        pass
+
+    @abstractmethod
+    async def find_existing_identities(self, usernames: List[str], emails: List[str]) -> Tuple[Set[str], Set[str]]:
+        """Return which of the given usernames and emails are already taken."""
+        pass
+
+    @abstractmethod
+    async def get_by_id(self, user_id: int) -> Optional[User]:
+        """Get user by ID."""
+        pass
+
+    @abstractmethod
+    async def get_by_email(self, email: str) -> Optional[User]:
+        """Get user by email."""
+        pass
+
+    @abstractmethod
+    async def get_by_username(self, username: str) -> Optional[User]:
+        """Get user by username."""
+        pass
+
+    @abstractmethod
+    async def update(self, user: User) -> User:
+        """Update an existing user."""
+        pass
+
+    @abstractmethod
+    async def update_fields(self, user_id: int, changes: Dict[str, Any]) -> Optional[User]:
+        """
+        Set only the given columns of one user and return the updated user.
+
+        Returns None if the user does not exist; raises ValueError if the
+        new email or username is taken.
+        """
+        pass
+
+    @abstractmethod
+    async def delete(self, user_id: int) -> bool:
+        """Delete a user."""
+        pass
+
+    @abstractmethod
+    async def update_fields_where(
+        self,
+        changes: Dict[str, Any],
+        user_ids: Optional[List[int]] = None,
+        created_before: Optional[datetime] = None,
+        is_active: Optional[bool] = None,
+        chunk_size: int = 1000,
+    ) -> int:
+        """
+        Set the given columns of every user matching all filters; returns how many changed.
+
+        Runs as one statement per ``chunk_size`` users, each committed on its own.
+        """
+        pass
+
+    @abstractmethod
+    async def delete_where(
+        self,
+        user_ids: Optional[List[int]] = None,
+        created_before: Optional[datetime] = None,
+        is_active: Optional[bool] = None,
+        chunk_size: int = 1000,
+    ) -> int:
+        """Delete every user matching all filters, ``chunk_size`` per statement; returns how many."""
+        pass
+
+    @abstractmethod
+    async def count_users(self, is_active: Optional[bool] = None, exact: bool = False) -> int:
+        """Count users, optionally by is_active; ``exact`` bypasses the maintained counter."""
+        pass
+
+    @abstractmethod
+    async def list_users(self, skip: int = 0, limit: int = 100, exact: bool = False) -> Tuple[List[UserView], int]:
         """List users with pagination."""
         pass
+
+    @abstractmethod
+    def stream_users(
+        self, updated_since: Optional[datetime] = None, batch_size: int = 1000
+    ) -> AsyncIterator[List[tuple]]:
+        """Yield batches of plain USER_EXPORT_COLUMNS rows ordered by ID."""
+        pass
+
+    @abstractmethod
+    async def list_users_keyset(
+        self, limit: int = 100, after_id: Optional[int] = None, before_id: Optional[int] = None
+    ) -> List[UserView]:
+        """List users ordered by ID, strictly after ``after_id`` or before ``before_id``."""
+        pass
@@ -1,28 +1,43 @@
+import asyncio
+import os
+import time
+from contextlib import nullcontext
 from datetime import datetime, timedelta, timezone
-from typing import Optional
-
-from jose import jwt
-from passlib.context import CryptContext
+from functools import cached_property
+from typing import TYPE_CHECKING, Callable, List, Optional
 
 from src.domain.entities.user import User
+from src.domain.services.hashing_admission import HashingAdmissionController
+from src.domain.services.password_hasher import HashingExecutor, create_password_context
+
+if TYPE_CHECKING:
+    from passlib.context import CryptContext
 
 
 class AuthService:
     """Service for handling authentication related operations."""
 
-    def __init__(self, secret_key: str, algorithm: str = "HS256", access_token_expire_minutes: int = 30):
-        # Updated to use Argon2 as primary with bcrypt as fallback for existing hashes
-        self.pwd_context = CryptContext(
-            schemes=["argon2", "bcrypt"],
-            default="argon2",
-            argon2__time_cost=2,      # Number of iterations
-            argon2__memory_cost=65536, # Memory usage in kibibytes (64MB)
-            argon2__parallelism=4,     # Parallelism factor
-            deprecated="auto"
-        )
+    def __init__(
+        self,
+        secret_key: str,
+        algorithm: str = "HS256",
+        access_token_expire_minutes: int = 30,
+        hashing_executor: Optional[HashingExecutor] = None,
+        admission_controller: Optional[HashingAdmissionController] = None,
+        observe_hashing: Optional[Callable[[str, float], None]] = None,
+    ):
         self.secret_key = secret_key
         self.algorithm = algorithm
         self.access_token_expire_minutes = access_token_expire_minutes
+        self.hashing_executor = hashing_executor
+        self.admission_controller = admission_controller
+        # Called with ("hash" or "verify", seconds) after each admitted operation
+        self.observe_hashing = observe_hashing
+
+    @cached_property
+    def pwd_context(self) -> "CryptContext":
+        # Argon2 as primary with bcrypt as fallback for existing hashes; built on first use
+        return create_password_context()
 
     def verify_password(self, plain_password: str, hashed_password: str) -> bool:
         """Verify a password against a hash."""
@@ -32,8 +47,60 @@ class AuthService:
         """Generate password hash."""
         return self.pwd_context.hash(password)
 
+    def is_supported_hash(self, hashed_password: str) -> bool:
+        """Whether a stored hash uses a scheme this service can verify."""
+        return self.pwd_context.identify(hashed_password, required=False) is not None
+
+    def _admit(self):
+        if self.admission_controller:
+            return self.admission_controller.slot()
+        return nullcontext()
+
+    async def verify_async(self, plain_password: str, hashed_password: str) -> bool:
+        """Verify a password against a hash without blocking the event loop."""
+        async with self._admit():
+            started = time.perf_counter()
+            if self.hashing_executor:
+                verified = await self.hashing_executor.verify(plain_password, hashed_password)
+            else:
+                verified = await asyncio.to_thread(self.verify_password, plain_password, hashed_password)
+            if self.observe_hashing:
+                self.observe_hashing("verify", time.perf_counter() - started)
+            return verified
+
+    async def hash_async(self, password: str) -> str:
+        """Generate password hash without blocking the event loop."""
+        async with self._admit():
+            started = time.perf_counter()
+            if self.hashing_executor:
+                hashed = await self.hashing_executor.hash(password)
+            else:
+                hashed = await asyncio.to_thread(self.get_password_hash, password)
+            if self.observe_hashing:
+                self.observe_hashing("hash", time.perf_counter() - started)
+            return hashed
+
+    async def hash_many_async(self, passwords: List[str]) -> List[str]:
+        """Hash several passwords in parallel, up to the available hashing capacity."""
+        if self.admission_controller:
+            parallelism = self.admission_controller.max_concurrent
+        elif self.hashing_executor:
+            parallelism = self.hashing_executor.max_workers
+        else:
+            parallelism = os.cpu_count() or 1
+        # Stay within capacity so a large batch does not overflow the admission queue
+        semaphore = asyncio.Semaphore(max(1, parallelism))
+
+        async def hash_one(password: str) -> str:
+            async with semaphore:
+                return await self.hash_async(password)
+
+        return list(await asyncio.gather(*(hash_one(password) for password in passwords)))
+
     def create_access_token(self, data: dict, expires_delta: Optional[timedelta] = None) -> str:
         """Create a new JWT token."""
+        from jose import jwt
+
         to_encode = data.copy()
         if expires_delta:
             expire = datetime.now(timezone.utc) + expires_delta
@@ -51,3 +118,11 @@ class AuthService:
         if not self.verify_password(password, user.hashed_password):
             return None
         return user
+
+    async def authenticate_user_async(self, user: Optional[User], password: str) -> Optional[User]:
+        """Authenticate a user with password without blocking the event loop."""
+        if not user:
+            return None
+        if not await self.verify_async(password, user.hashed_password):
+            return None
+        return user
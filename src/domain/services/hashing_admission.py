@@ -0,0 +1,111 @@
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Deque
+
+
+class HashingOverloadedError(Exception):
+    """Raised when a password hashing operation cannot be admitted in time."""
+
+    def __init__(self, retry_after: int):
+        super().__init__("Password hashing capacity exhausted, retry later")
+        self.retry_after = retry_after
+
+
+class HashingAdmissionController:
+    """
+    Bounds the number of concurrent password hashing operations.
+
+    Each argon2 call allocates its full memory cost, so at most
+    ``max_concurrent`` run at once. Further callers wait in a FIFO queue of
+    at most ``max_queue`` entries for up to ``queue_timeout`` seconds; when
+    the queue is full or the deadline passes, HashingOverloadedError is
+    raised so the request can be shed instead of piling up.
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int,
+        max_queue: int = 32,
+        queue_timeout: float = 2.0,
+        retry_after: int = 1,
+    ):
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.retry_after = retry_after
+        self.in_flight = 0
+        self.admitted_total = 0
+        self.rejected_total = 0
+        self.timed_out_total = 0
+        self.wait_seconds_total = 0.0
+        self.max_wait_seconds = 0.0
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._waiters)
+
+    async def acquire(self) -> None:
+        """Wait for a hashing slot or raise HashingOverloadedError."""
+        if self.in_flight < self.max_concurrent and not self._waiters:
+            self.in_flight += 1
+            self.admitted_total += 1
+            return
+
+        if len(self._waiters) >= self.max_queue:
+            self.rejected_total += 1
+            raise HashingOverloadedError(self.retry_after)
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        started = time.monotonic()
+        try:
+            await asyncio.wait_for(waiter, timeout=self.queue_timeout)
+        except BaseException as exc:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over just as we gave up; pass it on
+                self.release()
+            elif waiter in self._waiters:
+                self._waiters.remove(waiter)
+            if isinstance(exc, asyncio.TimeoutError):
+                self.timed_out_total += 1
+                raise HashingOverloadedError(self.retry_after) from None
+            raise
+        finally:
+            waited = time.monotonic() - started
+            self.wait_seconds_total += waited
+            self.max_wait_seconds = max(self.max_wait_seconds, waited)
+        self.admitted_total += 1
+
+    def release(self) -> None:
+        """Return a slot, handing it directly to the oldest waiter."""
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.in_flight -= 1
+
+    @asynccontextmanager
+    async def slot(self):
+        await self.acquire()
+        try:
+            yield
+        finally:
+            self.release()
+
+    def stats(self) -> dict:
+        """Current gauges and counters."""
+        return {
+            "max_concurrent": self.max_concurrent,
+            "in_flight": self.in_flight,
+            "queue_depth": self.queue_depth,
+            "max_queue": self.max_queue,
+            "admitted_total": self.admitted_total,
+            "rejected_total": self.rejected_total,
+            "timed_out_total": self.timed_out_total,
+            "wait_seconds_total": self.wait_seconds_total,
+            "max_wait_seconds": self.max_wait_seconds,
+        }
@@ -0,0 +1,79 @@
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    from passlib.context import CryptContext
+
+# Argon2 as primary with bcrypt as fallback for existing hashes
+PASSWORD_CONTEXT_OPTIONS = {
+    "schemes": ["argon2", "bcrypt"],
+    "default": "argon2",
+    "argon2__time_cost": 2,        # Number of iterations
+    "argon2__memory_cost": 65536,  # Memory usage in kibibytes (64MB)
+    "argon2__parallelism": 4,      # Parallelism factor
+    "deprecated": "auto",
+}
+
+# Each pool process builds its own CryptContext once, in _init_worker
+_worker_context: Optional["CryptContext"] = None
+
+
+def create_password_context() -> "CryptContext":
+    """Build the password CryptContext, importing passlib on first use."""
+    # passlib and its argon2 backend are only needed once a password is
+    # hashed or verified, so importing the app does not pay for them
+    from passlib.context import CryptContext
+
+    return CryptContext(**PASSWORD_CONTEXT_OPTIONS)
+
+
+def _init_worker() -> None:
+    global _worker_context
+    _worker_context = create_password_context()
+
+
+def _hash_password(password: str) -> str:
+    return _worker_context.hash(password)
+
+
+def _verify_password(plain_password: str, hashed_password: str) -> bool:
+    return _worker_context.verify(plain_password, hashed_password)
+
+
+class HashingExecutor:
+    """Runs password hashing and verification in a bounded process pool."""
+
+    def __init__(self, max_workers: Optional[int] = None):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        # Created on first use so importing the app does not spawn processes
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+            )
+        return self._pool
+
+    async def hash(self, password: str) -> str:
+        """Generate a password hash in the pool."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_pool(), _hash_password, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """Verify a password against a hash in the pool."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._get_pool(), _verify_password, plain_password, hashed_password
+        )
+
+    def shutdown(self) -> None:
+        """Stop the pool processes."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
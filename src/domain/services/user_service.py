@@ -1,8 +1,26 @@
 from datetime import datetime, timezone
-from typing import List, Optional, Tuple
+from typing import AsyncIterator, Dict, Iterator, List, Optional, Set, Tuple, Union
 
-from src.domain.entities.user import User
-from src.domain.repositories.user_repository import UserRepository
+from src.domain.entities.user import User, UserView
+from src.domain.repositories.user_repository import AsyncUserRepository, UserRepository
+
+
+def _find_conflicts(users: List[User], taken_usernames: Set[str], taken_emails: Set[str]) -> Dict[int, ValueError]:
+    """Map batch positions to uniqueness errors, against the DB and earlier batch items."""
+    conflicts = {}
+    seen_usernames, seen_emails = set(), set()
+    for index, user in enumerate(users):
+        if user.email in taken_emails:
+            conflicts[index] = ValueError(f"User with email {user.email} already exists")
+        elif user.username in taken_usernames:
+            conflicts[index] = ValueError(f"User with username {user.username} already exists")
+        elif user.email in seen_emails:
+            conflicts[index] = ValueError(f"Duplicate email {user.email} in request")
+        elif user.username in seen_usernames:
+            conflicts[index] = ValueError(f"Duplicate username {user.username} in request")
+        seen_usernames.add(user.username)
+        seen_emails.add(user.email)
+    return conflicts
 
 
 class UserService:
@@ -12,51 +30,161 @@ class UserService:
         self.user_repository = user_repository
 
     def create_user(self, user: User) -> User:
-        """Create a new user."""
-        existing_user = self.user_repository.get_by_email(user.email)
-        if existing_user:
-            raise ValueError(f"User with email {user.email} already exists")
-            
-        existing_username = self.user_repository.get_by_username(user.username)
-        if existing_username:
-            raise ValueError(f"User with username {user.username} already exists")
-            
+        """Create a new user; the repository rejects a taken email or username."""
         return self.user_repository.create(user)
 
+    def find_conflicts(self, users: List[User]) -> Dict[int, ValueError]:
+        """Map the batch positions that cannot be created to the reason why."""
+        taken_usernames, taken_emails = self.user_repository.find_existing_identities(
+            [user.username for user in users], [user.email for user in users]
+        )
+        return _find_conflicts(users, taken_usernames, taken_emails)
+
+    def create_users(
+        self, users: List[User], conflicts: Optional[Dict[int, ValueError]] = None
+    ) -> List[Union[User, ValueError]]:
+        """
+        Create several users at once.
+
+        Returns one entry per input, in order: the created user, or the
+        ValueError explaining why it was skipped. Callers that already ran
+        ``find_conflicts`` (to skip hashing passwords of rejected items) pass
+        its result in.
+        """
+        if conflicts is None:
+            conflicts = self.find_conflicts(users)
+        pending = [index for index in range(len(users)) if index not in conflicts]
+
+        created = iter(self.user_repository.create_many([users[index] for index in pending]))
+        return [conflicts[index] if index in conflicts else next(created) for index in range(len(users))]
+
     def get_user(self, user_id: int) -> Optional[User]:
         """Get a user by ID."""
         return self.user_repository.get_by_id(user_id)
 
     def update_user(self, user_id: int, user_data: dict) -> Optional[User]:
-        """Update a user."""
-        user = self.user_repository.get_by_id(user_id)
-        if not user:
-            return None
-            
-        # Check for email uniqueness if email is being updated
-        if "email" in user_data and user_data["email"] != user.email:
-            existing_user = self.user_repository.get_by_email(user_data["email"])
-            if existing_user and existing_user.id != user_id:
-                raise ValueError(f"User with email {user_data['email']} already exists")
-                
-        # Check for username uniqueness if username is being updated
-        if "username" in user_data and user_data["username"] != user.username:
-            existing_user = self.user_repository.get_by_username(user_data["username"])
-            if existing_user and existing_user.id != user_id:
-                raise ValueError(f"User with username {user_data['username']} already exists")
-                
-        # Update user fields
-        for key, value in user_data.items():
-            if hasattr(user, key):
-                setattr(user, key, value)
-                
-        user.updated_at = datetime.now(timezone.utc)  # Ensure this is a datetime object
-        return self.user_repository.update(user)
+        """Update a user; the repository rejects a taken email or username."""
+        changes = {**user_data, "updated_at": datetime.now(timezone.utc)}
+        return self.user_repository.update_fields(user_id, changes)
 
     def delete_user(self, user_id: int) -> bool:
         """Delete a user."""
         return self.user_repository.delete(user_id)
 
-    def list_users(self, skip: int = 0, limit: int = 100) -> Tuple[List[User], int]:
+    def deactivate_users(
+        self, user_ids: Optional[List[int]] = None, created_before: Optional[datetime] = None, chunk_size: int = 1000
+    ) -> int:
+        """Deactivate the active users matching all given filters; returns how many were deactivated."""
+        changes = {"is_active": False, "updated_at": datetime.now(timezone.utc)}
+        return self.user_repository.update_fields_where(
+            changes, user_ids, created_before, is_active=True, chunk_size=chunk_size
+        )
+
+    def delete_users(
+        self,
+        user_ids: Optional[List[int]] = None,
+        created_before: Optional[datetime] = None,
+        is_active: Optional[bool] = None,
+        chunk_size: int = 1000,
+    ) -> int:
+        """Delete the users matching all given filters; returns how many were deleted."""
+        return self.user_repository.delete_where(user_ids, created_before, is_active, chunk_size)
+
+    def list_users(self, skip: int = 0, limit: int = 100, exact: bool = False) -> Tuple[List[UserView], int]:
+        """List users with pagination."""
+        return self.user_repository.list_users(skip, limit, exact=exact)
+
+    def stream_users(
+        self, updated_since: Optional[datetime] = None, batch_size: int = 1000
+    ) -> Iterator[List[tuple]]:
+        """Stream users as batches of plain rows."""
+        return self.user_repository.stream_users(updated_since, batch_size)
+
+    def list_users_keyset(
+        self, limit: int = 100, after_id: Optional[int] = None, before_id: Optional[int] = None
+    ) -> List[UserView]:
+        """List users with keyset pagination."""
+        return self.user_repository.list_users_keyset(limit, after_id=after_id, before_id=before_id)
+
+
+class AsyncUserService:
+    """Service for user-related business logic over an async repository."""
+
+    def __init__(self, user_repository: AsyncUserRepository):
+        self.user_repository = user_repository
+
+    async def create_user(self, user: User) -> User:
+        """Create a new user; the repository rejects a taken email or username."""
+        return await self.user_repository.create(user)
+
+    async def find_conflicts(self, users: List[User]) -> Dict[int, ValueError]:
+        """Map the batch positions that cannot be created to the reason why."""
+        taken_usernames, taken_emails = await self.user_repository.find_existing_identities(
+            [user.username for user in users], [user.email for user in users]
+        )
+        return _find_conflicts(users, taken_usernames, taken_emails)
+
+    async def create_users(
+        self, users: List[User], conflicts: Optional[Dict[int, ValueError]] = None
+    ) -> List[Union[User, ValueError]]:
+        """
+        Create several users at once.
+
+        Returns one entry per input, in order: the created user, or the
+        ValueError explaining why it was skipped. Callers that already ran
+        ``find_conflicts`` pass its result in.
+        """
+        if conflicts is None:
+            conflicts = await self.find_conflicts(users)
+        pending = [index for index in range(len(users)) if index not in conflicts]
+
+        created = iter(await self.user_repository.create_many([users[index] for index in pending]))
+        return [conflicts[index] if index in conflicts else next(created) for index in range(len(users))]
+
+    async def get_user(self, user_id: int) -> Optional[User]:
+        """Get a user by ID."""
+        return await self.user_repository.get_by_id(user_id)
+
+    async def update_user(self, user_id: int, user_data: dict) -> Optional[User]:
+        """Update a user; the repository rejects a taken email or username."""
+        changes = {**user_data, "updated_at": datetime.now(timezone.utc)}
+        return await self.user_repository.update_fields(user_id, changes)
+
+    async def delete_user(self, user_id: int) -> bool:
+        """Delete a user."""
+        return await self.user_repository.delete(user_id)
+
+    async def deactivate_users(
+        self, user_ids: Optional[List[int]] = None, created_before: Optional[datetime] = None, chunk_size: int = 1000
+    ) -> int:
+        """Deactivate the active users matching all given filters; returns how many were deactivated."""
+        changes = {"is_active": False, "updated_at": datetime.now(timezone.utc)}
+        return await self.user_repository.update_fields_where(
+            changes, user_ids, created_before, is_active=True, chunk_size=chunk_size
+        )
+
+    async def delete_users(
+        self,
+        user_ids: Optional[List[int]] = None,
+        created_before: Optional[datetime] = None,
+        is_active: Optional[bool] = None,
+        chunk_size: int = 1000,
+    ) -> int:
+        """Delete the users matching all given filters; returns how many were deleted."""
+        return await self.user_repository.delete_where(user_ids, created_before, is_active, chunk_size)
+
+    async def list_users(self, skip: int = 0, limit: int = 100, exact: bool = False) -> Tuple[List[UserView], int]:
         """List users with pagination."""
-        return self.user_repository.list_users(skip, limit)
+        return await self.user_repository.list_users(skip, limit, exact=exact)
+
+    def stream_users(
+        self, updated_since: Optional[datetime] = None, batch_size: int = 1000
+    ) -> AsyncIterator[List[tuple]]:
+        """Stream users as batches of plain rows."""
+        return self.user_repository.stream_users(updated_since, batch_size)
+
+    async def list_users_keyset(
+        self, limit: int = 100, after_id: Optional[int] = None, before_id: Optional[int] = None
+    ) -> List[UserView]:
+        """List users with keyset pagination."""
+        return await self.user_repository.list_users_keyset(limit, after_id=after_id, before_id=before_id)
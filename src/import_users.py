@@ -0,0 +1,87 @@
+"""
+Bulk import users from a CSV or NDJSON file.
+
+    python -m src.import_users users.csv --rejected rejected.ndjson
+
+Rows need username, email and either password or hashed_password
+(argon2/bcrypt hashes are stored without rehashing), plus optional is_active.
+"""
+import argparse
+import asyncio
+import codecs
+import json
+import sys
+import time
+
+from src.application.use_cases.user_import_use_case import IMPORT_FORMATS, UserImportUseCase, read_import_rows
+from src.domain.services.auth_service import AuthService
+from src.domain.services.password_hasher import HashingExecutor
+from src.domain.services.user_service import UserService
+from src.infrastructure.database.database import Database
+from src.infrastructure.repositories.sqlite_user_repository import SQLiteUserRepository
+from src.settings import Settings
+
+
+async def run_import(use_case: UserImportUseCase, rows, rejected_file) -> dict:
+    started = time.monotonic()
+    summary = {}
+    async for event in use_case.import_users(rows):
+        if event["type"] == "rejected":
+            if rejected_file is not None:
+                rejected_file.write(json.dumps(event) + "\n")
+        elif event["type"] == "progress":
+            rate = event["processed"] / max(time.monotonic() - started, 1e-9)
+            print(
+                f"{event['processed']} rows processed, {event['imported']} imported, "
+                f"{event['rejected']} rejected ({rate:.0f} rows/s)",
+                file=sys.stderr,
+            )
+        else:
+            summary = event
+    return summary
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Bulk import users from a CSV or NDJSON file.")
+    parser.add_argument("path", help="File to import")
+    parser.add_argument("--format", choices=IMPORT_FORMATS, help="Defaults to the file extension")
+    parser.add_argument("--chunk-size", type=int, help="Rows committed per transaction")
+    parser.add_argument("--rejected", help="Write rejected rows to this NDJSON file")
+    args = parser.parse_args(argv)
+
+    settings = Settings()
+    import_format = args.format or ("csv" if args.path.lower().endswith(".csv") else "ndjson")
+
+    database = Database(settings.database_url, settings)
+    database.create_tables()
+    db = database.session_factory()
+    hashing_executor = HashingExecutor(max_workers=settings.hashing_workers)
+    auth_service = AuthService(
+        secret_key=settings.secret_key,
+        algorithm=settings.algorithm,
+        access_token_expire_minutes=settings.access_token_expire_minutes,
+        hashing_executor=hashing_executor,
+    )
+    use_case = UserImportUseCase(
+        UserService(SQLiteUserRepository(db)),
+        auth_service,
+        chunk_size=args.chunk_size or settings.import_chunk_size,
+    )
+
+    rejected_file = open(args.rejected, "w", encoding="utf-8") if args.rejected else None
+    try:
+        with open(args.path, "rb") as source:
+            rows = read_import_rows(codecs.iterdecode(source, "utf-8-sig"), import_format)
+            summary = asyncio.run(run_import(use_case, rows, rejected_file))
+    finally:
+        if rejected_file is not None:
+            rejected_file.close()
+        hashing_executor.shutdown()
+        db.close()
+
+    print(json.dumps(summary))
+    return 1 if summary.get("rejected") else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,111 @@
+from typing import Optional, Union
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from src.domain.repositories.user_repository import AsyncUserRepository, UserRepository
+from src.domain.services.auth_service import AuthService
+from src.domain.services.hashing_admission import HashingAdmissionController
+from src.domain.services.password_hasher import HashingExecutor
+from src.infrastructure.api.metrics import AppMetrics
+from src.infrastructure.api.token_cache import VerifiedTokenCache, verify_access_token
+from src.infrastructure.database.database import Database
+from src.infrastructure.database.group_commit import GroupCommitWriter
+from src.infrastructure.repositories.async_sqlite_user_repository import AsyncSQLiteUserRepository
+from src.infrastructure.repositories.caching_user_repository import (
+    AsyncCachingUserRepository,
+    CachingUserRepository,
+    UserCache,
+)
+from src.infrastructure.repositories.group_commit_user_repository import (
+    AsyncGroupCommitUserRepository,
+    GroupCommitUserRepository,
+)
+from src.infrastructure.repositories.sqlite_user_repository import SQLiteUserRepository
+from src.settings import Settings
+
+
+class Container:
+    """
+    App-scoped singletons shared by every request.
+
+    Built once when the app starts and closed when it stops. Requests only
+    open a database session of their own; repositories, services and use
+    cases around it are plain constructor calls.
+    """
+
+    def __init__(
+        self,
+        settings: Settings,
+        database: Optional[Database] = None,
+        metrics: Optional[AppMetrics] = None,
+    ):
+        self.settings = settings
+        self.database = database or Database(settings.database_url, settings)
+        self.metrics = metrics or AppMetrics()
+        for name, engine in self.database.engines().items():
+            self.metrics.instrument_pool(name, engine)
+        self.hashing_executor = HashingExecutor(max_workers=settings.hashing_workers)
+        self.hashing_admission = HashingAdmissionController(
+            max_concurrent=settings.hashing_max_concurrent or self.hashing_executor.max_workers,
+            max_queue=settings.hashing_queue_size,
+            queue_timeout=settings.hashing_queue_timeout,
+            retry_after=settings.hashing_retry_after,
+        )
+        self.auth_service = AuthService(
+            secret_key=settings.secret_key,
+            algorithm=settings.algorithm,
+            access_token_expire_minutes=settings.access_token_expire_minutes,
+            hashing_executor=self.hashing_executor,
+            admission_controller=self.hashing_admission,
+            observe_hashing=self.metrics.observe_hashing,
+        )
+        self.user_cache = UserCache(max_size=settings.user_cache_size, ttl=settings.user_cache_ttl)
+        self.token_cache = VerifiedTokenCache(
+            lambda token: verify_access_token(token, settings.secret_key, settings.algorithm),
+            max_size=settings.token_cache_size,
+        )
+        # An in-memory database is private to each connection, so the writer thread could not share it
+        self.group_commit_writer = (
+            GroupCommitWriter(
+                self.database.writer_session_factory,
+                max_batch=settings.write_batch_max_size,
+                max_delay=settings.write_batch_max_delay,
+            )
+            if settings.write_group_commit and self.database.is_file
+            else None
+        )
+
+    def user_repository(
+        self, db: Union[Session, AsyncSession], cached: bool = True
+    ) -> Union[UserRepository, AsyncUserRepository]:
+        """
+        The user repository stack for a request's session, sync or async to match it.
+
+        ``cached=False`` reads straight from the database, for lookups that
+        must not see another worker's stale copy of a user.
+        """
+        use_cache = cached and self.settings.user_cache_size > 0
+        if isinstance(db, AsyncSession):
+            if self.group_commit_writer is not None:
+                repository = AsyncGroupCommitUserRepository(db, self.group_commit_writer)
+            else:
+                repository = AsyncSQLiteUserRepository(db)
+            if use_cache:
+                repository = AsyncCachingUserRepository(repository, self.user_cache)
+            return repository
+
+        if self.group_commit_writer is not None:
+            repository = GroupCommitUserRepository(db, self.group_commit_writer)
+        else:
+            repository = SQLiteUserRepository(db)
+        if use_cache:
+            repository = CachingUserRepository(repository, self.user_cache)
+        return repository
+
+    async def close(self) -> None:
+        """Stop the background workers, then close the database connections."""
+        self.hashing_executor.shutdown()
+        if self.group_commit_writer is not None:
+            self.group_commit_writer.shutdown()
+        await self.database.dispose()
@@ -1,79 +1,157 @@
-from fastapi import Depends, HTTPException, status
+import inspect
+import math
+from typing import AsyncIterator, Union
+
+from fastapi import Depends, HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordBearer
-from jose import JWTError, jwt
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from datetime import datetime, timezone
 
-from src.application.dtos.user_dto import TokenPayload
-from src.application.use_cases.auth_use_case import AuthUseCase
-from src.application.use_cases.user_use_case import UserUseCase
-from src.domain.repositories.user_repository import UserRepository
+from src.application.use_cases.auth_use_case import AsyncAuthUseCase, AuthUseCase
+from src.application.use_cases.user_import_use_case import AsyncUserImportUseCase, UserImportUseCase
+from src.application.use_cases.user_use_case import AsyncUserUseCase, UserUseCase
+from src.domain.repositories.user_repository import AsyncUserRepository, UserRepository
 from src.domain.services.auth_service import AuthService
-from src.domain.services.user_service import UserService
-from src.infrastructure.database.database import get_db
-from src.infrastructure.repositories.sqlite_user_repository import SQLiteUserRepository
+from src.domain.services.user_service import AsyncUserService, UserService
+from src.infrastructure.api.container import Container
 from src.settings import Settings
 
-settings = Settings()
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
 
+# Every dependency below is async and cheap: FastAPI runs plain ``def``
+# dependencies in the threadpool, which costs more than building the
+# objects they return. App-scoped objects come from the container; only the
+# session and the thin wrappers around it are created per request.
 
-def get_user_repository(db: Session = Depends(get_db)) -> UserRepository:
-    return SQLiteUserRepository(db)
 
+async def run_use_case(method, *args, **kwargs):
+    """
+    Call a use case method without blocking the event loop.
 
-def get_auth_service() -> AuthService:
-    return AuthService(
-        secret_key=settings.secret_key,
-        algorithm=settings.algorithm,
-        access_token_expire_minutes=settings.access_token_expire_minutes,
-    )
+    Async use case methods are awaited directly; synchronous ones are run
+    in the threadpool so their database I/O happens off the loop.
+    """
+    if inspect.iscoroutinefunction(method):
+        return await method(*args, **kwargs)
+    return await run_in_threadpool(method, *args, **kwargs)
+
+
+async def charge_rate_limit_items(request: Request, count: int) -> None:
+    """
+    Charge ``count`` more items of the route's rate limit cost to the caller.
+
+    Raises 429 when they do not fit the caller's budget; requests that were
+    not rate limited are not charged.
+    """
+    budget = getattr(request.state, "rate_limit", None)
+    if budget is None or count <= 0:
+        return
+    decision = await budget.charge_items(count)
+    if not decision.allowed:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Rate limit exceeded",
+            headers={"Retry-After": str(math.ceil(decision.retry_after))},
+        )
+
+
+async def get_container(request: Request) -> Container:
+    return request.app.state.container
+
+
+async def get_settings(container: Container = Depends(get_container)) -> Settings:
+    return container.settings
+
+
+async def get_db(container: Container = Depends(get_container)) -> AsyncIterator[Union[Session, AsyncSession]]:
+    """A session for this request, on the data path picked by ``async_database``."""
+    if container.settings.async_database:
+        async with container.database.async_session_factory() as db:
+            yield db
+        return
+    db = container.database.session_factory()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_user_repository(
+    db: Union[Session, AsyncSession] = Depends(get_db),
+    container: Container = Depends(get_container),
+) -> Union[UserRepository, AsyncUserRepository]:
+    return container.user_repository(db)
 
 
-def get_user_service(user_repository: UserRepository = Depends(get_user_repository)) -> UserService:
-    return UserService(user_repository)
+async def get_auth_service(container: Container = Depends(get_container)) -> AuthService:
+    return container.auth_service
 
 
-def get_auth_use_case(
-    user_repository: UserRepository = Depends(get_user_repository),
+async def get_auth_use_case(
+    db: Union[Session, AsyncSession] = Depends(get_db),
+    container: Container = Depends(get_container),
     auth_service: AuthService = Depends(get_auth_service),
-) -> AuthUseCase:
+) -> Union[AuthUseCase, AsyncAuthUseCase]:
+    # Password hashes are read from the database, never from the per-process
+    # user cache: another worker may have just changed the password or
+    # deleted the user
+    user_repository = container.user_repository(db, cached=False)
+    if inspect.iscoroutinefunction(user_repository.get_by_id):
+        return AsyncAuthUseCase(user_repository, auth_service)
     return AuthUseCase(user_repository, auth_service)
 
 
-def get_user_use_case(
-    user_service: UserService = Depends(get_user_service),
+async def get_user_use_case(
+    user_repository: Union[UserRepository, AsyncUserRepository] = Depends(get_user_repository),
+    auth_service: AuthService = Depends(get_auth_service),
+) -> Union[UserUseCase, AsyncUserUseCase]:
+    if inspect.iscoroutinefunction(user_repository.get_by_id):
+        return AsyncUserUseCase(AsyncUserService(user_repository), auth_service)
+    return UserUseCase(UserService(user_repository), auth_service)
+
+
+async def get_user_import_use_case(
+    request: Request,
+    user_repository: Union[UserRepository, AsyncUserRepository] = Depends(get_user_repository),
     auth_service: AuthService = Depends(get_auth_service),
-) -> UserUseCase:
-    return UserUseCase(user_service, auth_service)
+    settings: Settings = Depends(get_settings),
+) -> Union[UserImportUseCase, AsyncUserImportUseCase]:
+    async def admit_hashes(count: int) -> bool:
+        # Each plain password draws one item from the bulk budget, on top of the upload itself
+        try:
+            await charge_rate_limit_items(request, count)
+        except HTTPException:
+            return False
+        return True
+
+    if inspect.iscoroutinefunction(user_repository.get_by_id):
+        return AsyncUserImportUseCase(
+            AsyncUserService(user_repository),
+            auth_service,
+            chunk_size=settings.import_chunk_size,
+            max_plain_passwords=settings.import_max_plain_passwords,
+            admit_hashes=admit_hashes,
+        )
+    return UserImportUseCase(
+        UserService(user_repository),
+        auth_service,
+        chunk_size=settings.import_chunk_size,
+        max_plain_passwords=settings.import_max_plain_passwords,
+        admit_hashes=admit_hashes,
+    )
 
 
 async def get_current_user_id(
     token: str = Depends(oauth2_scheme),
-    auth_service: AuthService = Depends(get_auth_service),
+    container: Container = Depends(get_container),
 ) -> int:
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
-    
-    try:
-        payload = jwt.decode(
-            token, auth_service.secret_key, algorithms=[auth_service.algorithm]
+    # Shared with the rate limiter, so each token is verified once
+    user_id = container.token_cache.user_id(token)
+    if user_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
         )
-        user_id_str: str = payload.get("sub")
-        
-        if user_id_str is None:
-            raise credentials_exception
-            
-        token_payload = TokenPayload(sub=user_id_str, exp=payload.get("exp"))
-        
-        current_timestamp = datetime.now(timezone.utc).timestamp()
-        if token_payload.exp < current_timestamp:
-            raise credentials_exception
-            
-    except JWTError:
-        raise credentials_exception
-        
-    return int(token_payload.sub)
+    return user_id
@@ -0,0 +1,63 @@
+import csv
+import io
+import json
+from typing import AsyncIterator, Iterable, Iterator, List, Union
+
+from src.domain.repositories.user_repository import USER_EXPORT_COLUMNS
+
+
+def _isoformat(value):
+    return value.isoformat() if value is not None else None
+
+
+def ndjson_batch(rows: List[tuple]) -> str:
+    """Encode rows as newline-delimited JSON objects."""
+    lines = []
+    for id_, username, email, is_active, created_at, updated_at in rows:
+        lines.append(json.dumps({
+            "id": id_,
+            "username": username,
+            "email": email,
+            "is_active": is_active,
+            "created_at": _isoformat(created_at),
+            "updated_at": _isoformat(updated_at),
+        }))
+    lines.append("")
+    return "\n".join(lines)
+
+
+def csv_batch(rows: List[tuple]) -> str:
+    """Encode rows as CSV lines without a header."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for id_, username, email, is_active, created_at, updated_at in rows:
+        writer.writerow((id_, username, email, is_active, _isoformat(created_at), _isoformat(updated_at)))
+    return buffer.getvalue()
+
+
+EXPORT_FORMATS = {
+    "ndjson": ("application/x-ndjson", ndjson_batch, ""),
+    "csv": ("text/csv", csv_batch, ",".join(USER_EXPORT_COLUMNS) + "\r\n"),
+}
+
+
+def encode_batches(
+    batches: Union[Iterable[List[tuple]], AsyncIterator[List[tuple]]], export_format: str
+) -> Union[Iterator[str], AsyncIterator[str]]:
+    """Turn a stream of row batches into a stream of text chunks, one per batch."""
+    _, encode, header = EXPORT_FORMATS[export_format]
+
+    if hasattr(batches, "__aiter__"):
+        async def encode_async():
+            if header:
+                yield header
+            async for batch in batches:
+                yield encode(batch)
+        return encode_async()
+
+    def encode_sync():
+        if header:
+            yield header
+        for batch in batches:
+            yield encode(batch)
+    return encode_sync()
@@ -0,0 +1,257 @@
+import threading
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, List, Sequence, Tuple
+
+from sqlalchemy import Engine, event
+from sqlalchemy.pool import QueuePool
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+CONTENT_TYPE = "text/plain; version=0.0.4"
+
+# Upper bounds in seconds; a +Inf bucket is always added
+REQUEST_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+HASHING_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: LabelValues) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values)) + "}"
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class Metric:
+    """A named metric with one series per combination of label values."""
+
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self._lock = threading.Lock()
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = ()):
+        super().__init__(name, documentation, label_names)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, labels: LabelValues = (), amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self) -> List[str]:
+        lines = super().render()
+        with self._lock:
+            values = list(self._values.items())
+        for labels, value in values:
+            lines.append(f"{self.name}{_labels(self.label_names, labels)} {_number(value)}")
+        return lines
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, labels: LabelValues = (), amount: float = 1) -> None:
+        self.inc(labels, -amount)
+
+    def set(self, value: float, labels: LabelValues = ()) -> None:
+        with self._lock:
+            self._values[labels] = value
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, buckets: Sequence[float], label_names: Sequence[str] = ()):
+        super().__init__(name, documentation, label_names)
+        self.buckets = tuple(buckets)
+        # Per series: a count for each bucket plus +Inf (not cumulative), then the sum
+        self._series: Dict[LabelValues, List[float]] = {}
+
+    def observe(self, value: float, labels: LabelValues = ()) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0] * (len(self.buckets) + 2)
+            series[index] += 1
+            series[-1] += value
+
+    def render(self) -> List[str]:
+        lines = super().render()
+        with self._lock:
+            all_series = [(labels, list(series)) for labels, series in self._series.items()]
+        names = self.label_names + ("le",)
+        for labels, series in all_series:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), series):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{_labels(names, labels + (_number(bound),))} {cumulative}")
+            label_text = _labels(self.label_names, labels)
+            lines.append(f"{self.name}_sum{label_text} {_number(series[-1])}")
+            lines.append(f"{self.name}_count{label_text} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """Metrics rendered together in the Prometheus text exposition format."""
+
+    def __init__(self):
+        self._metrics: List[Metric] = []
+        self._collectors: List[Callable[[], None]] = []
+
+    def register(self, metric: Metric) -> Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def on_collect(self, collector: Callable[[], None]) -> None:
+        """Run ``collector`` before every render, e.g. to read gauges from their source."""
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        for collector in self._collectors:
+            collector()
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+class AppMetrics:
+    """
+    The metrics this service exports at /metrics.
+
+    Everything is per process: with several workers, each one reports its
+    own requests, hashing pool and connection pools.
+    """
+
+    def __init__(self):
+        self.registry = MetricsRegistry()
+        register = self.registry.register
+        self.requests = register(Histogram(
+            "http_request_duration_seconds",
+            "Time to serve HTTP requests, by method, route template and status.",
+            REQUEST_BUCKETS,
+            ("method", "route", "status"),
+        ))
+        self.in_flight = register(Gauge("http_requests_in_flight", "HTTP requests being served."))
+        self.rate_limit_rejections = register(Counter(
+            "rate_limit_rejections_total", "Requests rejected with 429, by endpoint group.", ("group",)
+        ))
+        self.hashing = register(Histogram(
+            "password_hashing_duration_seconds",
+            "Time to hash or verify a password once admitted, by operation.",
+            HASHING_BUCKETS,
+            ("operation",),
+        ))
+        self.pool_checkouts = register(Counter(
+            "db_pool_checkouts_total", "Connections checked out of the pool, by pool.", ("pool",)
+        ))
+        self.pool_connects = register(Counter(
+            "db_pool_connections_opened_total", "New database connections opened, by pool.", ("pool",)
+        ))
+        self.pool_checked_out = register(Gauge(
+            "db_pool_checked_out", "Connections currently checked out, by pool.", ("pool",)
+        ))
+        self.pool_size = register(Gauge("db_pool_size", "Connections the pool keeps open, by pool.", ("pool",)))
+        self.pool_overflow = register(Gauge(
+            "db_pool_overflow", "Connections open beyond the pool size (negative while below it), by pool.", ("pool",)
+        ))
+        self._pools: Dict[str, QueuePool] = {}
+        self.registry.on_collect(self._collect_pools)
+
+    def observe_hashing(self, operation: str, seconds: float) -> None:
+        self.hashing.observe(seconds, (operation,))
+
+    def rate_limited(self, group: str) -> None:
+        self.rate_limit_rejections.inc((group,))
+
+    def instrument_pool(self, name: str, engine: Engine) -> None:
+        """Count checkouts and new connections of ``engine``'s pool and report its gauges."""
+        labels = (name,)
+        event.listen(engine, "checkout", lambda *args: self.pool_checkouts.inc(labels))
+        event.listen(engine, "connect", lambda *args: self.pool_connects.inc(labels))
+        # Replaces the pool a previous startup registered under this name
+        if isinstance(engine.pool, QueuePool):
+            self._pools[name] = engine.pool
+        else:
+            self._pools.pop(name, None)
+
+    def _collect_pools(self) -> None:
+        for name, pool in self._pools.items():
+            self.pool_checked_out.set(pool.checkedout(), (name,))
+            self.pool_size.set(pool.size(), (name,))
+            self.pool_overflow.set(pool.overflow(), (name,))
+
+    def render(self) -> str:
+        return self.registry.render()
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware that times every HTTP request.
+
+    Requests are labelled with the route template (``/users/{user_id}``)
+    rather than the path, so the number of series stays bounded; requests
+    that match no route share the ``unmatched`` label.
+    """
+
+    def __init__(self, app: ASGIApp, metrics: AppMetrics):
+        self.app = app
+        self.metrics = metrics
+
+    @staticmethod
+    def _route(scope: Scope) -> str:
+        # Set by the router on the shared scope once a route has matched
+        route = scope.get("route")
+        if route is not None:
+            return route.path
+        endpoint = scope.get("endpoint")
+        if endpoint is not None:
+            # Plain Starlette routes, such as /docs, only record their endpoint
+            for candidate in scope["router"].routes:
+                if getattr(candidate, "endpoint", None) is endpoint:
+                    return candidate.path
+        return "unmatched"
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        self.metrics.in_flight.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            self.metrics.in_flight.dec()
+            self.metrics.requests.observe(
+                time.perf_counter() - started, (scope["method"], self._route(scope), str(status))
+            )
@@ -1,43 +1,134 @@
-import time
-from typing import Dict, Tuple
+import math
+from typing import Callable, Dict, Optional, Tuple
 
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import MutableHeaders
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
+from src.infrastructure.api.rate_limiter import RateLimitDecision, RateLimiter, create_rate_limit_store
+
+
+class RateLimitBudget:
+    """
+    The budget a request was admitted under, kept on ``request.state.rate_limit``.
+
+    Admission charges the route's cost once. Endpoints whose work grows with
+    the request, such as bulk creates, charge each further item the same
+    cost once they know how many there are.
+    """
+
+    def __init__(self, middleware: "RateLimitMiddleware", group: str, key: str, cost: int):
+        self.middleware = middleware
+        self.group = group
+        self.key = key
+        self.cost = cost
+
+    async def charge_items(self, count: int) -> RateLimitDecision:
+        decision = await self.middleware.limiters[self.group].hit_async(self.key, cost=self.cost * count)
+        if not decision.allowed and self.middleware.on_rejected is not None:
+            self.middleware.on_rejected(self.group)
+        return decision
+
+
+class RateLimitMiddleware:
+    """
+    Pure ASGI rate limiting middleware.
+
+    Each request is matched by method and path prefix to an endpoint group
+    with its own budget and charged that route's cost, so expensive
+    endpoints cannot starve cheap ones. Requests carrying a valid bearer
+    token are keyed by user ID, everything else by client address.
+    """
 
-class RateLimitMiddleware(BaseHTTPMiddleware):
     def __init__(
         self,
-        app,
+        app: ASGIApp,
         requests_limit: int = 10,
-        window_size: int = 60
+        window_size: int = 60,
+        algorithm: str = "sliding_window",
+        max_keys: int = 100_000,
+        storage: str = "memory",
+        storage_path: str = "",
+        groups: Optional[Dict[str, Tuple[int, int]]] = None,
+        routes: Optional[Dict[str, Tuple[str, int]]] = None,
+        identify: Optional[Callable[[str], Optional[int]]] = None,
+        on_rejected: Optional[Callable[[str], None]] = None,
     ):
-        super().__init__(app)
-        self.requests_limit = requests_limit
-        self.window_size = window_size
-        self.request_counts: Dict[str, Tuple[int, float]] = {}
-
-    async def dispatch(self, request: Request, call_next):
-        ip = request.client.host
-        current_time = time.time()
-        
-        # Clean old entries
-        for key in list(self.request_counts.keys()):
-            count, timestamp = self.request_counts[key]
-            if current_time - timestamp > self.window_size:
-                del self.request_counts[key]
-        
-        # Check rate limit
-        if ip in self.request_counts:
-            count, timestamp = self.request_counts[ip]
-            if count >= self.requests_limit:
-                return Response(
-                    content="Rate limit exceeded",
-                    status_code=429
-                )
-            self.request_counts[ip] = (count + 1, timestamp)
-        else:
-            self.request_counts[ip] = (1, current_time)
-        
-        response = await call_next(request)
-        return response
+        self.app = app
+        self.identify = identify
+        # Called with the endpoint group of every rejected request
+        self.on_rejected = on_rejected
+
+        groups = {"default": (requests_limit, window_size), **(groups or {})}
+        self.limiters = {
+            name: RateLimiter(
+                limit,
+                window,
+                algorithm=algorithm,
+                store=create_rate_limit_store(storage, max_keys=max_keys, path=storage_path),
+            )
+            for name, (limit, window) in groups.items()
+        }
+
+        # "[METHOD ]/prefix" -> (group, cost); the longest prefix is tried first
+        self.routes = []
+        for pattern, (group, cost) in (routes or {}).items():
+            if group not in self.limiters:
+                raise ValueError(f"Rate limit route {pattern} uses unknown group {group}")
+            method, _, prefix = pattern.rpartition(" ")
+            self.routes.append((prefix, method.upper() or None, group, cost))
+        self.routes.sort(key=lambda route: len(route[0]), reverse=True)
+
+    def _match(self, method: str, path: str) -> Tuple[str, int]:
+        for prefix, route_method, group, cost in self.routes:
+            if path.startswith(prefix) and route_method in (None, method):
+                return group, cost
+        return "default", 1
+
+    def _client_key(self, scope: Scope) -> str:
+        if self.identify is not None:
+            for name, value in scope["headers"]:
+                if name == b"authorization":
+                    scheme, _, token = value.decode("latin-1").partition(" ")
+                    if scheme.lower() == "bearer" and token:
+                        user_id = self.identify(token)
+                        if user_id is not None:
+                            return f"user:{user_id}"
+                    break
+        client = scope.get("client")
+        return f"ip:{client[0] if client else 'unknown'}"
+
+    @staticmethod
+    def _headers(decision: RateLimitDecision) -> Dict[str, str]:
+        return {
+            "X-RateLimit-Limit": str(decision.limit),
+            "X-RateLimit-Remaining": str(decision.remaining),
+            "X-RateLimit-Reset": str(math.ceil(decision.reset_after)),
+        }
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        group, cost = self._match(scope["method"], scope["path"])
+        key = f"{group}:{self._client_key(scope)}"
+        decision = await self.limiters[group].hit_async(key, cost=cost)
+        headers = self._headers(decision)
+
+        if not decision.allowed:
+            if self.on_rejected is not None:
+                self.on_rejected(group)
+            headers["Retry-After"] = str(math.ceil(decision.retry_after))
+            response = Response(content="Rate limit exceeded", status_code=429, headers=headers)
+            await response(scope, receive, send)
+            return
+
+        scope.setdefault("state", {})["rate_limit"] = RateLimitBudget(self, group, key, cost)
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).update(headers)
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
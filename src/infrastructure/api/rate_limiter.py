@@ -0,0 +1,292 @@
+import json
+import logging
+import math
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import NamedTuple, Optional, Tuple
+
+from starlette.concurrency import run_in_threadpool
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimitDecision(NamedTuple):
+    allowed: bool
+    limit: int
+    remaining: int
+    reset_after: float  # Seconds until the budget is fully restored
+    retry_after: float  # Seconds until a denied request would fit (0 when allowed)
+
+
+class TokenBucket:
+    """Bucket of ``limit`` tokens refilled continuously over ``window`` seconds."""
+
+    name = "token_bucket"
+
+    def __init__(self, limit: int, window: float):
+        self.limit = limit
+        self.window = window
+        self.rate = limit / window
+        # An idle bucket is full again after one window, so its state can go
+        self.ttl = window
+
+    def apply(self, state: Optional[tuple], now: float, cost: int) -> Tuple[tuple, RateLimitDecision]:
+        if state is None:
+            tokens = float(self.limit)
+        else:
+            tokens, last = state
+            tokens = min(float(self.limit), tokens + (now - last) * self.rate)
+
+        allowed = tokens >= cost
+        if allowed:
+            tokens -= cost
+            retry_after = 0.0
+        else:
+            retry_after = (cost - tokens) / self.rate
+
+        decision = RateLimitDecision(
+            allowed=allowed,
+            limit=self.limit,
+            remaining=int(tokens),
+            reset_after=(self.limit - tokens) / self.rate,
+            retry_after=retry_after,
+        )
+        return (tokens, now), decision
+
+
+class SlidingWindowCounter:
+    """
+    Sliding window approximated from the current and previous fixed windows.
+
+    The previous window's count is weighted by how much of it still overlaps
+    the sliding window, which needs only two counters per key.
+    """
+
+    name = "sliding_window"
+
+    def __init__(self, limit: int, window: float):
+        self.limit = limit
+        self.window = window
+        # The previous window still contributes for one window after the last hit
+        self.ttl = 2 * window
+
+    def apply(self, state: Optional[tuple], now: float, cost: int) -> Tuple[tuple, RateLimitDecision]:
+        index = int(now // self.window)
+        current = previous = 0
+        if state is not None:
+            last_index, last_current, last_previous = state
+            if last_index == index:
+                current, previous = last_current, last_previous
+            elif last_index == index - 1:
+                previous = last_current
+
+        elapsed = now - index * self.window
+        weight = 1 - elapsed / self.window
+        used = previous * weight + current
+
+        allowed = used + cost <= self.limit
+        if allowed:
+            current += cost
+            used += cost
+            retry_after = 0.0
+        elif current + cost > self.limit:
+            # Only the next window can make room
+            retry_after = self.window - elapsed
+        else:
+            # Wait until enough of the previous window has slid out
+            needed_weight = (self.limit - current - cost) / previous
+            retry_after = (1 - needed_weight) * self.window - elapsed
+
+        decision = RateLimitDecision(
+            allowed=allowed,
+            limit=self.limit,
+            remaining=max(0, math.floor(self.limit - used)),
+            reset_after=(2 * self.window - elapsed) if current else (self.window - elapsed),
+            retry_after=retry_after,
+        )
+        return (index, current, previous), decision
+
+
+ALGORITHMS = {
+    TokenBucket.name: TokenBucket,
+    SlidingWindowCounter.name: SlidingWindowCounter,
+}
+
+
+class InMemoryRateLimitStore:
+    """
+    Per-key limiter state held in process memory.
+
+    Entries are kept in last-access order and all share the algorithm's TTL,
+    so expired keys always sit at the front and are dropped lazily in
+    amortized O(1) per request. Beyond ``max_keys`` the least recently seen
+    key is evicted.
+    """
+
+    clock = staticmethod(time.monotonic)
+    # Pure memory work, cheap enough to run on the event loop
+    blocking = False
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        self.evicted_total = 0
+        self._entries: "OrderedDict[str, Tuple[float, tuple]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _expire(self, now: float) -> None:
+        entries = self._entries
+        while entries:
+            key, (expires_at, _) = next(iter(entries.items()))
+            if expires_at > now:
+                break
+            del entries[key]
+
+    def apply(self, key: str, algorithm, now: float, cost: int) -> RateLimitDecision:
+        self._expire(now)
+        entry = self._entries.pop(key, None)
+        state, decision = algorithm.apply(entry[1] if entry else None, now, cost)
+        self._entries[key] = (now + algorithm.ttl, state)
+        if len(self._entries) > self.max_keys:
+            self._entries.popitem(last=False)
+            self.evicted_total += 1
+        return decision
+
+
+class SQLiteRateLimitStore:
+    """
+    Limiter state shared by every worker process on the host.
+
+    State lives in a WAL-mode SQLite file with ``synchronous=OFF`` (losing
+    counters in a crash is harmless), and each hit is one ``BEGIN IMMEDIATE``
+    read-modify-write so concurrent workers see a single global budget.
+    Expired rows are purged, and the table trimmed to ``max_keys``, at most
+    once per ``cleanup_interval`` seconds per process.
+
+    Hits do file I/O, so callers on an event loop run them in a thread; a
+    lock keeps the threads of one process off the shared connection at the
+    same time. A hit that cannot take the write lock within
+    ``busy_timeout_ms`` fails open.
+    """
+
+    # Wall clock, because the timestamps are compared across processes
+    clock = staticmethod(time.time)
+    blocking = True
+
+    def __init__(
+        self, path: str, max_keys: int = 100_000, cleanup_interval: float = 30.0, busy_timeout_ms: int = 50
+    ):
+        self.path = path
+        self.max_keys = max_keys
+        self.cleanup_interval = cleanup_interval
+        self.busy_timeout_ms = busy_timeout_ms
+        self.evicted_total = 0
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pid: Optional[int] = None
+        self._next_cleanup = 0.0
+        self._lock = threading.Lock()
+
+    def _connection(self) -> sqlite3.Connection:
+        # Connections must not cross a fork, so each worker opens its own
+        if self._conn is None or self._pid != os.getpid():
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            conn = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=OFF")
+            conn.execute(f"PRAGMA busy_timeout={int(self.busy_timeout_ms)}")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS rate_limits ("
+                "key TEXT PRIMARY KEY, state TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_rate_limits_expires_at ON rate_limits (expires_at)")
+            self._conn = conn
+            self._pid = os.getpid()
+        return self._conn
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection().execute("SELECT COUNT(*) FROM rate_limits").fetchone()[0]
+
+    def _cleanup(self, conn: sqlite3.Connection, now: float) -> None:
+        conn.execute("DELETE FROM rate_limits WHERE expires_at <= ?", (now,))
+        overflow = conn.execute("SELECT COUNT(*) FROM rate_limits").fetchone()[0] - self.max_keys
+        if overflow > 0:
+            conn.execute(
+                "DELETE FROM rate_limits WHERE key IN "
+                "(SELECT key FROM rate_limits ORDER BY expires_at LIMIT ?)",
+                (overflow,),
+            )
+            self.evicted_total += overflow
+        self._next_cleanup = now + self.cleanup_interval
+
+    def apply(self, key: str, algorithm, now: float, cost: int) -> RateLimitDecision:
+        with self._lock:
+            return self._apply(key, algorithm, now, cost)
+
+    def _apply(self, key: str, algorithm, now: float, cost: int) -> RateLimitDecision:
+        conn = self._connection()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                if now >= self._next_cleanup:
+                    self._cleanup(conn, now)
+                row = conn.execute(
+                    "SELECT state, expires_at FROM rate_limits WHERE key = ?", (key,)
+                ).fetchone()
+                state = tuple(json.loads(row[0])) if row and row[1] > now else None
+                state, decision = algorithm.apply(state, now, cost)
+                conn.execute(
+                    "INSERT INTO rate_limits (key, state, expires_at) VALUES (?, ?, ?) "
+                    "ON CONFLICT(key) DO UPDATE SET state = excluded.state, expires_at = excluded.expires_at",
+                    (key, json.dumps(state), now + algorithm.ttl),
+                )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        except sqlite3.OperationalError as e:
+            # Fail open: a contended or broken limiter must not take the API down
+            logger.warning(f"Rate limit store unavailable: {e}")
+            return RateLimitDecision(True, algorithm.limit, algorithm.limit, 0.0, 0.0)
+        return decision
+
+
+def create_rate_limit_store(backend: str = "memory", max_keys: int = 100_000, path: str = ""):
+    """Build the limiter store selected in settings."""
+    if backend == "memory":
+        return InMemoryRateLimitStore(max_keys=max_keys)
+    if backend == "sqlite":
+        return SQLiteRateLimitStore(path, max_keys=max_keys)
+    raise ValueError(f"Unknown rate limit storage backend {backend}")
+
+
+class RateLimiter:
+    """Applies a rate limiting algorithm to keys held in a store."""
+
+    def __init__(
+        self,
+        requests_limit: int,
+        window_size: float,
+        algorithm: str = SlidingWindowCounter.name,
+        store: Optional[InMemoryRateLimitStore] = None,
+    ):
+        if algorithm not in ALGORITHMS:
+            raise ValueError(f"Unknown rate limit algorithm {algorithm}")
+        self.algorithm = ALGORITHMS[algorithm](requests_limit, window_size)
+        self.store = store if store is not None else InMemoryRateLimitStore()
+
+    def hit(self, key: str, cost: int = 1, now: Optional[float] = None) -> RateLimitDecision:
+        """Charge ``cost`` units to ``key`` and report whether it is allowed."""
+        if now is None:
+            now = self.store.clock()
+        return self.store.apply(key, self.algorithm, now, cost)
+
+    async def hit_async(self, key: str, cost: int = 1) -> RateLimitDecision:
+        """``hit`` from the event loop, moved to a thread when the store does blocking I/O."""
+        if self.store.blocking:
+            return await run_in_threadpool(self.hit, key, cost)
+        return self.hit(key, cost)
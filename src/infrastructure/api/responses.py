@@ -0,0 +1,44 @@
+from functools import lru_cache
+from typing import Any
+
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+try:
+    import orjson
+except ImportError:  # optional: pydantic-core's JSON serializer is used instead
+    orjson = None
+
+
+@lru_cache(maxsize=None)
+def _adapter(content_type: type) -> TypeAdapter:
+    return TypeAdapter(content_type)
+
+
+def prepare_serializers(*content_types: type) -> None:
+    """Build the serializers for these types now instead of on their first response."""
+    for content_type in content_types:
+        _adapter(content_type)
+
+
+def dump_json(content: Any) -> bytes:
+    """Serialize a pydantic model (or plain JSON data) to compact JSON bytes."""
+    adapter = _adapter(type(content))
+    if orjson is not None:
+        # pydantic-core dumps to builtins, orjson encodes them and the datetimes
+        return orjson.dumps(adapter.dump_python(content), option=orjson.OPT_UTC_Z)
+    return adapter.dump_json(content)
+
+
+class ModelJSONResponse(JSONResponse):
+    """
+    JSON response that serializes a pydantic model in a single pass.
+
+    When a route returns a model, FastAPI dumps it, validates the dump
+    against the response model, dumps it again and passes the result to
+    json.dumps. Routes that return this response instead skip all of that;
+    the route's response_model still documents the schema.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dump_json(content)
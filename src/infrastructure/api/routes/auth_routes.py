@@ -3,7 +3,7 @@ from fastapi.security import OAuth2PasswordRequestForm
 
 from src.application.dtos.user_dto import Token, UserLogin
 from src.application.use_cases.auth_use_case import AuthUseCase
-from src.infrastructure.api.dependencies import get_auth_use_case
+from src.infrastructure.api.dependencies import get_auth_use_case, run_use_case
 
 router = APIRouter(
     prefix="/auth",
@@ -22,7 +22,7 @@ async def login(
     - **username**: Username
     - **password**: Password
     """
-    token = auth_use_case.authenticate(form_data.username, form_data.password)
+    token = await run_use_case(auth_use_case.authenticate, form_data.username, form_data.password)
     if not token:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -43,7 +43,7 @@ async def login_json(
     - **username**: Username
     - **password**: Password
     """
-    token = auth_use_case.authenticate(user_login.username, user_login.password)
+    token = await run_use_case(auth_use_case.authenticate, user_login.username, user_login.password)
     if not token:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -1,11 +1,16 @@
 import os
 import time
 from datetime import datetime
+from typing import Union
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from src.infrastructure.database.database import get_db
+from src.infrastructure.api.container import Container
+from src.infrastructure.api.dependencies import get_container, get_db
 
 router = APIRouter(
     prefix="/health",
@@ -23,11 +28,15 @@ async def health_check():
     }
 
 @router.get("/readiness")
-async def readiness_check(db: Session = Depends(get_db)):
+async def readiness_check(db: Union[Session, AsyncSession] = Depends(get_db)):
     """Database readiness check."""
     try:
         # Test database connection
-        db.execute("SELECT 1")
+        if isinstance(db, AsyncSession):
+            await db.execute(text("SELECT 1"))
+        else:
+            # Sync sessions do blocking I/O, so keep it off the event loop
+            await run_in_threadpool(db.execute, text("SELECT 1"))
         db_status = "ok"
     except Exception as e:
         db_status = f"error: {str(e)}"
@@ -38,6 +47,33 @@ async def readiness_check(db: Session = Depends(get_db)):
         "timestamp": datetime.utcnow().isoformat()
     }
 
+@router.get("/hashing")
+async def hashing_status(container: Container = Depends(get_container)):
+    """Password hashing admission gauges."""
+    return container.hashing_admission.stats()
+
+@router.get("/writer")
+async def writer_status(container: Container = Depends(get_container)):
+    """Group-commit writer batch counters."""
+    if container.group_commit_writer is None:
+        return {"enabled": False}
+    return {"enabled": True, **container.group_commit_writer.stats()}
+
+@router.get("/user-cache")
+async def user_cache_status(container: Container = Depends(get_container)):
+    """User repository cache counters."""
+    return container.user_cache.stats()
+
+@router.get("/token-cache")
+async def token_cache_status(container: Container = Depends(get_container)):
+    """Verified access token cache counters."""
+    return container.token_cache.stats()
+
+@router.get("/startup")
+async def startup_status(request: Request):
+    """Time spent importing, building and starting the app, by phase."""
+    return request.app.state.startup_report.as_dict()
+
 @router.get("/info")
 async def system_info():
     """System information."""
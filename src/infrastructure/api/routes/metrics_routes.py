@@ -0,0 +1,14 @@
+from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
+
+from src.infrastructure.api.container import Container
+from src.infrastructure.api.dependencies import get_container
+from src.infrastructure.api.metrics import CONTENT_TYPE
+
+router = APIRouter(tags=["metrics"])
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def metrics(container: Container = Depends(get_container)):
+    """Request, rate limiting, password hashing and connection pool metrics for Prometheus."""
+    return PlainTextResponse(container.metrics.render(), media_type=CONTENT_TYPE)
@@ -1,10 +1,36 @@
-from typing import List
+import codecs
+import json
+from datetime import datetime
+from typing import List, Literal, Optional, Union
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, File, HTTPException, Request, UploadFile, status
+from fastapi.responses import StreamingResponse
 
-from src.application.dtos.user_dto import UserCreate, UserResponse, UserUpdate, UsersPage
+from src.application.dtos.user_dto import (
+    UserCreate,
+    UserResponse,
+    UsersBulkActionResponse,
+    UsersBulkCreate,
+    UsersBulkCreateResponse,
+    UsersBulkDeactivate,
+    UsersBulkDelete,
+    UsersCursorPage,
+    UserUpdate,
+    UsersPage,
+)
+from src.application.use_cases.user_import_use_case import UserImportUseCase, read_import_rows
 from src.application.use_cases.user_use_case import UserUseCase
-from src.infrastructure.api.dependencies import get_current_user_id, get_user_use_case
+from src.infrastructure.api.dependencies import (
+    charge_rate_limit_items,
+    get_current_user_id,
+    get_settings,
+    get_user_import_use_case,
+    get_user_use_case,
+    run_use_case,
+)
+from src.infrastructure.api.exporters import EXPORT_FORMATS, encode_batches
+from src.infrastructure.api.responses import ModelJSONResponse
+from src.settings import Settings
 
 router = APIRouter(
     prefix="/users",
@@ -20,7 +46,7 @@ router = APIRouter(
 async def create_user(
     user_create: UserCreate,
     user_use_case: UserUseCase = Depends(get_user_use_case),
-) -> UserResponse:
+) -> ModelJSONResponse:
     """
     Create a new user.
     
@@ -29,33 +55,200 @@ async def create_user(
     - **password**: Password (will be hashed)
     """
     try:
-        return user_use_case.create_user(user_create)
+        created_user = await run_use_case(user_use_case.create_user, user_create)
+        return ModelJSONResponse(created_user, status_code=status.HTTP_201_CREATED)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@router.post(
+    "/bulk",
+    response_model=UsersBulkCreateResponse,
+    dependencies=[Depends(get_current_user_id)]
+)
+async def create_users_bulk(
+    request: Request,
+    users_bulk: UsersBulkCreate,
+    user_use_case: UserUseCase = Depends(get_user_use_case),
+    settings: Settings = Depends(get_settings),
+) -> ModelJSONResponse:
+    """
+    Create many users in one request.
+    
+    - **items**: List of users to create, each with username, email and password
+    
+    Items that conflict with existing users or with each other are reported
+    per item; the rest are inserted in a single transaction.
+    """
+    if len(users_bulk.items) > settings.bulk_create_max_items:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.bulk_create_max_items} users can be created per request",
+        )
+    # Every item is hashed, so each one after the first (charged on admission) draws on the bulk budget
+    await charge_rate_limit_items(request, len(users_bulk.items) - 1)
+    try:
+        return ModelJSONResponse(await run_use_case(user_use_case.create_users, users_bulk.items))
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 
+def _check_bulk_ids(ids: Optional[List[int]], settings: Settings) -> None:
+    if ids is not None and len(ids) > settings.bulk_action_max_ids:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.bulk_action_max_ids} ids can be given per request",
+        )
+
+
+@router.post(
+    "/bulk-deactivate",
+    response_model=UsersBulkActionResponse,
+    dependencies=[Depends(get_current_user_id)]
+)
+async def deactivate_users_bulk(
+    selection: UsersBulkDeactivate,
+    user_use_case: UserUseCase = Depends(get_user_use_case),
+    settings: Settings = Depends(get_settings),
+) -> ModelJSONResponse:
+    """
+    Deactivate many users with set-based updates.
+    
+    - **ids**: Users to deactivate
+    - **created_before**: Only users created before this time
+    
+    At least one filter is required; users must match all given filters.
+    Users that are already inactive are not counted in **affected**.
+    """
+    _check_bulk_ids(selection.ids, settings)
+    return ModelJSONResponse(
+        await run_use_case(user_use_case.deactivate_users, selection, settings.bulk_action_chunk_size)
+    )
+
+
+@router.post(
+    "/bulk-delete",
+    response_model=UsersBulkActionResponse,
+    dependencies=[Depends(get_current_user_id)]
+)
+async def delete_users_bulk(
+    selection: UsersBulkDelete,
+    user_use_case: UserUseCase = Depends(get_user_use_case),
+    settings: Settings = Depends(get_settings),
+) -> ModelJSONResponse:
+    """
+    Delete many users with set-based deletes.
+    
+    - **ids**: Users to delete
+    - **created_before**: Only users created before this time
+    - **is_active**: Only active or only inactive users
+    
+    At least one of ids or created_before is required; users must match all given filters.
+    """
+    _check_bulk_ids(selection.ids, settings)
+    return ModelJSONResponse(
+        await run_use_case(user_use_case.delete_users, selection, settings.bulk_action_chunk_size)
+    )
+
+
+@router.post(
+    "/import",
+    response_class=StreamingResponse,
+    dependencies=[Depends(get_current_user_id)]
+)
+async def import_users(
+    file: UploadFile = File(...),
+    format: Optional[Literal["csv", "ndjson"]] = None,
+    user_import_use_case: UserImportUseCase = Depends(get_user_import_use_case),
+) -> StreamingResponse:
+    """
+    Import users from an uploaded CSV or NDJSON file.
+    
+    - **file**: Rows with username, email and either password or hashed_password
+      (argon2/bcrypt), plus optional is_active
+    - **format**: `csv` or `ndjson`; inferred from the file name when omitted
+    
+    At most `IMPORT_MAX_PLAIN_PASSWORDS` (default 500) plain passwords are
+    hashed per upload, each drawing on the caller's `bulk` rate limit; rows
+    past that are rejected, so larger files must send `hashed_password`.
+    
+    The response streams NDJSON events: one `rejected` line per bad row, a
+    `progress` line after each committed chunk and a final `summary`. A file
+    that is not UTF-8 or not valid CSV is rejected at the line where reading
+    failed, and the import stops there.
+    """
+    import_format = format or ("csv" if (file.filename or "").lower().endswith(".csv") else "ndjson")
+    rows = read_import_rows(codecs.iterdecode(file.file, "utf-8-sig"), import_format)
+
+    async def events():
+        async for event in user_import_use_case.import_users(rows):
+            yield json.dumps(event) + "\n"
+
+    return StreamingResponse(events(), media_type="application/x-ndjson")
+
+
 @router.get(
     "/", 
-    response_model=UsersPage, 
+    response_model=Union[UsersPage, UsersCursorPage], 
     dependencies=[Depends(get_current_user_id)]
 )
 async def list_users(
     page: int = 1,
     size: int = 10,
+    cursor: Optional[str] = None,
+    exact: bool = False,
     user_use_case: UserUseCase = Depends(get_user_use_case),
-) -> UsersPage:
+) -> ModelJSONResponse:
     """
     List all users with pagination.
     
     - **page**: Page number (starts at 1)
     - **size**: Number of items per page
+    - **cursor**: Switches to cursor pagination; pass it empty for the first page,
+      then the returned `next_cursor` or `prev_cursor`
+    - **exact**: Count users with COUNT(*) instead of the maintained counter
     """
     if page < 1:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Page must be >= 1")
     if size < 1:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Size must be >= 1")
-        
-    return user_use_case.list_users(page=page, size=size)
+
+    if cursor is not None:
+        try:
+            users_page = await run_use_case(user_use_case.list_users_by_cursor, cursor=cursor, size=size)
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    else:
+        users_page = await run_use_case(user_use_case.list_users, page=page, size=size, exact=exact)
+    return ModelJSONResponse(users_page)
+
+
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    dependencies=[Depends(get_current_user_id)]
+)
+async def export_users(
+    format: Literal["ndjson", "csv"] = "ndjson",
+    updated_since: Optional[datetime] = None,
+    user_use_case: UserUseCase = Depends(get_user_use_case),
+    settings: Settings = Depends(get_settings),
+) -> StreamingResponse:
+    """
+    Stream every user as NDJSON or CSV.
+    
+    - **format**: `ndjson` (default) or `csv`
+    - **updated_since**: Only export users updated at or after this timestamp
+    """
+    batches = await run_use_case(
+        user_use_case.export_users, updated_since=updated_since, batch_size=settings.export_batch_size
+    )
+    media_type = EXPORT_FORMATS[format][0]
+    return StreamingResponse(
+        encode_batches(batches, format),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="users.{format}"'},
+    )
 
 
 @router.get(
@@ -66,16 +259,16 @@ async def list_users(
 async def get_user(
     user_id: int,
     user_use_case: UserUseCase = Depends(get_user_use_case),
-) -> UserResponse:
+) -> ModelJSONResponse:
     """
     Get a specific user by ID.
     
     - **user_id**: User ID
     """
-    user = user_use_case.get_user(user_id)
+    user = await run_use_case(user_use_case.get_user, user_id)
     if not user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"User with ID {user_id} not found")
-    return user
+    return ModelJSONResponse(user)
 
 
 @router.put(
@@ -87,7 +280,7 @@ async def update_user(
     user_id: int,
     user_update: UserUpdate,
     user_use_case: UserUseCase = Depends(get_user_use_case),
-) -> UserResponse:
+) -> ModelJSONResponse:
     """
     Update a user.
     
@@ -95,10 +288,10 @@ async def update_user(
     - **user_update**: User data to update
     """
     try:
-        updated_user = user_use_case.update_user(user_id, user_update)
+        updated_user = await run_use_case(user_use_case.update_user, user_id, user_update)
         if not updated_user:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"User with ID {user_id} not found")
-        return updated_user
+        return ModelJSONResponse(updated_user)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
@@ -117,6 +310,6 @@ async def delete_user(
     
     - **user_id**: ID of user to delete
     """
-    result = user_use_case.delete_user(user_id)
+    result = await run_use_case(user_use_case.delete_user, user_id)
     if not result:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"User with ID {user_id} not found")
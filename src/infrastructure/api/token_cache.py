@@ -0,0 +1,102 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Callable, Optional, Tuple
+
+from pydantic import ValidationError
+
+from src.application.dtos.user_dto import TokenPayload
+
+# Verifies a token: (user ID, exp timestamp) when valid and unexpired, else None
+TokenVerifier = Callable[[str], Optional[Tuple[int, float]]]
+
+
+def verify_access_token(token: str, secret_key: str, algorithm: str) -> Optional[Tuple[int, int]]:
+    """Return the user ID and expiry of a valid, unexpired access token, or None."""
+    # Imported here so jose and its crypto backends load with the first token, not the app
+    from jose import JWTError, jwt
+
+    try:
+        payload = jwt.decode(token, secret_key, algorithms=[algorithm])
+        user_id_str: str = payload.get("sub")
+        
+        if user_id_str is None:
+            return None
+            
+        token_payload = TokenPayload(sub=user_id_str, exp=payload.get("exp"))
+        
+        current_timestamp = datetime.now(timezone.utc).timestamp()
+        if token_payload.exp < current_timestamp:
+            return None
+            
+        return int(token_payload.sub), token_payload.exp
+    except (JWTError, ValidationError, ValueError):
+        return None
+
+
+class VerifiedTokenCache:
+    """
+    Bounded LRU cache of access tokens that passed verification.
+
+    Entries are keyed by a digest of the token, so raw bearer tokens are not
+    kept in memory, and expire at the token's own ``exp``: a cached token is
+    never accepted after ``verify`` would have rejected it. Only valid tokens
+    are cached, so garbage tokens cannot push out real ones.
+    """
+
+    def __init__(self, verify: TokenVerifier, max_size: int = 10_000, clock: Callable[[], float] = time.time):
+        self.verify = verify
+        self.max_size = max_size
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self._entries: "OrderedDict[bytes, Tuple[int, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def user_id(self, token: str) -> Optional[int]:
+        """Return the user ID of a valid, unexpired token, or None."""
+        key = hashlib.blake2b(token.encode(), digest_size=16).digest()
+        now = self.clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                user_id, expires_at = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return user_id
+                del self._entries[key]
+                self.expirations += 1
+            self.misses += 1
+
+        verified = self.verify(token)
+        if verified is None:
+            return None
+        user_id, expires_at = verified
+        if self.max_size > 0:
+            with self._lock:
+                self._entries[key] = (user_id, expires_at)
+                while len(self._entries) > self.max_size:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+        return user_id
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
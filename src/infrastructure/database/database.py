@@ -1,34 +1,96 @@
 import os
 import logging
-from sqlalchemy import create_engine
+from typing import Dict
+from sqlalchemy import Engine
+from sqlalchemy.ext.asyncio import async_sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.sql.expression import UpdateBase
 
-# Use environment variable with fallback to default path
-SQLALCHEMY_DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./data/user_management.db")
+from src.infrastructure.database.sqlite_tuning import (
+    create_tuned_async_engine,
+    create_tuned_engine,
+    is_file_database,
+)
+from src.settings import Settings
 
-# Create data directory if it doesn't exist and we're not using memory DB
-if "sqlite:///" in SQLALCHEMY_DATABASE_URL and ":memory:" not in SQLALCHEMY_DATABASE_URL:
-    db_path = SQLALCHEMY_DATABASE_URL.replace("sqlite:///", "")
-    os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+Base = declarative_base()
 
-# Log which database URL we're using
-logging.info(f"Using database URL: {SQLALCHEMY_DATABASE_URL}")
 
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
-)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+class RoutingSession(Session):
+    """
+    Session that sends flushes and INSERT/UPDATE/DELETE statements to the
+    writer engine and every other statement to the read-only pool.
 
-Base = declarative_base()
+    Repositories commit right after each write, so under WAL the next read
+    starts a fresh snapshot that already includes it.
+    """
+
+    def __init__(self, writer: Engine, reader: Engine, **kwargs):
+        super().__init__(**kwargs)
+        self.writer = writer
+        self.reader = reader
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if self._flushing or isinstance(clause, UpdateBase):
+            return self.writer
+        return self.reader
+
+
+class Database:
+    """
+    Engines and session factories for one database URL.
+
+    PRAGMAs and pool limits come from settings, see sqlite_tuning. Writes are
+    serialized through a single connection; reads use a pool of mode=ro,
+    query_only connections. An in-memory database cannot be shared between
+    connections, so there the writer serves reads too. No connection is
+    opened until a session first needs one.
+    """
+
+    def __init__(self, url: str, settings: Settings):
+        self.url = url
+        # Same database, driven through aiosqlite for the async data path
+        self.async_url = url.replace("sqlite://", "sqlite+aiosqlite://", 1)
+        self.is_file = is_file_database(url)
+        if self.is_file:
+            os.makedirs(os.path.dirname(os.path.abspath(url.replace("sqlite:///", ""))), exist_ok=True)
+        logging.info(f"Using database URL: {url}")
+
+        self.engine = create_tuned_engine(url, settings, writer=True)
+        self.read_engine = create_tuned_engine(url, settings, read_only=True) if self.is_file else self.engine
+        self.session_factory = sessionmaker(
+            class_=RoutingSession, writer=self.engine, reader=self.read_engine, autocommit=False, autoflush=False
+        )
+        # Sessions of the group-commit writer thread, bound to the writer alone
+        self.writer_session_factory = sessionmaker(bind=self.engine, autoflush=False, expire_on_commit=False)
+
+        self.async_engine = create_tuned_async_engine(self.async_url, settings, writer=True)
+        self.async_read_engine = (
+            create_tuned_async_engine(self.async_url, settings, read_only=True) if self.is_file else self.async_engine
+        )
+        self.async_session_factory = async_sessionmaker(
+            sync_session_class=RoutingSession,
+            writer=self.async_engine.sync_engine,
+            reader=self.async_read_engine.sync_engine,
+            autoflush=False,
+            expire_on_commit=False,
+        )
+
+    def engines(self) -> Dict[str, Engine]:
+        """Each distinct engine by role; async engines are given as their sync engines."""
+        engines = {"writer": self.engine, "async_writer": self.async_engine.sync_engine}
+        if self.read_engine is not self.engine:
+            engines["reader"] = self.read_engine
+            engines["async_reader"] = self.async_read_engine.sync_engine
+        return engines
 
-# Create a function to explicitly create all tables
-def create_tables():
-    Base.metadata.create_all(bind=engine)
+    def create_tables(self) -> None:
+        Base.metadata.create_all(bind=self.engine)
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+    async def dispose(self) -> None:
+        """Close every pooled connection."""
+        await self.async_engine.dispose()
+        await self.async_read_engine.dispose()
+        self.engine.dispose()
+        self.read_engine.dispose()
@@ -0,0 +1,145 @@
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+# Takes the writer's session, must not commit, returns the caller's result
+WriteOperation = Callable[[Session], Any]
+
+_STOP = object()
+
+
+class GroupCommitWriter:
+    """
+    Single writer thread that applies queued write operations in batches.
+
+    The thread takes the first queued operation, then collects more until
+    ``max_batch`` are pending or ``max_delay`` seconds have passed, runs them
+    in one transaction and commits once. Each caller's future gets its
+    result or exception after that commit.
+
+    Operations must be safe to run again. If one fails, the transaction is
+    rolled back and the batch replayed with each operation in its own
+    SAVEPOINT. A constraint error then fails only its own caller, without
+    paying for savepoints on the common path.
+    """
+
+    def __init__(self, session_factory: Callable[[], Session], max_batch: int = 256, max_delay: float = 0.0):
+        self.session_factory = session_factory
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.batches_total = 0
+        self.operations_total = 0
+        self.largest_batch = 0
+        self.replayed_batches = 0
+        self._queue: "queue.Queue" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def submit(self, operation: WriteOperation) -> Future:
+        """Queue ``operation`` for the next batch."""
+        if self._thread is None:
+            self._start()
+        future: Future = Future()
+        self._queue.put((operation, future))
+        return future
+
+    def run(self, operation: WriteOperation) -> Any:
+        """Queue ``operation`` and block until its batch has been committed."""
+        return self.submit(operation).result()
+
+    def shutdown(self) -> None:
+        """Apply everything already queued, then stop the writer thread."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._queue.put(_STOP)
+            thread.join()
+
+    def stats(self) -> dict:
+        return {
+            "queue_depth": self._queue.qsize(),
+            "batches_total": self.batches_total,
+            "operations_total": self.operations_total,
+            "largest_batch": self.largest_batch,
+            "replayed_batches": self.replayed_batches,
+            "average_batch": self.operations_total / self.batches_total if self.batches_total else 0.0,
+        }
+
+    def _start(self) -> None:
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="group-commit-writer", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+            batch = [item]
+            deadline = time.monotonic() + self.max_delay
+            while len(batch) < self.max_batch:
+                timeout = deadline - time.monotonic()
+                try:
+                    item = self._queue.get(timeout=timeout) if timeout > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            self._apply(batch)
+
+    def _apply(self, batch: List[Tuple[WriteOperation, Future]]) -> None:
+        pending = [(operation, future) for operation, future in batch if future.set_running_or_notify_cancel()]
+        if not pending:
+            return
+        try:
+            try:
+                outcomes = self._execute(pending, isolate=False)
+            except Exception:
+                if len(pending) == 1:
+                    raise
+                # Some write failed: replay the batch with each write in its own savepoint
+                self.replayed_batches += 1
+                outcomes = self._execute(pending, isolate=True)
+        except Exception as e:
+            if len(pending) > 1:
+                logger.warning(f"Group commit of {len(pending)} writes failed: {e}")
+            for _, future in pending:
+                future.set_exception(e)
+            return
+
+        self.batches_total += 1
+        self.operations_total += len(pending)
+        self.largest_batch = max(self.largest_batch, len(pending))
+        for future, succeeded, value in outcomes:
+            if succeeded:
+                future.set_result(value)
+            else:
+                future.set_exception(value)
+
+    def _execute(self, batch: List[Tuple[WriteOperation, Future]], isolate: bool) -> List[Tuple[Future, bool, Any]]:
+        outcomes: List[Tuple[Future, bool, Any]] = []
+        with self.session_factory() as session:
+            for operation, future in batch:
+                if not isolate:
+                    outcomes.append((future, True, operation(session)))
+                    continue
+                try:
+                    with session.begin_nested():
+                        result = operation(session)
+                except Exception as e:
+                    outcomes.append((future, False, e))
+                else:
+                    outcomes.append((future, True, result))
+            session.commit()
+        return outcomes
@@ -0,0 +1,53 @@
+from sqlalchemy import Boolean, Column, Integer, event
+
+from src.infrastructure.database.database import Base
+from src.infrastructure.database.models.user_model import UserModel  # noqa: F401 - triggers target users
+
+
+class UserCountModel(Base):
+    """Row count of the users table per is_active value, kept current by triggers."""
+    __tablename__ = "user_counts"
+
+    is_active = Column(Boolean, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+
+# A NULL is_active is counted as active, matching the column default
+USER_COUNT_TRIGGERS = [
+    """
+    CREATE TRIGGER IF NOT EXISTS users_count_insert AFTER INSERT ON users
+    BEGIN
+        UPDATE user_counts SET count = count + 1 WHERE is_active = COALESCE(NEW.is_active, 1);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS users_count_delete AFTER DELETE ON users
+    BEGIN
+        UPDATE user_counts SET count = count - 1 WHERE is_active = COALESCE(OLD.is_active, 1);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS users_count_update AFTER UPDATE OF is_active ON users
+    WHEN COALESCE(OLD.is_active, 1) <> COALESCE(NEW.is_active, 1)
+    BEGIN
+        UPDATE user_counts SET count = count - 1 WHERE is_active = COALESCE(OLD.is_active, 1);
+        UPDATE user_counts SET count = count + 1 WHERE is_active = COALESCE(NEW.is_active, 1);
+    END
+    """,
+]
+
+# Seeds both rows from the real table; existing counters are left alone
+USER_COUNT_BACKFILL = """
+    INSERT OR IGNORE INTO user_counts (is_active, count)
+    SELECT flag, (SELECT COUNT(*) FROM users WHERE COALESCE(is_active, 1) = flag)
+    FROM (SELECT 0 AS flag UNION ALL SELECT 1)
+"""
+
+
+@event.listens_for(Base.metadata, "after_create")
+def install_user_count_triggers(target, connection, **kw):
+    if connection.dialect.name != "sqlite":
+        return
+    for trigger in USER_COUNT_TRIGGERS:
+        connection.exec_driver_sql(trigger)
+    connection.exec_driver_sql(USER_COUNT_BACKFILL)
@@ -0,0 +1,172 @@
+import os
+from typing import Any, Dict, List, Tuple
+
+from sqlalchemy import Engine, create_engine, event
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from src.settings import Settings
+
+_SYNCHRONOUS_LEVELS = ("OFF", "NORMAL", "FULL", "EXTRA")
+_TEMP_STORES = ("DEFAULT", "FILE", "MEMORY")
+
+
+def sqlite_pragmas(settings: Settings, read_only: bool = False) -> List[Tuple[str, Any]]:
+    """PRAGMAs applied to every new connection, in order."""
+    pragmas = [
+        # First, so the remaining statements wait on a locked database instead of failing
+        ("busy_timeout", settings.sqlite_busy_timeout),
+        ("journal_mode", settings.sqlite_journal_mode),
+        ("synchronous", settings.sqlite_synchronous),
+        ("mmap_size", settings.sqlite_mmap_size),
+        ("cache_size", settings.sqlite_cache_size),
+        ("temp_store", settings.sqlite_temp_store),
+    ]
+    if read_only:
+        # The journal mode is a property of the file, set by the writer
+        pragmas = [pragma for pragma in pragmas if pragma[0] != "journal_mode"]
+        pragmas.append(("query_only", "ON"))
+    return pragmas
+
+
+def install_pragmas(engine: Engine, pragmas: List[Tuple[str, Any]]) -> None:
+    """Run ``pragmas`` on each DBAPI connection as the pool opens it."""
+
+    @event.listens_for(engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas:
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+
+
+def install_immediate_begin(engine: Engine) -> None:
+    """
+    Take over transaction control from the sqlite3 driver and start each
+    transaction with BEGIN IMMEDIATE.
+
+    The driver otherwise defers BEGIN until the first DML statement, which
+    breaks SAVEPOINTs. Taking the write lock up front also means a writer
+    never has to upgrade a read lock mid-transaction.
+    """
+
+    @event.listens_for(engine, "connect")
+    def disable_driver_transactions(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def begin_immediate(connection):
+        connection.exec_driver_sql("BEGIN IMMEDIATE")
+
+
+def is_file_database(url: str) -> bool:
+    return ":memory:" not in url and not url.rstrip("/").endswith(":")
+
+
+def read_only_url(url: str) -> str:
+    """Rewrite a file database URL so SQLite opens it with ``mode=ro``."""
+    prefix, _, path = url.partition(":///")
+    return f"{prefix}:///file:{path}{'&' if '?' in path else '?'}mode=ro&uri=true"
+
+
+def pool_options(url: str, settings: Settings, writer: bool = False) -> Dict[str, Any]:
+    """
+    Pool arguments for ``url``.
+
+    The writer pool holds exactly one connection, so writes queue on checkout
+    instead of contending for SQLite's lock. In-memory databases keep
+    SQLAlchemy's single-connection pools.
+    """
+    if not is_file_database(url):
+        return {}
+    return {
+        "pool_size": 1 if writer else settings.db_pool_size or os.cpu_count() or 1,
+        "max_overflow": 0 if writer else settings.db_max_overflow,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_timeout": settings.db_pool_timeout,
+    }
+
+
+def create_tuned_engine(url: str, settings: Settings, read_only: bool = False, writer: bool = False) -> Engine:
+    """Create a synchronous SQLite engine with the tuning profile applied."""
+    options = pool_options(url, settings, writer)
+    if read_only:
+        url = read_only_url(url)
+    engine = create_engine(url, connect_args={"check_same_thread": False}, **options)
+    install_pragmas(engine, sqlite_pragmas(settings, read_only))
+    if writer:
+        install_immediate_begin(engine)
+    return engine
+
+
+def create_tuned_async_engine(
+    url: str, settings: Settings, read_only: bool = False, writer: bool = False
+) -> AsyncEngine:
+    """Create an aiosqlite engine with the tuning profile applied."""
+    options = pool_options(url, settings, writer)
+    if options:
+        # aiosqlite defaults to NullPool, paying a thread and connection setup per session
+        options["poolclass"] = AsyncAdaptedQueuePool
+    if read_only:
+        url = read_only_url(url)
+    engine = create_async_engine(url, **options)
+    install_pragmas(engine.sync_engine, sqlite_pragmas(settings, read_only))
+    if writer:
+        install_immediate_begin(engine.sync_engine)
+    return engine
+
+
+def describe_engine(engine: Engine) -> Dict[str, Any]:
+    """Read back the effective PRAGMA values and pool limits of ``engine``."""
+    with engine.connect() as connection:
+        def pragma(name: str):
+            return connection.exec_driver_sql(f"PRAGMA {name}").scalar()
+
+        synchronous = pragma("synchronous")
+        temp_store = pragma("temp_store")
+        profile = {
+            "journal_mode": pragma("journal_mode"),
+            "synchronous": _SYNCHRONOUS_LEVELS[synchronous] if synchronous < len(_SYNCHRONOUS_LEVELS) else synchronous,
+            "mmap_size": pragma("mmap_size"),
+            "cache_size": pragma("cache_size"),
+            "busy_timeout": pragma("busy_timeout"),
+            "temp_store": _TEMP_STORES[temp_store] if temp_store < len(_TEMP_STORES) else temp_store,
+            "query_only": bool(pragma("query_only")),
+        }
+
+    pool = engine.pool
+    profile["pool"] = type(pool).__name__
+    if isinstance(pool, QueuePool):
+        profile.update(pool_size=pool.size(), max_overflow=pool._max_overflow, pool_recycle=pool._recycle)
+    return profile
+
+
+def _pool_size(pool) -> int:
+    return pool.size() if isinstance(pool, QueuePool) else 1
+
+
+def prime_pool(engine: Engine) -> int:
+    """Open the pool's steady-state connections up front; returns how many."""
+    connections = []
+    try:
+        for _ in range(_pool_size(engine.pool)):
+            # A connection is fully set up (PRAGMAs included) on first checkout
+            connections.append(engine.connect())
+    finally:
+        for connection in connections:
+            connection.close()
+    return len(connections)
+
+
+async def prime_async_pool(engine: AsyncEngine) -> int:
+    """Async counterpart of prime_pool."""
+    connections = []
+    try:
+        for _ in range(_pool_size(engine.sync_engine.pool)):
+            connections.append(await engine.connect())
+    finally:
+        for connection in connections:
+            await connection.close()
+    return len(connections)
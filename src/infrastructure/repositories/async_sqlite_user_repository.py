@@ -0,0 +1,233 @@
+from datetime import datetime
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import delete, insert, or_, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.domain.entities.user import User, UserView
+from src.domain.repositories.user_repository import AsyncUserRepository
+from src.infrastructure.database.models.user_model import UserModel
+from src.infrastructure.repositories.sqlite_user_repository import (
+    COUNT_USERS,
+    GENERATED_COLUMNS,
+    SELECT_AFTER,
+    SELECT_BEFORE,
+    SELECT_PAGE,
+    SELECT_USER_BY,
+    VIEW_COLUMNS,
+    delete_where_statement,
+    duplicate_user_error,
+    id_chunks,
+    next_window,
+    selection_criteria,
+    update_fields_statement,
+    update_where_statement,
+)
+
+
+class AsyncSQLiteUserRepository(AsyncUserRepository):
+    """SQLite implementation of AsyncUserRepository backed by aiosqlite."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    def _map_to_entity(self, model: UserModel) -> User:
+        return User(
+            id=model.id,
+            username=model.username,
+            email=model.email,
+            hashed_password=model.hashed_password,
+            is_active=model.is_active,
+            created_at=model.created_at,
+            updated_at=model.updated_at,
+        )
+
+    def _map_to_model(self, entity: User) -> UserModel:
+        return UserModel(
+            id=entity.id,
+            username=entity.username,
+            email=entity.email,
+            hashed_password=entity.hashed_password,
+            is_active=entity.is_active,
+            created_at=entity.created_at,
+            updated_at=entity.updated_at,
+        )
+
+    async def _get_one(self, *criteria) -> Optional[UserModel]:
+        result = await self.db.execute(select(UserModel).where(*criteria))
+        return result.scalars().first()
+
+    async def create(self, user: User) -> User:
+        # One INSERT ... RETURNING; the unique indexes decide conflicts atomically
+        values = self._to_row(user)
+        try:
+            result = await self.db.execute(insert(UserModel.__table__).returning(*GENERATED_COLUMNS), values)
+            row = result.one()
+            await self.db.commit()
+        except IntegrityError as e:
+            await self.db.rollback()
+            raise duplicate_user_error(e, values) from e
+        return self._with_generated(user, row)
+
+    def _to_row(self, entity: User) -> dict:
+        return {
+            "username": entity.username,
+            "email": entity.email,
+            "hashed_password": entity.hashed_password,
+            "is_active": entity.is_active,
+            "created_at": entity.created_at,
+            "updated_at": entity.updated_at,
+        }
+
+    async def create_many(self, users: List[User]) -> List[User]:
+        if not users:
+            return []
+        # One executemany Core INSERT ... RETURNING of the generated columns only,
+        # committed once; skipping ORM hydration makes large batches ~10x cheaper
+        statement = insert(UserModel.__table__).returning(*GENERATED_COLUMNS, sort_by_parameter_order=True)
+        try:
+            result = await self.db.execute(statement, [self._to_row(user) for user in users])
+            generated = result.all()
+            await self.db.commit()
+        except IntegrityError:
+            await self.db.rollback()
+            raise ValueError("Some users were created concurrently, retry the request")
+        return [self._with_generated(user, row) for user, row in zip(users, generated)]
+
+    def _with_generated(self, entity: User, row) -> User:
+        return User(
+            id=row.id,
+            username=entity.username,
+            email=entity.email,
+            hashed_password=entity.hashed_password,
+            is_active=entity.is_active,
+            created_at=row.created_at,
+            updated_at=row.updated_at,
+        )
+
+    async def find_existing_identities(self, usernames: List[str], emails: List[str]) -> Tuple[Set[str], Set[str]]:
+        result = await self.db.execute(
+            select(UserModel.username, UserModel.email).where(
+                or_(UserModel.username.in_(usernames), UserModel.email.in_(emails))
+            )
+        )
+        rows = result.all()
+        return {row.username for row in rows}, {row.email for row in rows}
+
+    async def _get_by(self, field: str, value) -> Optional[User]:
+        row = (await self.db.execute(SELECT_USER_BY[field], {"value": value})).first()
+        return User(*row) if row is not None else None
+
+    async def get_by_id(self, user_id: int) -> Optional[User]:
+        return await self._get_by("id", user_id)
+
+    async def get_by_email(self, email: str) -> Optional[User]:
+        return await self._get_by("email", email)
+
+    async def get_by_username(self, username: str) -> Optional[User]:
+        return await self._get_by("username", username)
+
+    async def update(self, user: User) -> User:
+        db_user = await self._get_one(UserModel.id == user.id)
+        if db_user:
+            db_user.username = user.username
+            db_user.email = user.email
+            db_user.hashed_password = user.hashed_password
+            db_user.is_active = user.is_active
+            db_user.updated_at = user.updated_at
+            await self.db.commit()
+            await self.db.refresh(db_user)
+            return self._map_to_entity(db_user)
+        return None
+
+    async def update_fields(self, user_id: int, changes: Dict[str, Any]) -> Optional[User]:
+        statement = update_fields_statement(user_id, changes)
+        try:
+            row = (await self.db.execute(statement)).one_or_none()
+            await self.db.commit()
+        except IntegrityError as e:
+            await self.db.rollback()
+            raise duplicate_user_error(e, changes) from e
+        return self._map_to_entity(row) if row is not None else None
+
+    async def delete(self, user_id: int) -> bool:
+        table = UserModel.__table__
+        result = await self.db.execute(delete(table).where(table.c.id == user_id))
+        await self.db.commit()
+        return result.rowcount > 0
+
+    async def update_fields_where(
+        self,
+        changes: Dict[str, Any],
+        user_ids: Optional[List[int]] = None,
+        created_before: Optional[datetime] = None,
+        is_active: Optional[bool] = None,
+        chunk_size: int = 1000,
+    ) -> int:
+        return await self._write_in_chunks(
+            update_where_statement(changes), user_ids, selection_criteria(created_before, is_active), chunk_size
+        )
+
+    async def delete_where(
+        self,
+        user_ids: Optional[List[int]] = None,
+        created_before: Optional[datetime] = None,
+        is_active: Optional[bool] = None,
+        chunk_size: int = 1000,
+    ) -> int:
+        return await self._write_in_chunks(
+            delete_where_statement, user_ids, selection_criteria(created_before, is_active), chunk_size
+        )
+
+    async def _write_in_chunks(
+        self, statement: Callable[..., Any], user_ids: Optional[List[int]], criteria: list, chunk_size: int
+    ) -> int:
+        # One set-based statement per chunk of ids, each committed on its own
+        if user_ids is not None:
+            affected = 0
+            for chunk in id_chunks(user_ids, chunk_size):
+                affected += len(await self._write_chunk(statement(chunk, *criteria)))
+            return affected
+        affected, after_id = 0, 0
+        while True:
+            ids = await self._write_chunk(statement(next_window(criteria, after_id, chunk_size)))
+            if not ids:
+                return affected
+            affected += len(ids)
+            after_id = max(ids)
+
+    async def _write_chunk(self, statement) -> List[int]:
+        ids = (await self.db.execute(statement)).scalars().all()
+        await self.db.commit()
+        return ids
+
+    async def count_users(self, is_active: Optional[bool] = None, exact: bool = False) -> int:
+        return await self.db.scalar(COUNT_USERS[exact, is_active is not None], {"is_active": is_active})
+
+    async def list_users(self, skip: int = 0, limit: int = 100, exact: bool = False) -> Tuple[List[UserView], int]:
+        total = await self.count_users(exact=exact)
+        result = await self.db.execute(SELECT_PAGE, {"skip": skip, "limit": limit})
+        return list(map(UserView._make, result)), total
+
+    async def list_users_keyset(
+        self, limit: int = 100, after_id: Optional[int] = None, before_id: Optional[int] = None
+    ) -> List[UserView]:
+        if before_id is not None:
+            # Walk backwards from the cursor, then restore ascending order
+            rows = (await self.db.execute(SELECT_BEFORE, {"cursor": before_id, "limit": limit})).all()
+            rows.reverse()
+        else:
+            rows = await self.db.execute(SELECT_AFTER, {"cursor": after_id or 0, "limit": limit})
+        return list(map(UserView._make, rows))
+
+    async def stream_users(
+        self, updated_since: Optional[datetime] = None, batch_size: int = 1000
+    ) -> AsyncIterator[List[tuple]]:
+        # Column-only select streamed with yield_per: flat memory
+        query = select(*VIEW_COLUMNS).order_by(UserModel.id)
+        if updated_since is not None:
+            query = query.where(UserModel.updated_at >= updated_since)
+        result = await self.db.stream(query.execution_options(yield_per=batch_size))
+        async for partition in result.partitions():
+            yield partition
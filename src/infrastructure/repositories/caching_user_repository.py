@@ -0,0 +1,326 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+from src.domain.entities.user import User, UserView
+from src.domain.repositories.user_repository import AsyncUserRepository, UserRepository
+
+
+class UserCache:
+    """
+    Bounded LRU + TTL cache of users, addressable by id, username and email.
+
+    Entries live in one LRU keyed by id; username and email map to ids and
+    are checked against the cached entity on lookup, so a stale index entry
+    is simply a miss. Users are copied in and out because callers mutate
+    the entities they get back before writing them.
+
+    The cache is per process: writes made by other workers only become
+    visible once the entry expires, so ``ttl`` bounds that staleness.
+    """
+
+    def __init__(self, max_size: int = 10_000, ttl: float = 30.0, clock: Callable[[], float] = time.monotonic):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self._entries: "OrderedDict[int, Tuple[User, float]]" = OrderedDict()
+        self._by_username: Dict[str, int] = {}
+        self._by_email: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        # Bumped on every invalidation so a read that raced a write is not cached
+        self._generation = 0
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def get(self, field: str, value) -> Optional[User]:
+        """Return a copy of the cached user whose ``field`` equals ``value``."""
+        with self._lock:
+            user_id = value if field == "id" else self._index(field).get(value)
+            entry = self._entries.get(user_id) if user_id is not None else None
+            if entry is not None:
+                user, expires_at = entry
+                if expires_at <= self.clock():
+                    self._remove(user_id)
+                elif getattr(user, field) == value:
+                    self._entries.move_to_end(user_id)
+                    self.hits += 1
+                    return copy.copy(user)
+            self.misses += 1
+            return None
+
+    def put(self, user: User, generation: int) -> None:
+        """Cache ``user`` unless an invalidation happened since ``generation``."""
+        if self.max_size <= 0 or user.id is None:
+            return
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._remove(user.id)
+            self._entries[user.id] = (copy.copy(user), self.clock() + self.ttl)
+            self._by_username[user.username] = user.id
+            self._by_email[user.email] = user.id
+            while len(self._entries) > self.max_size:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def invalidate(self, user_id: Optional[int] = None, usernames=(), emails=()) -> None:
+        """Drop a user by id and any entries reachable from the given keys."""
+        with self._lock:
+            self._generation += 1
+            self.invalidations += 1
+            user_ids = {user_id} if user_id is not None else set()
+            user_ids.update(self._by_username.get(username) for username in usernames)
+            user_ids.update(self._by_email.get(email) for email in emails)
+            for stale_id in user_ids:
+                if stale_id is not None:
+                    self._remove(stale_id)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+            self._by_username.clear()
+            self._by_email.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+    def _index(self, field: str) -> Dict[str, int]:
+        return self._by_username if field == "username" else self._by_email
+
+    def _remove(self, user_id: int) -> None:
+        entry = self._entries.pop(user_id, None)
+        if entry is None:
+            return
+        user = entry[0]
+        if self._by_username.get(user.username) == user_id:
+            del self._by_username[user.username]
+        if self._by_email.get(user.email) == user_id:
+            del self._by_email[user.email]
+
+
+def _keys(changes: Dict[str, Any], field: str) -> List[str]:
+    return [changes[field]] if field in changes else []
+
+
+class CachingUserRepository(UserRepository):
+    """Read-through cache in front of another UserRepository."""
+
+    def __init__(self, repository: UserRepository, cache: UserCache):
+        self.repository = repository
+        self.cache = cache
+
+    def _get(self, field: str, value, load: Callable) -> Optional[User]:
+        user = self.cache.get(field, value)
+        if user is not None:
+            return user
+        generation = self.cache.generation
+        user = load(value)
+        if user is not None:
+            self.cache.put(user, generation)
+        return user
+
+    def create(self, user: User) -> User:
+        created = self.repository.create(user)
+        self.cache.invalidate(created.id, usernames=[created.username], emails=[created.email])
+        return created
+
+    def create_many(self, users: List[User]) -> List[User]:
+        created = self.repository.create_many(users)
+        self.cache.invalidate(usernames=[user.username for user in users], emails=[user.email for user in users])
+        return created
+
+    def find_existing_identities(self, usernames: List[str], emails: List[str]) -> Tuple[Set[str], Set[str]]:
+        return self.repository.find_existing_identities(usernames, emails)
+
+    def get_by_id(self, user_id: int) -> Optional[User]:
+        return self._get("id", user_id, self.repository.get_by_id)
+
+    def get_by_email(self, email: str) -> Optional[User]:
+        return self._get("email", email, self.repository.get_by_email)
+
+    def get_by_username(self, username: str) -> Optional[User]:
+        return self._get("username", username, self.repository.get_by_username)
+
+    def update(self, user: User) -> User:
+        self.cache.invalidate(user.id)
+        try:
+            return self.repository.update(user)
+        finally:
+            self.cache.invalidate(user.id, usernames=[user.username], emails=[user.email])
+
+    def update_fields(self, user_id: int, changes: Dict[str, Any]) -> Optional[User]:
+        self.cache.invalidate(user_id)
+        try:
+            return self.repository.update_fields(user_id, changes)
+        finally:
+            self.cache.invalidate(user_id, usernames=_keys(changes, "username"), emails=_keys(changes, "email"))
+
+    def delete(self, user_id: int) -> bool:
+        try:
+            return self.repository.delete(user_id)
+        finally:
+            self.cache.invalidate(user_id)
+
+    def update_fields_where(
+        self,
+        changes: Dict[str, Any],
+        user_ids: Optional[List[int]] = None,
+        created_before: Optional[datetime] = None,
+        is_active: Optional[bool] = None,
+        chunk_size: int = 1000,
+    ) -> int:
+        try:
+            return self.repository.update_fields_where(changes, user_ids, created_before, is_active, chunk_size)
+        finally:
+            # The affected ids are not known up front; bulk writes are rare enough to start over
+            self.cache.clear()
+
+    def delete_where(
+        self,
+        user_ids: Optional[List[int]] = None,
+        created_before: Optional[datetime] = None,
+        is_active: Optional[bool] = None,
+        chunk_size: int = 1000,
+    ) -> int:
+        try:
+            return self.repository.delete_where(user_ids, created_before, is_active, chunk_size)
+        finally:
+            self.cache.clear()
+
+    def count_users(self, is_active: Optional[bool] = None, exact: bool = False) -> int:
+        return self.repository.count_users(is_active, exact)
+
+    def list_users(self, skip: int = 0, limit: int = 100, exact: bool = False) -> Tuple[List[UserView], int]:
+        return self.repository.list_users(skip, limit, exact)
+
+    def stream_users(
+        self, updated_since: Optional[datetime] = None, batch_size: int = 1000
+    ) -> Iterator[List[tuple]]:
+        return self.repository.stream_users(updated_since, batch_size)
+
+    def list_users_keyset(
+        self, limit: int = 100, after_id: Optional[int] = None, before_id: Optional[int] = None
+    ) -> List[UserView]:
+        return self.repository.list_users_keyset(limit, after_id, before_id)
+
+
+class AsyncCachingUserRepository(AsyncUserRepository):
+    """Read-through cache in front of another AsyncUserRepository."""
+
+    def __init__(self, repository: AsyncUserRepository, cache: UserCache):
+        self.repository = repository
+        self.cache = cache
+
+    async def _get(self, field: str, value, load: Callable) -> Optional[User]:
+        user = self.cache.get(field, value)
+        if user is not None:
+            return user
+        generation = self.cache.generation
+        user = await load(value)
+        if user is not None:
+            self.cache.put(user, generation)
+        return user
+
+    async def create(self, user: User) -> User:
+        created = await self.repository.create(user)
+        self.cache.invalidate(created.id, usernames=[created.username], emails=[created.email])
+        return created
+
+    async def create_many(self, users: List[User]) -> List[User]:
+        created = await self.repository.create_many(users)
+        self.cache.invalidate(usernames=[user.username for user in users], emails=[user.email for user in users])
+        return created
+
+    async def find_existing_identities(self, usernames: List[str], emails: List[str]) -> Tuple[Set[str], Set[str]]:
+        return await self.repository.find_existing_identities(usernames, emails)
+
+    async def get_by_id(self, user_id: int) -> Optional[User]:
+        return await self._get("id", user_id, self.repository.get_by_id)
+
+    async def get_by_email(self, email: str) -> Optional[User]:
+        return await self._get("email", email, self.repository.get_by_email)
+
+    async def get_by_username(self, username: str) -> Optional[User]:
+        return await self._get("username", username, self.repository.get_by_username)
+
+    async def update(self, user: User) -> User:
+        self.cache.invalidate(user.id)
+        try:
+            return await self.repository.update(user)
+        finally:
+            self.cache.invalidate(user.id, usernames=[user.username], emails=[user.email])
+
+    async def update_fields(self, user_id: int, changes: Dict[str, Any]) -> Optional[User]:
+        self.cache.invalidate(user_id)
+        try:
+            return await self.repository.update_fields(user_id, changes)
+        finally:
+            self.cache.invalidate(user_id, usernames=_keys(changes, "username"), emails=_keys(changes, "email"))
+
+    async def delete(self, user_id: int) -> bool:
+        try:
+            return await self.repository.delete(user_id)
+        finally:
+            self.cache.invalidate(user_id)
+
+    async def update_fields_where(
+        self,
+        changes: Dict[str, Any],
+        user_ids: Optional[List[int]] = None,
+        created_before: Optional[datetime] = None,
+        is_active: Optional[bool] = None,
+        chunk_size: int = 1000,
+    ) -> int:
+        try:
+            return await self.repository.update_fields_where(changes, user_ids, created_before, is_active, chunk_size)
+        finally:
+            # The affected ids are not known up front; bulk writes are rare enough to start over
+            self.cache.clear()
+
+    async def delete_where(
+        self,
+        user_ids: Optional[List[int]] = None,
+        created_before: Optional[datetime] = None,
+        is_active: Optional[bool] = None,
+        chunk_size: int = 1000,
+    ) -> int:
+        try:
+            return await self.repository.delete_where(user_ids, created_before, is_active, chunk_size)
+        finally:
+            self.cache.clear()
+
+    async def count_users(self, is_active: Optional[bool] = None, exact: bool = False) -> int:
+        return await self.repository.count_users(is_active, exact)
+
+    async def list_users(self, skip: int = 0, limit: int = 100, exact: bool = False) -> Tuple[List[UserView], int]:
+        return await self.repository.list_users(skip, limit, exact)
+
+    def stream_users(
+        self, updated_since: Optional[datetime] = None, batch_size: int = 1000
+    ) -> AsyncIterator[List[tuple]]:
+        return self.repository.stream_users(updated_since, batch_size)
+
+    async def list_users_keyset(
+        self, limit: int = 100, after_id: Optional[int] = None, before_id: Optional[int] = None
+    ) -> List[UserView]:
+        return await self.repository.list_users_keyset(limit, after_id, before_id)
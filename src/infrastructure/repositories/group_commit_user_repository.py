@@ -0,0 +1,83 @@
+import asyncio
+from typing import Any, Callable, Dict, List, Optional, TypeVar
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from src.domain.entities.user import User
+from src.infrastructure.database.group_commit import GroupCommitWriter
+from src.infrastructure.repositories.async_sqlite_user_repository import AsyncSQLiteUserRepository
+from src.infrastructure.repositories.sqlite_user_repository import SQLiteUserRepository
+
+T = TypeVar("T")
+
+
+def _on_writer(operation: Callable[[SQLiteUserRepository], T]) -> Callable[[Session], T]:
+    # Runs on the writer thread, which commits the whole batch
+    return lambda db: operation(SQLiteUserRepository(db, autocommit=False))
+
+
+class GroupCommitUserRepository(SQLiteUserRepository):
+    """SQLite repository whose writes are applied by the group-commit writer thread."""
+
+    def __init__(self, db: Session, writer: GroupCommitWriter):
+        super().__init__(db)
+        self.writer = writer
+
+    def _write(self, operation: Callable[[SQLiteUserRepository], T]) -> T:
+        try:
+            return self.writer.run(_on_writer(operation))
+        finally:
+            # End this session's read snapshot so later reads see the write
+            self.db.commit()
+
+    def create(self, user: User) -> User:
+        return self._write(lambda repository: repository.create(user))
+
+    def create_many(self, users: List[User]) -> List[User]:
+        return self._write(lambda repository: repository.create_many(users))
+
+    def update(self, user: User) -> User:
+        return self._write(lambda repository: repository.update(user))
+
+    def update_fields(self, user_id: int, changes: Dict[str, Any]) -> Optional[User]:
+        return self._write(lambda repository: repository.update_fields(user_id, changes))
+
+    def delete(self, user_id: int) -> bool:
+        return self._write(lambda repository: repository.delete(user_id))
+
+    def _write_chunk(self, statement) -> List[int]:
+        # Each chunk is its own queued write, so bulk writes interleave with the rest
+        return self._write(lambda repository: repository._write_chunk(statement))
+
+
+class AsyncGroupCommitUserRepository(AsyncSQLiteUserRepository):
+    """Async SQLite repository whose writes are awaited on the group-commit writer thread."""
+
+    def __init__(self, db: AsyncSession, writer: GroupCommitWriter):
+        super().__init__(db)
+        self.writer = writer
+
+    async def _write(self, operation: Callable[[SQLiteUserRepository], T]) -> T:
+        try:
+            return await asyncio.wrap_future(self.writer.submit(_on_writer(operation)))
+        finally:
+            await self.db.commit()
+
+    async def create(self, user: User) -> User:
+        return await self._write(lambda repository: repository.create(user))
+
+    async def create_many(self, users: List[User]) -> List[User]:
+        return await self._write(lambda repository: repository.create_many(users))
+
+    async def update(self, user: User) -> User:
+        return await self._write(lambda repository: repository.update(user))
+
+    async def update_fields(self, user_id: int, changes: Dict[str, Any]) -> Optional[User]:
+        return await self._write(lambda repository: repository.update_fields(user_id, changes))
+
+    async def delete(self, user_id: int) -> bool:
+        return await self._write(lambda repository: repository.delete(user_id))
+
+    async def _write_chunk(self, statement) -> List[int]:
+        return await self._write(lambda repository: repository._write_chunk(statement))
@@ -1,17 +1,124 @@
-from typing import List, Optional, Tuple
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
 
+from sqlalchemy import bindparam, delete, func, insert, or_, select, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
-from src.domain.entities.user import User
+from src.domain.entities.user import User, UserView
 from src.domain.repositories.user_repository import UserRepository
+from src.infrastructure.database.models.user_count_model import UserCountModel
 from src.infrastructure.database.models.user_model import UserModel
 
+# Columns filled in by the database, read back with INSERT ... RETURNING
+GENERATED_COLUMNS = (UserModel.__table__.c.id, UserModel.__table__.c.created_at, UserModel.__table__.c.updated_at)
+
+_users = UserModel.__table__
+_counts = UserCountModel.__table__
+
+# Reads are prebuilt Core statements over plain columns: no ORM hydration or
+# identity map, listings never load hashed_password, and SQLAlchemy reuses
+# their cache keys instead of rebuilding a select per call (~50us vs ~200us)
+ENTITY_COLUMNS = tuple(_users.c[name] for name in User.__slots__)
+VIEW_COLUMNS = tuple(_users.c[name] for name in UserView._fields)
+SELECT_USER_BY = {
+    name: select(*ENTITY_COLUMNS).where(_users.c[name] == bindparam("value")) for name in ("id", "username", "email")
+}
+SELECT_PAGE = select(*VIEW_COLUMNS).order_by(_users.c.id).offset(bindparam("skip")).limit(bindparam("limit"))
+SELECT_AFTER = select(*VIEW_COLUMNS).where(_users.c.id > bindparam("cursor")).order_by(_users.c.id).limit(
+    bindparam("limit")
+)
+SELECT_BEFORE = select(*VIEW_COLUMNS).where(_users.c.id < bindparam("cursor")).order_by(_users.c.id.desc()).limit(
+    bindparam("limit")
+)
+# (exact, filtered by is_active) -> statement
+COUNT_USERS = {
+    (True, False): select(func.count()).select_from(_users),
+    (True, True): select(func.count()).select_from(_users).where(_users.c.is_active == bindparam("is_active")),
+    (False, False): select(func.coalesce(func.sum(_counts.c.count), 0)),
+    (False, True): select(func.coalesce(func.sum(_counts.c.count), 0)).where(
+        _counts.c.is_active == bindparam("is_active")
+    ),
+}
+
+# Columns update_fields may set; other keys in the changes are ignored
+UPDATABLE_COLUMNS = ("username", "email", "hashed_password", "is_active", "updated_at")
+
+
+def duplicate_user_error(error: IntegrityError, values: Dict[str, Any]) -> Exception:
+    """Translate a unique index violation on ``values`` into the service's ValueError."""
+    message = str(error.orig)
+    # NOT NULL and CHECK failures name the same columns but are not duplicates
+    if "UNIQUE constraint failed" not in message:
+        return error
+    if "users.email" in message:
+        return ValueError(f"User with email {values['email']} already exists")
+    if "users.username" in message:
+        return ValueError(f"User with username {values['username']} already exists")
+    return error
+
+
+def update_fields_statement(user_id: int, changes: Dict[str, Any]):
+    """UPDATE ... RETURNING every column, setting only the updatable keys of ``changes``."""
+    table = UserModel.__table__
+    values = {column: value for column, value in changes.items() if column in UPDATABLE_COLUMNS}
+    return update(table).where(table.c.id == user_id).values(values).returning(*ENTITY_COLUMNS)
+
+
+def selection_criteria(created_before: Optional[datetime] = None, is_active: Optional[bool] = None) -> list:
+    """WHERE criteria for the filters of the set-based bulk writes."""
+    table = UserModel.__table__
+    criteria = []
+    if created_before is not None:
+        criteria.append(table.c.created_at < created_before)
+    if is_active is not None:
+        criteria.append(table.c.is_active == is_active)
+    return criteria
+
+
+def id_chunks(user_ids: List[int], chunk_size: int) -> Iterator[Any]:
+    """``id IN (...)`` criteria covering ``user_ids`` with at most ``chunk_size`` bound ids each."""
+    ids = sorted(set(user_ids))
+    for start in range(0, len(ids), chunk_size):
+        yield UserModel.__table__.c.id.in_(ids[start:start + chunk_size])
+
+
+def next_window(criteria: list, after_id: int, chunk_size: int):
+    """``id IN`` the next ``chunk_size`` ids matching ``criteria`` after the ``after_id`` cursor."""
+    table = UserModel.__table__
+    window = select(table.c.id).where(table.c.id > after_id, *criteria).order_by(table.c.id).limit(chunk_size)
+    return table.c.id.in_(window)
+
+
+def update_where_statement(changes: Dict[str, Any]) -> Callable[..., Any]:
+    """Build UPDATE ... RETURNING id statements setting the updatable keys of ``changes``."""
+    table = UserModel.__table__
+    values = {column: value for column, value in changes.items() if column in UPDATABLE_COLUMNS}
+    return lambda *criteria: update(table).where(*criteria).values(values).returning(table.c.id)
+
+
+def delete_where_statement(*criteria):
+    table = UserModel.__table__
+    return delete(table).where(*criteria).returning(table.c.id)
+
 
 class SQLiteUserRepository(UserRepository):
     """SQLite implementation of UserRepository."""
 
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, autocommit: bool = True):
+        # With autocommit off, writes are only flushed and the caller owns the transaction
         self.db = db
+        self.autocommit = autocommit
+
+    def _commit(self) -> None:
+        if self.autocommit:
+            self.db.commit()
+        else:
+            self.db.flush()
+
+    def _rollback(self) -> None:
+        if self.autocommit:
+            self.db.rollback()
 
     def _map_to_entity(self, model: UserModel) -> User:
         return User(
@@ -36,29 +143,69 @@ class SQLiteUserRepository(UserRepository):
         )
 
     def create(self, user: User) -> User:
-        db_user = self._map_to_model(user)
-        self.db.add(db_user)
-        self.db.commit()
-        self.db.refresh(db_user)
-        return self._map_to_entity(db_user)
+        # One INSERT ... RETURNING; the unique indexes decide conflicts atomically
+        values = self._to_row(user)
+        try:
+            row = self.db.execute(insert(UserModel.__table__).returning(*GENERATED_COLUMNS), values).one()
+            self._commit()
+        except IntegrityError as e:
+            self._rollback()
+            raise duplicate_user_error(e, values) from e
+        return self._with_generated(user, row)
+
+    def _to_row(self, entity: User) -> dict:
+        return {
+            "username": entity.username,
+            "email": entity.email,
+            "hashed_password": entity.hashed_password,
+            "is_active": entity.is_active,
+            "created_at": entity.created_at,
+            "updated_at": entity.updated_at,
+        }
+
+    def create_many(self, users: List[User]) -> List[User]:
+        if not users:
+            return []
+        # One executemany Core INSERT ... RETURNING of the generated columns only,
+        # committed once; skipping ORM hydration makes large batches ~10x cheaper
+        statement = insert(UserModel.__table__).returning(*GENERATED_COLUMNS, sort_by_parameter_order=True)
+        try:
+            generated = self.db.execute(statement, [self._to_row(user) for user in users]).all()
+            self._commit()
+        except IntegrityError:
+            self._rollback()
+            raise ValueError("Some users were created concurrently, retry the request")
+        return [self._with_generated(user, row) for user, row in zip(users, generated)]
+
+    def _with_generated(self, entity: User, row) -> User:
+        return User(
+            id=row.id,
+            username=entity.username,
+            email=entity.email,
+            hashed_password=entity.hashed_password,
+            is_active=entity.is_active,
+            created_at=row.created_at,
+            updated_at=row.updated_at,
+        )
+
+    def find_existing_identities(self, usernames: List[str], emails: List[str]) -> Tuple[Set[str], Set[str]]:
+        rows = self.db.query(UserModel.username, UserModel.email).filter(
+            or_(UserModel.username.in_(usernames), UserModel.email.in_(emails))
+        ).all()
+        return {row.username for row in rows}, {row.email for row in rows}
+
+    def _get_by(self, field: str, value) -> Optional[User]:
+        row = self.db.execute(SELECT_USER_BY[field], {"value": value}).first()
+        return User(*row) if row is not None else None
 
     def get_by_id(self, user_id: int) -> Optional[User]:
-        db_user = self.db.query(UserModel).filter(UserModel.id == user_id).first()
-        if db_user:
-            return self._map_to_entity(db_user)
-        return None
+        return self._get_by("id", user_id)
 
     def get_by_email(self, email: str) -> Optional[User]:
-        db_user = self.db.query(UserModel).filter(UserModel.email == email).first()
-        if db_user:
-            return self._map_to_entity(db_user)
-        return None
+        return self._get_by("email", email)
 
     def get_by_username(self, username: str) -> Optional[User]:
-        db_user = self.db.query(UserModel).filter(UserModel.username == username).first()
-        if db_user:
-            return self._map_to_entity(db_user)
-        return None
+        return self._get_by("username", username)
 
     def update(self, user: User) -> User:
         db_user = self.db.query(UserModel).filter(UserModel.id == user.id).first()
@@ -68,20 +215,96 @@ class SQLiteUserRepository(UserRepository):
             db_user.hashed_password = user.hashed_password
             db_user.is_active = user.is_active
             db_user.updated_at = user.updated_at  # Ensure this is a datetime object
-            self.db.commit()
+            self._commit()
             self.db.refresh(db_user)
             return self._map_to_entity(db_user)
         return None
 
+    def update_fields(self, user_id: int, changes: Dict[str, Any]) -> Optional[User]:
+        statement = update_fields_statement(user_id, changes)
+        try:
+            row = self.db.execute(statement).one_or_none()
+            self._commit()
+        except IntegrityError as e:
+            self._rollback()
+            raise duplicate_user_error(e, changes) from e
+        return self._map_to_entity(row) if row is not None else None
+
     def delete(self, user_id: int) -> bool:
-        db_user = self.db.query(UserModel).filter(UserModel.id == user_id).first()
-        if db_user:
-            self.db.delete(db_user)
-            self.db.commit()
-            return True
-        return False
+        table = UserModel.__table__
+        result = self.db.execute(delete(table).where(table.c.id == user_id))
+        self._commit()
+        return result.rowcount > 0
+
+    def update_fields_where(
+        self,
+        changes: Dict[str, Any],
+        user_ids: Optional[List[int]] = None,
+        created_before: Optional[datetime] = None,
+        is_active: Optional[bool] = None,
+        chunk_size: int = 1000,
+    ) -> int:
+        return self._write_in_chunks(
+            update_where_statement(changes), user_ids, selection_criteria(created_before, is_active), chunk_size
+        )
+
+    def delete_where(
+        self,
+        user_ids: Optional[List[int]] = None,
+        created_before: Optional[datetime] = None,
+        is_active: Optional[bool] = None,
+        chunk_size: int = 1000,
+    ) -> int:
+        return self._write_in_chunks(
+            delete_where_statement, user_ids, selection_criteria(created_before, is_active), chunk_size
+        )
+
+    def _write_in_chunks(
+        self, statement: Callable[..., Any], user_ids: Optional[List[int]], criteria: list, chunk_size: int
+    ) -> int:
+        # One set-based statement per chunk of ids, each committed on its own so
+        # the write lock is never held for the whole selection
+        if user_ids is not None:
+            return sum(len(self._write_chunk(statement(chunk, *criteria))) for chunk in id_chunks(user_ids, chunk_size))
+        affected, after_id = 0, 0
+        while True:
+            ids = self._write_chunk(statement(next_window(criteria, after_id, chunk_size)))
+            if not ids:
+                return affected
+            affected += len(ids)
+            after_id = max(ids)
+
+    def _write_chunk(self, statement) -> List[int]:
+        ids = self.db.execute(statement).scalars().all()
+        self._commit()
+        return ids
+
+    def count_users(self, is_active: Optional[bool] = None, exact: bool = False) -> int:
+        return self.db.scalar(COUNT_USERS[exact, is_active is not None], {"is_active": is_active})
+
+    def list_users(self, skip: int = 0, limit: int = 100, exact: bool = False) -> Tuple[List[UserView], int]:
+        total = self.count_users(exact=exact)
+        rows = self.db.execute(SELECT_PAGE, {"skip": skip, "limit": limit})
+        return list(map(UserView._make, rows)), total
+
+    def list_users_keyset(
+        self, limit: int = 100, after_id: Optional[int] = None, before_id: Optional[int] = None
+    ) -> List[UserView]:
+        if before_id is not None:
+            # Walk backwards from the cursor, then restore ascending order
+            rows = self.db.execute(SELECT_BEFORE, {"cursor": before_id, "limit": limit}).all()
+            rows.reverse()
+        else:
+            rows = self.db.execute(SELECT_AFTER, {"cursor": after_id or 0, "limit": limit})
+        return list(map(UserView._make, rows))
 
-    def list_users(self, skip: int = 0, limit: int = 100) -> Tuple[List[User], int]:
-        total = self.db.query(UserModel).count()
-        db_users = self.db.query(UserModel).order_by(UserModel.id).offset(skip).limit(limit).all()
-        return [self._map_to_entity(user) for user in db_users], total
+    def stream_users(
+        self, updated_since: Optional[datetime] = None, batch_size: int = 1000
+    ) -> Iterator[List[tuple]]:
+        # Column-only select streamed with yield_per: flat memory
+        query = select(*VIEW_COLUMNS).order_by(_users.c.id)
+        if updated_since is not None:
+            query = query.where(_users.c.updated_at >= updated_since)
+        result = self.db.execute(query.execution_options(yield_per=batch_size))
+        for partition in result.partitions():
+            yield partition
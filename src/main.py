@@ -1,49 +1,127 @@
-from fastapi import FastAPI
+import time
+
+# Taken before anything else is imported, so the startup report covers
+# FastAPI, SQLAlchemy, pydantic and the app's own modules
+_import_started = time.perf_counter()
+
+import logging
+from contextlib import asynccontextmanager
+from typing import Optional
+
+from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 
-from src.infrastructure.api.routes import auth_routes, user_routes, health_routes
+from src.infrastructure.api.routes import auth_routes, user_routes, health_routes, metrics_routes
+from src.domain.services.hashing_admission import HashingOverloadedError
+from src.infrastructure.api.container import Container
+from src.infrastructure.api.metrics import AppMetrics, MetricsMiddleware
 from src.infrastructure.api.middlewares import RateLimitMiddleware
-from src.infrastructure.database.database import create_tables
+from src.infrastructure.api.startup import StartupReport, warm_up
+from src.infrastructure.database.sqlite_tuning import describe_engine
 from src.settings import Settings
 
-# Create database tables
-create_tables()
-
-settings = Settings()
-app = FastAPI(
-    title=settings.app_name,
-    description="User Management API with FastAPI, SQLite and Hexagonal Architecture",
-    version="0.1.0",
-)
-
-# Setup CORS
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-# Add rate limiting
-app.add_middleware(
-    RateLimitMiddleware,
-    requests_limit=30,  # 30 requests
-    window_size=60  # per minute
-)
-
-# Include routers
-app.include_router(auth_routes.router)
-app.include_router(user_routes.router)
-app.include_router(health_routes.router)
-
-
-@app.get("/", tags=["health"])
+IMPORT_SECONDS = time.perf_counter() - _import_started
+
+logger = logging.getLogger(__name__)
+
+
+async def hashing_overloaded_handler(request: Request, exc: HashingOverloadedError):
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+
 async def health_check():
     """Health check endpoint."""
     return {"status": "ok", "message": "User Management API is running"}
 
 
+def create_app(settings: Optional[Settings] = None) -> FastAPI:
+    """
+    Build the application.
+
+    Nothing touches the database here: the lifespan builds the container,
+    checks the schema and, with ``warm_up`` set, pays the first-request
+    costs before the server starts accepting connections.
+    """
+    settings = settings or Settings()
+    report = StartupReport()
+    report.record("import", IMPORT_SECONDS)
+    started = time.perf_counter()
+    # Outlives the container, so counters survive a lifespan restart
+    metrics = AppMetrics()
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        with report.phase("container"):
+            container = Container(settings, metrics=metrics)
+        with report.phase("schema check"):
+            # Creates missing tables only; migrations are applied by alembic
+            container.database.create_tables()
+            logger.info(f"SQLite writer profile: {describe_engine(container.database.engine)}")
+            if container.database.read_engine is not container.database.engine:
+                logger.info(f"SQLite reader profile: {describe_engine(container.database.read_engine)}")
+        app.state.container = container
+        try:
+            if settings.warm_up:
+                await warm_up(app, container, report)
+            logger.info(f"Startup: {report.summary()}")
+            yield
+        finally:
+            await container.close()
+
+    app = FastAPI(
+        title=settings.app_name,
+        description="User Management API with FastAPI, SQLite and Hexagonal Architecture",
+        version="0.1.0",
+        lifespan=lifespan,
+    )
+    app.state.startup_report = report
+
+    # Setup CORS
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+
+    # Add rate limiting
+    app.add_middleware(
+        RateLimitMiddleware,
+        algorithm=settings.rate_limit_algorithm,
+        max_keys=settings.rate_limit_max_keys,
+        storage=settings.rate_limit_storage,
+        storage_path=settings.rate_limit_sqlite_path,
+        groups=settings.rate_limit_groups,
+        routes=settings.rate_limit_routes,
+        identify=lambda token: app.state.container.token_cache.user_id(token),
+        on_rejected=metrics.rate_limited,
+    )
+
+    # Outermost, so request timings include rate limiting and 429s are counted
+    app.add_middleware(MetricsMiddleware, metrics=metrics)
+
+    # Include routers
+    app.include_router(auth_routes.router)
+    app.include_router(user_routes.router)
+    app.include_router(health_routes.router)
+    app.include_router(metrics_routes.router)
+    app.add_exception_handler(HashingOverloadedError, hashing_overloaded_handler)
+    app.add_api_route("/", health_check, methods=["GET"], tags=["health"])
+
+    report.record("create app", time.perf_counter() - started)
+    return app
+
+
+# For `uvicorn src.main:app`; `uvicorn --factory src.main:create_app` builds it on demand instead
+app = create_app()
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
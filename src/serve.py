@@ -0,0 +1,196 @@
+"""
+Run the API in production: pre-forked uvicorn workers sharing one socket.
+
+    python -m src.serve
+
+The parent imports and builds the app once, binds the listening socket and
+then forks the workers, which share the loaded modules copy-on-write and
+accept from the same socket. The app's lifespan runs in each worker, so
+engines, hashing pools and caches are never inherited across a fork.
+Options come from Settings (SERVER_WORKERS, SERVER_BACKLOG, ...).
+"""
+import logging
+import os
+import signal
+import socket
+import sys
+import time
+from typing import Dict
+
+import uvicorn
+from fastapi import FastAPI
+
+from src.settings import Settings
+
+logger = logging.getLogger("uvicorn.error")
+
+# Extra seconds a worker gets after the graceful timeout to run the lifespan shutdown
+SHUTDOWN_MARGIN = 10
+
+
+def server_config(app: FastAPI, settings: Settings) -> uvicorn.Config:
+    return uvicorn.Config(
+        app,
+        host=settings.server_host,
+        port=settings.server_port,
+        loop=settings.server_loop,
+        http=settings.server_http,
+        backlog=settings.server_backlog,
+        timeout_keep_alive=settings.server_keep_alive,
+        limit_concurrency=settings.server_limit_concurrency or None,
+        timeout_graceful_shutdown=settings.server_graceful_timeout,
+        access_log=settings.server_access_log,
+        lifespan="on",
+    )
+
+
+def worker_settings(settings: Settings, workers: int) -> Settings:
+    """
+    Settings for each of ``workers`` workers, with per-process defaults shared out.
+
+    Left at their defaults, every worker would start one hashing process per
+    core and keep its own in-memory rate limits, multiplying both by the
+    number of workers. Values set explicitly are kept.
+    """
+    if workers <= 1:
+        return settings
+    updates = {}
+    if "hashing_workers" not in settings.model_fields_set and not settings.hashing_workers:
+        updates["hashing_workers"] = max(1, (os.cpu_count() or 1) // workers)
+    if "rate_limit_storage" not in settings.model_fields_set:
+        updates["rate_limit_storage"] = "sqlite"
+    elif settings.rate_limit_storage == "memory":
+        logger.warning(
+            f"RATE_LIMIT_STORAGE=memory keeps a separate budget in each of the {workers} workers, "
+            f"so every rate limit is effectively {workers} times higher"
+        )
+    return settings.model_copy(update=updates)
+
+
+def bind_socket(host: str, port: int, backlog: int) -> socket.socket:
+    """Bind the listening socket that every worker accepts from."""
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    # An explicit IPPROTO_TCP matters: asyncio only sets TCP_NODELAY on accepted
+    # sockets whose proto says TCP, and without it small responses stall ~40 ms
+    # on delayed ACKs (uvicorn's Config.bind_socket leaves proto at 0)
+    sock = socket.socket(family, socket.SOCK_STREAM, socket.IPPROTO_TCP)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+def run_worker(config: uvicorn.Config, sock: socket.socket) -> None:
+    # The parent's handlers supervise workers; uvicorn installs its own for shutdown
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(sig, signal.SIG_DFL)
+    uvicorn.Server(config).run(sockets=[sock])
+
+
+class Supervisor:
+    """Forks the workers, replaces any that die and stops them all on SIGINT/SIGTERM."""
+
+    def __init__(self, config: uvicorn.Config, sock: socket.socket, workers: int, graceful_timeout: int):
+        self.config = config
+        self.sock = sock
+        self.workers = workers
+        self.graceful_timeout = graceful_timeout
+        self.children: Dict[int, float] = {}  # pid -> start time
+        self.stopping = False
+
+    def spawn(self) -> None:
+        pid = os.fork()
+        if pid == 0:
+            status = 1
+            try:
+                run_worker(self.config, self.sock)
+                status = 0
+            except SystemExit as exc:
+                status = exc.code if isinstance(exc.code, int) else 1
+            except BaseException:
+                logger.exception("Worker crashed")
+            finally:
+                # Never return into the parent's supervision loop
+                sys.stdout.flush()
+                sys.stderr.flush()
+                os._exit(status)
+        self.children[pid] = time.monotonic()
+        logger.info(f"Started worker {pid}")
+
+    def stop(self, sig: int, frame) -> None:
+        if not self.stopping:
+            logger.info(f"Stopping {len(self.children)} workers")
+        self.stopping = True
+        for pid in self.children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    def reap(self) -> None:
+        while self.children:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                self.children.clear()
+                return
+            if pid == 0:
+                return
+            started = self.children.pop(pid, None)
+            if started is None or self.stopping:
+                continue
+            logger.warning(f"Worker {pid} exited with status {os.waitstatus_to_exitcode(status)}")
+            # Back off when workers die right after starting, e.g. on a startup error
+            if time.monotonic() - started < 1:
+                time.sleep(1)
+            self.spawn()
+
+    def run(self) -> int:
+        signal.signal(signal.SIGINT, self.stop)
+        signal.signal(signal.SIGTERM, self.stop)
+        for _ in range(self.workers):
+            self.spawn()
+
+        while not self.stopping:
+            self.reap()
+            time.sleep(0.5)
+
+        deadline = time.monotonic() + self.graceful_timeout + SHUTDOWN_MARGIN
+        while self.children and time.monotonic() < deadline:
+            self.reap()
+            time.sleep(0.1)
+        for pid in self.children:
+            logger.warning(f"Killing worker {pid}, still running after {self.graceful_timeout + SHUTDOWN_MARGIN}s")
+            try:
+                os.kill(pid, signal.SIGKILL)
+            except ProcessLookupError:
+                # Exited after the last reap
+                pass
+        return 0
+
+
+def main() -> int:
+    settings = Settings()
+    workers = settings.server_workers or os.cpu_count() or 1
+    settings = worker_settings(settings, workers)
+    # Preloaded here so every worker starts from the imported, built app
+    from src.main import create_app
+
+    config = server_config(create_app(settings), settings)
+    config.load()
+    sock = bind_socket(settings.server_host, settings.server_port, settings.server_backlog)
+    logger.info(
+        f"Serving on {settings.server_host}:{settings.server_port} with {workers} workers "
+        f"(loop={settings.server_loop}, http={settings.server_http}, backlog={settings.server_backlog}, "
+        f"hashing workers each={settings.hashing_workers or os.cpu_count() or 1}, "
+        f"rate limits={settings.rate_limit_storage})"
+    )
+    try:
+        return Supervisor(config, sock, workers, settings.server_graceful_timeout).run()
+    finally:
+        sock.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
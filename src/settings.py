@@ -1,12 +1,78 @@
+from typing import Dict, Literal, Tuple
+
 from pydantic_settings import BaseSettings
 
 
 class Settings(BaseSettings):
     """Application settings."""
     app_name: str = "User Management API"
+    database_url: str = "sqlite:///./data/user_management.db"
     secret_key: str = "YOUR_SECRET_KEY_HERE"  # In production, set this securely
     algorithm: str = "HS256"
     access_token_expire_minutes: int = 30
+    warm_up: bool = False  # Prime pools, serializers, the OpenAPI schema and hashing workers before serving
+    async_database: bool = False  # Serve requests through the aiosqlite-backed async data path
+    hashing_workers: int = 0  # Password hashing processes; 0 means one per CPU core, shared out across server workers
+    hashing_max_concurrent: int = 0  # Hash operations admitted at once; 0 means match the pool size
+    hashing_queue_size: int = 32  # Requests allowed to wait for a hashing slot
+    hashing_queue_timeout: float = 2.0  # Seconds a request may wait before being shed
+    hashing_retry_after: int = 1  # Retry-After seconds sent with 503 responses
+    rate_limit_algorithm: str = "sliding_window"  # "sliding_window" or "token_bucket"
+    rate_limit_max_keys: int = 100_000  # Clients tracked before the least recently seen is evicted
+    rate_limit_storage: str = "memory"  # "memory" (per process) or "sqlite" (shared by all workers); src.serve defaults to sqlite with several workers
+    rate_limit_sqlite_path: str = "./data/rate_limits.db"
+    bulk_create_max_items: int = 500  # Upper bound on users per POST /users/bulk request
+    bulk_action_max_ids: int = 100_000  # Upper bound on ids per bulk deactivate/delete request
+    bulk_action_chunk_size: int = 1000  # Users changed per statement and commit by bulk deactivate/delete
+    export_batch_size: int = 1000  # Rows fetched and encoded per chunk by GET /users/export
+    import_chunk_size: int = 1000  # Rows validated and committed per transaction by user imports
+    import_max_plain_passwords: int = 500  # Plain passwords hashed per POST /users/import request; other rows must be pre-hashed
+    token_cache_size: int = 10_000  # Verified access tokens cached per process until they expire; 0 disables
+    user_cache_size: int = 10_000  # Users cached per process by id/username/email; 0 disables the cache
+    user_cache_ttl: float = 30.0  # Seconds a cached user is served; bounds staleness across workers
+    # SQLite PRAGMAs applied to every pooled connection
+    sqlite_journal_mode: Literal["WAL", "DELETE", "TRUNCATE", "PERSIST", "MEMORY", "OFF"] = "WAL"  # WAL lets readers run alongside the writer
+    sqlite_synchronous: Literal["OFF", "NORMAL", "FULL", "EXTRA"] = "NORMAL"  # NORMAL is durable across app crashes under WAL
+    sqlite_mmap_size: int = 268_435_456  # Bytes of the database file read through mmap; 0 disables
+    sqlite_cache_size: int = -65_536  # Page cache per connection; negative values are KiB
+    sqlite_busy_timeout: int = 5000  # Milliseconds to wait on a locked database before failing
+    sqlite_temp_store: Literal["DEFAULT", "FILE", "MEMORY"] = "MEMORY"  # Where temp tables and sort spills live
+    write_group_commit: bool = True  # Apply user writes on one thread, committing them in batches (file databases only)
+    write_batch_max_size: int = 256  # Writes committed together at most
+    write_batch_max_delay: float = 0.0  # Seconds to wait for more writes; 0 batches whatever queued during the last commit
+    # Connection pools (file databases only); writes always go through a single connection
+    db_pool_size: int = 0  # Read-only connections kept open; 0 means one per CPU core
+    db_max_overflow: int = 10  # Extra read connections opened under load and closed when returned
+    db_pool_recycle: int = -1  # Seconds before a connection is replaced; -1 keeps it forever
+    db_pool_timeout: float = 30.0  # Seconds to wait for a free connection
+    # Server launched by `python -m src.serve`
+    server_host: str = "0.0.0.0"
+    server_port: int = 8000
+    server_workers: int = 0  # Worker processes forked after the app is loaded; 0 means one per CPU core
+    server_backlog: int = 2048  # Connections the kernel queues before accept()
+    server_keep_alive: int = 5  # Seconds an idle keep-alive connection stays open
+    server_loop: Literal["auto", "asyncio", "uvloop"] = "auto"  # "auto" uses uvloop when it is installed
+    server_http: Literal["auto", "h11", "httptools"] = "auto"  # "auto" uses httptools when it is installed
+    server_limit_concurrency: int = 0  # Connections and tasks per worker before 503s; 0 means no limit
+    server_graceful_timeout: int = 30  # Seconds in-flight requests get to finish on shutdown
+    server_access_log: bool = True  # One log line per request; costs throughput
+    # Endpoint groups with separate budgets: name -> (requests, window seconds)
+    rate_limit_groups: Dict[str, Tuple[int, int]] = {
+        "default": (30, 60),
+        "hashing": (30, 60),
+        "bulk": (1000, 600),  # Passwords hashed by bulk creates and imports, per caller
+        "health": (120, 60),
+    }
+    # "[METHOD ]/path-prefix" -> (group, cost per request, or per item on bulk creates and imports); unmatched paths cost 1 in "default"
+    rate_limit_routes: Dict[str, Tuple[str, int]] = {
+        "/auth/login": ("hashing", 5),
+        "POST /users/": ("hashing", 5),
+        "POST /users/bulk": ("bulk", 1),
+        "POST /users/import": ("bulk", 1),
+        "POST /users/bulk-": ("default", 5),
+        "/health": ("health", 1),
+        "/metrics": ("health", 1),
+    }
     
     class Config:
         env_file = ".env"
@@ -9,6 +9,7 @@ from sqlalchemy.pool import StaticPool
 
 from src.infrastructure.database.database import Base
 from src.infrastructure.database.models.user_model import UserModel
+from src.domain.entities.user import User
 from src.domain.services.user_service import UserService
 from src.domain.services.auth_service import AuthService
 from src.infrastructure.repositories.sqlite_user_repository import SQLiteUserRepository
@@ -16,6 +17,7 @@ from src.application.use_cases.user_use_case import UserUseCase
 from src.application.use_cases.auth_use_case import AuthUseCase
 from src.infrastructure.api.dependencies import get_db, get_user_repository
 from src.infrastructure.api.dependencies import get_auth_use_case, get_user_use_case
+from src.main import create_app
 from src.settings import Settings
 
 # Create a completely separate in-memory database for testing
@@ -27,10 +29,31 @@ test_engine = create_engine(
     poolclass=StaticPool
 )
 
+
+# pysqlite issues its own BEGIN lazily and breaks SAVEPOINT; let SQLAlchemy
+# emit BEGIN itself so savepoints nest inside the per-test transaction
+@event.listens_for(test_engine, "connect")
+def _disable_pysqlite_transactions(dbapi_connection, connection_record):
+    dbapi_connection.isolation_level = None
+
+
+@event.listens_for(test_engine, "begin")
+def _emit_begin(connection):
+    connection.exec_driver_sql("BEGIN")
+
+
 # Create tables in the test database
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=test_engine)
 Base.metadata.create_all(bind=test_engine)
 
+# Built once per test run; its own database is in memory too, so tests never touch ./data.
+# Its limiter state is shared by every test, so the hashing budget is large enough
+# not to run out mid-run; the limiter itself is covered by test_rate_limiter
+app = create_app(Settings(
+    database_url=SQLALCHEMY_TEST_DATABASE_URL,
+    rate_limit_groups={**Settings().rate_limit_groups, "hashing": (10_000, 60)},
+))
+
 @pytest.fixture(scope="function")
 def db():
     """
@@ -40,8 +63,9 @@ def db():
     # Begin a non-ORM transaction
     transaction = connection.begin()
     
-    # Create a session bound to the connection
-    session = TestingSessionLocal(bind=connection)
+    # Create a session bound to the connection; repository rollbacks only
+    # roll back to a savepoint, so the test transaction stays in charge
+    session = TestingSessionLocal(bind=connection, join_transaction_mode="create_savepoint")
     
     yield session
     
@@ -55,8 +79,6 @@ def client(db) -> Generator:
     """
     Create a new FastAPI TestClient that uses the `db` fixture.
     """
-    from src.main import app
-    
     # Create test dependencies
     def override_get_db():
         yield db
@@ -98,3 +120,18 @@ def client(db) -> Generator:
         
     # Clear all overrides after test
     app.dependency_overrides = {}
+
+
+@pytest.fixture(scope="function")
+def auth_headers(db):
+    """
+    Bearer headers for a user created directly in the database, without
+    going through the (rate limited) login endpoint.
+    """
+    settings = Settings()
+    user = SQLiteUserRepository(db).create(
+        User(username="caller", email="caller@example.com", hashed_password="hashed_pw")
+    )
+    auth_service = AuthService(secret_key=settings.secret_key, algorithm=settings.algorithm)
+    token = auth_service.create_access_token(data={"sub": str(user.id)})
+    return {"Authorization": f"Bearer {token}"}
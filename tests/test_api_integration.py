@@ -1,12 +1,31 @@
+import asyncio
+import json
+
 import pytest
 from fastapi.testclient import TestClient
 
+from src.domain.entities.user import User
+from src.infrastructure.api.container import Container
+from src.infrastructure.api.dependencies import (
+    get_auth_service,
+    get_auth_use_case,
+    get_user_repository,
+    get_user_use_case,
+)
+from src.infrastructure.repositories.sqlite_user_repository import SQLiteUserRepository
+from src.settings import Settings
+
 
 def test_health_check(client):
     response = client.get("/")
     assert response.status_code == 200
     assert response.json()["status"] == "ok"
 
+def test_readiness_check_queries_the_database(client):
+    response = client.get("/health/readiness")
+    assert response.status_code == 200
+    assert response.json()["database"] == "ok"
+
 def test_create_user_and_login(client):
     """Test creating a user and then logging in using the test client fixture."""
     # Create a user
@@ -60,3 +79,200 @@ def test_rate_limiting(client):
     
     # Verify we did hit the rate limit
     assert hit_limit, "Rate limiting didn't trigger"
+
+
+def test_list_users_with_cursor_pagination(client, db):
+    """Walk the user list forwards and backwards with opaque cursors."""
+    repository = SQLiteUserRepository(db)
+    for i in range(5):
+        repository.create(User(username=f"cursor{i}", email=f"cursor{i}@example.com", hashed_password="hashed_pw"))
+
+    client.post("/users/", json={"username": "reader", "email": "reader@example.com", "password": "password123"})
+    response = client.post("/auth/login/json", json={"username": "reader", "password": "password123"})
+    headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    first = client.get("/users/", params={"cursor": "", "size": 4}, headers=headers).json()
+    assert [user["username"] for user in first["items"]] == ["cursor0", "cursor1", "cursor2", "cursor3"]
+    assert first["prev_cursor"] is None
+
+    second = client.get("/users/", params={"cursor": first["next_cursor"], "size": 4}, headers=headers).json()
+    assert [user["username"] for user in second["items"]] == ["cursor4", "reader"]
+    assert second["next_cursor"] is None
+
+    back = client.get("/users/", params={"cursor": second["prev_cursor"], "size": 4}, headers=headers).json()
+    assert back["items"] == first["items"]
+
+    response = client.get("/users/", params={"cursor": "not-a-cursor"}, headers=headers)
+    assert response.status_code == 400
+
+    # Page-number mode is unchanged
+    page = client.get("/users/", params={"page": 2, "size": 4}, headers=headers).json()
+    assert page["total"] == 6
+    assert page["pages"] == 2
+
+
+def test_bulk_create_users(client, auth_headers):
+    """Bulk creation reports per-item results and inserts the valid items."""
+    payload = {
+        "items": [
+            {"username": "bulk0", "email": "bulk0@example.com", "password": "password123"},
+            {"username": "caller", "email": "other@example.com", "password": "password123"},
+            {"username": "bulk1", "email": "bulk1@example.com", "password": "password123"},
+            {"username": "bulk2", "email": "bulk0@example.com", "password": "password123"},
+        ]
+    }
+    response = client.post("/users/bulk", json=payload, headers=auth_headers)
+    assert response.status_code == 200
+    body = response.json()
+    assert body["created"] == 2
+    assert body["failed"] == 2
+    assert [item["index"] for item in body["results"]] == [0, 1, 2, 3]
+    assert body["results"][0]["user"]["username"] == "bulk0"
+    assert body["results"][1]["error"] == "User with username caller already exists"
+    assert body["results"][3]["error"] == "Duplicate email bulk0@example.com in request"
+
+    response = client.get("/users/", headers=auth_headers)
+    assert response.json()["total"] == 3
+
+
+def test_bulk_deactivate_and_delete_users(client, db, auth_headers):
+    """Bulk deactivate/delete select users by ids and filters and report counts."""
+    repository = SQLiteUserRepository(db)
+    users = [
+        repository.create(User(username=f"bulk{i}", email=f"bulk{i}@example.com", hashed_password="hashed_pw"))
+        for i in range(4)
+    ]
+
+    response = client.post("/users/bulk-deactivate", json={}, headers=auth_headers)
+    assert response.status_code == 422
+
+    ids = [user.id for user in users[:3]]
+    response = client.post("/users/bulk-deactivate", json={"ids": ids}, headers=auth_headers)
+    assert response.status_code == 200
+    assert response.json() == {"affected": 3}
+    assert client.get(f"/users/{ids[0]}", headers=auth_headers).json()["is_active"] is False
+
+    payload = {"created_before": "2999-01-01T00:00:00Z", "is_active": False}
+    response = client.post("/users/bulk-delete", json=payload, headers=auth_headers)
+    assert response.json() == {"affected": 3}
+    assert client.get("/users/", headers=auth_headers).json()["total"] == 2
+
+
+def test_export_users_streams_ndjson_and_csv(client, db, auth_headers):
+    """The export endpoint streams every user and honours updated_since."""
+    repository = SQLiteUserRepository(db)
+    for i in range(3):
+        repository.create(User(username=f"export{i}", email=f"export{i}@example.com", hashed_password="hashed_pw"))
+
+    response = client.get("/users/export", headers=auth_headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["username"] for row in rows] == ["caller", "export0", "export1", "export2"]
+    assert "hashed_password" not in rows[0]
+
+    response = client.get("/users/export", params={"format": "csv"}, headers=auth_headers)
+    lines = response.text.splitlines()
+    assert lines[0] == "id,username,email,is_active,created_at,updated_at"
+    assert len(lines) == 5
+
+    response = client.get("/users/export", params={"updated_since": "2999-01-01T00:00:00Z"}, headers=auth_headers)
+    assert response.text == ""
+
+
+def test_import_users_streams_progress_and_rejections(client, db, auth_headers):
+    """The import endpoint creates valid rows and reports the rejected ones."""
+    SQLiteUserRepository(db).create(User(username="taken", email="taken@example.com", hashed_password="hashed_pw"))
+    lines = [
+        json.dumps({"username": "imported1", "email": "imported1@example.com", "password": "password123"}),
+        json.dumps({"username": "taken", "email": "other@example.com", "password": "password123"}),
+        "not json",
+        json.dumps({"username": "imported2", "email": "imported2@example.com", "hashed_password": "plain"}),
+    ]
+
+    response = client.post(
+        "/users/import",
+        files={"file": ("users.ndjson", "\n".join(lines).encode())},
+        headers=auth_headers,
+    )
+
+    assert response.status_code == 200
+    events = [json.loads(line) for line in response.text.splitlines()]
+    rejected = {event["line"]: event for event in events if event["type"] == "rejected"}
+    assert sorted(rejected) == [2, 3, 4]
+    assert "password" not in rejected[2]["row"]
+    assert events[-1] == {"type": "summary", "processed": 4, "imported": 1, "rejected": 3}
+    assert SQLiteUserRepository(db).get_by_username("imported1") is not None
+
+
+def test_update_user_rejects_null_fields(client, auth_headers):
+    """Explicit nulls are validation errors rather than duplicate or server errors."""
+    response = client.put("/users/1", json={"username": None}, headers=auth_headers)
+    assert response.status_code == 422
+    assert "username cannot be null" in response.text
+
+
+def test_import_users_reports_unreadable_files_and_finishes(client, auth_headers):
+    """A file that is not UTF-8 (or not valid CSV) ends the stream with a rejection and a summary."""
+    response = client.post(
+        "/users/import",
+        files={"file": ("users.ndjson", b'\xff\xfe{"a":1}\n')},
+        headers=auth_headers,
+    )
+
+    assert response.status_code == 200
+    events = [json.loads(line) for line in response.text.splitlines()]
+    assert events[0]["type"] == "rejected"
+    assert events[0]["error"].startswith("File is not valid UTF-8")
+    assert events[-1] == {"type": "summary", "processed": 1, "imported": 0, "rejected": 1}
+
+    response = client.post(
+        "/users/import",
+        files={"file": ("users.csv", b"username,email\n" + b"a" * 200_000 + b",a@example.com\n")},
+        headers=auth_headers,
+    )
+    events = [json.loads(line) for line in response.text.splitlines()]
+    assert events[0]["error"].startswith("File is not valid CSV")
+    assert events[-1]["type"] == "summary"
+
+
+def test_dependencies_share_app_scoped_services():
+    container = Container(Settings(database_url="sqlite:///:memory:", write_group_commit=False))
+
+    async def resolve():
+        db = container.database.session_factory()
+        try:
+            repository = await get_user_repository(db, container)
+            auth_service = await get_auth_service(container)
+            return [await get_user_use_case(repository, auth_service) for _ in range(2)]
+        finally:
+            db.close()
+            await container.close()
+
+    first, second = asyncio.run(resolve())
+    assert first is not second
+    assert first.auth_service is second.auth_service is container.auth_service
+
+
+def test_startup_report_lists_phases(client):
+    response = client.get("/health/startup")
+    assert response.status_code == 200
+    phases = response.json()["phases_ms"]
+    assert list(phases)[:4] == ["import", "create app", "container", "schema check"]
+    assert response.json()["total_ms"] >= sum(phases.values()) - 1
+
+
+def test_login_reads_credentials_past_the_user_cache():
+    container = Container(Settings(database_url="sqlite:///:memory:", write_group_commit=False))
+
+    async def resolve():
+        db = container.database.session_factory()
+        try:
+            auth_service = await get_auth_service(container)
+            return await get_auth_use_case(db, container, auth_service)
+        finally:
+            db.close()
+            await container.close()
+
+    use_case = asyncio.run(resolve())
+    assert isinstance(use_case.user_repository, SQLiteUserRepository)
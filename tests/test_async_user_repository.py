@@ -0,0 +1,78 @@
+import asyncio
+
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from src.domain.entities.user import User
+from src.domain.services.user_service import AsyncUserService
+from src.infrastructure.database.database import Base
+from src.infrastructure.repositories.async_sqlite_user_repository import AsyncSQLiteUserRepository
+
+
+def run_with_service(scenario):
+    """Run an async scenario against a fresh in-memory aiosqlite database."""
+    async def runner():
+        engine = create_async_engine(
+            "sqlite+aiosqlite:///:memory:",
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        session_local = async_sessionmaker(engine, expire_on_commit=False)
+        try:
+            async with session_local() as session:
+                await scenario(AsyncUserService(AsyncSQLiteUserRepository(session)))
+        finally:
+            await engine.dispose()
+
+    asyncio.run(runner())
+
+
+def test_async_create_and_get_user():
+    async def scenario(service):
+        created = await service.create_user(
+            User(username="async", email="async@example.com", hashed_password="hashed_pw")
+        )
+        assert created.id is not None
+
+        found = await service.get_user(created.id)
+        assert found.username == "async"
+        assert await service.get_user(999) is None
+
+        with pytest.raises(ValueError, match="User with email async@example.com already exists"):
+            await service.create_user(
+                User(username="other", email="async@example.com", hashed_password="hashed_pw")
+            )
+        with pytest.raises(ValueError, match="User with username async already exists"):
+            await service.create_user(
+                User(username="async", email="other@example.com", hashed_password="hashed_pw")
+            )
+
+    run_with_service(scenario)
+
+
+def test_async_update_delete_and_list_users():
+    async def scenario(service):
+        for i in range(15):
+            await service.create_user(
+                User(username=f"test{i}", email=f"test{i}@example.com", hashed_password="hashed_pw")
+            )
+
+        users, total = await service.list_users(skip=10, limit=10)
+        assert total == 15
+        assert [user.username for user in users] == [f"test{i}" for i in range(10, 15)]
+
+        keyset = await service.list_users_keyset(limit=3, before_id=users[0].id)
+        assert [user.username for user in keyset] == ["test7", "test8", "test9"]
+
+        updated = await service.update_user(users[0].id, {"email": "new@example.com"})
+        assert updated.email == "new@example.com"
+        with pytest.raises(ValueError):
+            await service.update_user(users[1].id, {"username": "test0"})
+
+        assert await service.delete_user(users[0].id) is True
+        assert await service.delete_user(users[0].id) is False
+
+    run_with_service(scenario)
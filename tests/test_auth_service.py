@@ -1,9 +1,13 @@
+import asyncio
+
 import pytest
 from jose import jwt
 from datetime import timedelta, datetime, timezone
 
 from src.domain.entities.user import User
 from src.domain.services.auth_service import AuthService
+from src.domain.services.hashing_admission import HashingAdmissionController, HashingOverloadedError
+from src.domain.services.password_hasher import HashingExecutor
 
 
 @pytest.fixture
@@ -125,3 +129,72 @@ def test_token_with_additional_claims(auth_service):
     assert payload["username"] == "testuser"
     assert "admin" in payload["roles"]
     assert "user" in payload["roles"]
+
+
+def test_async_password_hashing(auth_service):
+    # Without an executor hashing runs in a worker thread
+    hashed = asyncio.run(auth_service.hash_async("my_secure_password"))
+    assert auth_service.verify_password("my_secure_password", hashed)
+    assert asyncio.run(auth_service.verify_async("my_secure_password", hashed))
+    assert not asyncio.run(auth_service.verify_async("wrong_password", hashed))
+
+
+def test_async_password_hashing_in_process_pool():
+    executor = HashingExecutor(max_workers=1)
+    pooled_service = AuthService(secret_key="test_secret_key", hashing_executor=executor)
+
+    async def scenario():
+        hashed = await pooled_service.hash_async("my_secure_password")
+        user = User(id=1, username="test", email="test@example.com", hashed_password=hashed)
+        assert await pooled_service.authenticate_user_async(user, "my_secure_password") is user
+        assert await pooled_service.authenticate_user_async(user, "wrong_password") is None
+        return hashed
+
+    try:
+        hashed = asyncio.run(scenario())
+    finally:
+        executor.shutdown()
+
+    # Hashes produced in the pool are interchangeable with in-process ones
+    assert pooled_service.verify_password("my_secure_password", hashed)
+
+
+def test_hashing_admission_sheds_load_when_queue_is_full():
+    controller = HashingAdmissionController(max_concurrent=1, max_queue=1, queue_timeout=1.0, retry_after=3)
+
+    async def scenario():
+        await controller.acquire()
+        queued = asyncio.create_task(controller.acquire())
+        await asyncio.sleep(0)
+        assert controller.queue_depth == 1
+
+        # Queue is full: the next caller is rejected immediately
+        with pytest.raises(HashingOverloadedError) as exc_info:
+            await controller.acquire()
+        assert exc_info.value.retry_after == 3
+
+        # Releasing hands the slot to the queued caller
+        controller.release()
+        await queued
+        assert controller.in_flight == 1
+        assert controller.queue_depth == 0
+        controller.release()
+
+    asyncio.run(scenario())
+    assert controller.in_flight == 0
+    assert controller.rejected_total == 1
+
+
+def test_hashing_admission_queue_deadline():
+    controller = HashingAdmissionController(max_concurrent=1, max_queue=4, queue_timeout=0.01)
+
+    async def scenario():
+        async with controller.slot():
+            with pytest.raises(HashingOverloadedError):
+                await controller.acquire()
+        assert controller.queue_depth == 0
+
+    asyncio.run(scenario())
+    assert controller.in_flight == 0
+    assert controller.timed_out_total == 1
+    assert controller.max_wait_seconds > 0
@@ -0,0 +1,118 @@
+import pytest
+
+from src.domain.entities.user import User
+from src.infrastructure.repositories.caching_user_repository import CachingUserRepository, UserCache
+from src.infrastructure.repositories.sqlite_user_repository import SQLiteUserRepository
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class CountingRepository(SQLiteUserRepository):
+    """SQLite repository that counts single-user lookups."""
+
+    def __init__(self, db):
+        super().__init__(db)
+        self.lookups = 0
+
+    def get_by_id(self, user_id):
+        self.lookups += 1
+        return super().get_by_id(user_id)
+
+    def get_by_username(self, username):
+        self.lookups += 1
+        return super().get_by_username(username)
+
+    def get_by_email(self, email):
+        self.lookups += 1
+        return super().get_by_email(email)
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def backend(db):
+    return CountingRepository(db)
+
+
+@pytest.fixture
+def repository(backend, clock):
+    return CachingUserRepository(backend, UserCache(max_size=2, ttl=10, clock=clock))
+
+
+def _create(repository, name):
+    return repository.create(User(username=name, email=f"{name}@example.com", hashed_password="hashed_pw"))
+
+
+def test_hot_reads_are_served_from_cache_by_any_key(repository, backend):
+    user = _create(repository, "alice")
+
+    assert repository.get_by_id(user.id).username == "alice"
+    assert repository.get_by_username("alice").id == user.id
+    assert repository.get_by_email("alice@example.com").id == user.id
+    assert repository.get_by_id(user.id).id == user.id
+
+    assert backend.lookups == 1
+    stats = repository.cache.stats()
+    assert (stats["hits"], stats["misses"]) == (3, 1)
+
+
+def test_returned_users_are_copies(repository):
+    user = _create(repository, "alice")
+    cached = repository.get_by_id(user.id)
+    cached.username = "mutated"
+
+    assert repository.get_by_id(user.id).username == "alice"
+
+
+def test_update_and_delete_invalidate(repository, backend):
+    user = _create(repository, "alice")
+    user = repository.get_by_username("alice")
+
+    user.username = "alicia"
+    repository.update(user)
+    assert repository.get_by_username("alice") is None
+    assert repository.get_by_id(user.id).username == "alicia"
+
+    repository.delete(user.id)
+    assert repository.get_by_id(user.id) is None
+
+
+def test_entries_expire_after_ttl(repository, backend, clock):
+    user = _create(repository, "alice")
+    repository.get_by_id(user.id)
+    clock.now = 11
+    repository.get_by_id(user.id)
+
+    assert backend.lookups == 2
+
+
+def test_least_recently_used_entry_is_evicted(repository, backend):
+    users = [_create(repository, name) for name in ("alice", "bob", "carol")]
+    for user in users:
+        repository.get_by_id(user.id)
+
+    backend.lookups = 0
+    repository.get_by_username("carol")
+    repository.get_by_email("alice@example.com")
+
+    assert backend.lookups == 1
+    assert repository.cache.stats()["evictions"] == 2
+
+
+def test_read_racing_a_write_is_not_cached(repository, backend):
+    user = _create(repository, "alice")
+    generation = repository.cache.generation
+    stale = backend.get_by_id(user.id)
+    repository.cache.invalidate(user.id)
+    repository.cache.put(stale, generation)
+
+    assert repository.cache.stats()["size"] == 0
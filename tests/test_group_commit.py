@@ -0,0 +1,104 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from src.domain.entities.user import User
+from src.infrastructure.database.database import Base
+from src.infrastructure.database.group_commit import GroupCommitWriter
+from src.infrastructure.database.sqlite_tuning import create_tuned_engine
+from src.infrastructure.repositories.group_commit_user_repository import GroupCommitUserRepository
+from src.infrastructure.repositories.sqlite_user_repository import SQLiteUserRepository
+from src.settings import Settings
+
+
+@pytest.fixture
+def database_url(tmp_path):
+    return f"sqlite:///{tmp_path / 'writes.db'}"
+
+
+@pytest.fixture
+def writer_engine(database_url):
+    engine = create_tuned_engine(database_url, Settings(), writer=True)
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def read_engine(database_url, writer_engine):
+    engine = create_tuned_engine(database_url, Settings(), read_only=True)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def writer(writer_engine):
+    writer = GroupCommitWriter(sessionmaker(bind=writer_engine, expire_on_commit=False), max_delay=0.05)
+    yield writer
+    writer.shutdown()
+
+
+@pytest.fixture
+def repository(read_engine, writer):
+    db = sessionmaker(bind=read_engine)()
+    yield GroupCommitUserRepository(db, writer)
+    db.close()
+
+
+def _user(name):
+    return User(username=name, email=f"{name}@example.com", hashed_password="hashed_pw")
+
+
+def test_concurrent_writes_share_commits(repository, writer):
+    start = threading.Barrier(20)
+
+    def create(i):
+        start.wait()
+        return repository.create(_user(f"user{i}"))
+
+    with ThreadPoolExecutor(max_workers=20) as pool:
+        created = list(pool.map(create, range(20)))
+
+    assert sorted(user.username for user in created) == sorted(f"user{i}" for i in range(20))
+    assert repository.count_users() == 20
+    assert writer.stats()["operations_total"] == 20
+    assert writer.stats()["batches_total"] < 20
+
+
+def test_constraint_error_only_fails_its_own_write(repository, writer):
+    repository.create(_user("taken"))
+    futures = [
+        writer.submit(lambda db: SQLiteUserRepository(db, autocommit=False).create(_user("first"))),
+        writer.submit(lambda db: SQLiteUserRepository(db, autocommit=False).create(_user("taken"))),
+        writer.submit(lambda db: SQLiteUserRepository(db, autocommit=False).create(_user("second"))),
+    ]
+
+    assert futures[0].result().username == "first"
+    with pytest.raises(ValueError, match="already exists"):
+        futures[1].result()
+    assert futures[2].result().username == "second"
+    assert repository.count_users(exact=True) == 3
+    assert writer.stats()["replayed_batches"] == 1
+
+
+def test_updates_and_deletes_go_through_the_writer(repository, writer):
+    user = repository.create(_user("alice"))
+    user = repository.get_by_username("alice")
+    user.email = "alice@example.org"
+
+    assert repository.update(user).email == "alice@example.org"
+    assert repository.delete(user.id) is True
+    # The read snapshot taken before the writes was ended by them
+    assert repository.get_by_id(user.id) is None
+    assert writer.stats()["operations_total"] == 3
+
+
+def test_bulk_writes_queue_one_write_per_chunk(repository, writer):
+    users = repository.create_many([_user(f"user{i}") for i in range(5)])
+
+    assert repository.delete_where(user_ids=[user.id for user in users], chunk_size=2) == 5
+    assert repository.count_users() == 0
+    # create_many, then three chunks of ids
+    assert writer.stats()["operations_total"] == 4
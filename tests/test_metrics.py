@@ -0,0 +1,47 @@
+import asyncio
+
+from src.domain.services.auth_service import AuthService
+from src.infrastructure.api.metrics import Histogram, MetricsRegistry
+
+
+def test_histogram_renders_cumulative_buckets():
+    registry = MetricsRegistry()
+    histogram = registry.register(Histogram("latency_seconds", "Latency.", (0.1, 1.0), ("route",)))
+
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.observe(value, ("/users/{user_id}",))
+
+    lines = registry.render().splitlines()
+    assert lines[:2] == ["# HELP latency_seconds Latency.", "# TYPE latency_seconds histogram"]
+    assert lines[2:] == [
+        'latency_seconds_bucket{route="/users/{user_id}",le="0.1"} 2',
+        'latency_seconds_bucket{route="/users/{user_id}",le="1"} 3',
+        'latency_seconds_bucket{route="/users/{user_id}",le="+Inf"} 4',
+        'latency_seconds_sum{route="/users/{user_id}"} 3.65',
+        'latency_seconds_count{route="/users/{user_id}"} 4',
+    ]
+
+
+def test_metrics_endpoint_labels_requests_by_route_template(client, auth_headers):
+    client.get("/users/424242", headers=auth_headers)
+    client.get("/no-such-page")
+
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert 'http_request_duration_seconds_count{method="GET",route="/users/{user_id}",status="404"}' in response.text
+    assert 'route="unmatched"' in response.text
+    assert "/users/424242" not in response.text
+    assert "# TYPE db_pool_checkouts_total counter" in response.text
+
+
+def test_auth_service_reports_hashing_durations():
+    observed = []
+    auth_service = AuthService(secret_key="test_secret_key", observe_hashing=lambda *args: observed.append(args))
+
+    hashed = asyncio.run(auth_service.hash_async("password123"))
+    assert asyncio.run(auth_service.verify_async("password123", hashed))
+
+    assert [operation for operation, _ in observed] == ["hash", "verify"]
+    assert all(seconds > 0 for _, seconds in observed)
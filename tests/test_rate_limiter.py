@@ -0,0 +1,193 @@
+import asyncio
+import sqlite3
+import threading
+import time
+
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from src.infrastructure.api.middlewares import RateLimitMiddleware
+from src.infrastructure.api.rate_limiter import InMemoryRateLimitStore, RateLimiter, SQLiteRateLimitStore
+
+
+def test_token_bucket_refills_over_time():
+    limiter = RateLimiter(requests_limit=10, window_size=10, algorithm="token_bucket")
+
+    for _ in range(10):
+        assert limiter.hit("client", now=100.0).allowed
+
+    decision = limiter.hit("client", now=100.0)
+    assert not decision.allowed
+    assert decision.remaining == 0
+    assert decision.retry_after == pytest.approx(1.0)
+
+    # One token per second comes back
+    assert limiter.hit("client", now=101.0).allowed
+    assert not limiter.hit("client", now=101.0).allowed
+
+
+def test_sliding_window_weights_previous_window():
+    limiter = RateLimiter(requests_limit=10, window_size=60, algorithm="sliding_window")
+
+    for _ in range(10):
+        assert limiter.hit("client", now=30.0).allowed
+    assert not limiter.hit("client", now=59.0).allowed
+
+    # Halfway into the next window half of the previous count still applies
+    for _ in range(5):
+        assert limiter.hit("client", now=90.0).allowed
+    decision = limiter.hit("client", now=90.0)
+    assert not decision.allowed
+    assert decision.retry_after > 0
+
+    # Two windows later the key starts from scratch
+    assert limiter.hit("client", now=200.0).remaining == 9
+
+
+def test_weighted_cost_is_not_charged_when_denied():
+    limiter = RateLimiter(requests_limit=5, window_size=60)
+
+    assert limiter.hit("client", cost=4, now=0.0).allowed
+    assert not limiter.hit("client", cost=4, now=0.0).allowed
+    assert limiter.hit("client", cost=1, now=0.0).allowed
+
+
+def test_store_expires_idle_keys_and_caps_tracked_keys():
+    store = InMemoryRateLimitStore(max_keys=3)
+    limiter = RateLimiter(requests_limit=1, window_size=10, algorithm="token_bucket", store=store)
+
+    for i in range(5):
+        limiter.hit(f"client{i}", now=0.0)
+    assert len(store) == 3
+    assert store.evicted_total == 2
+
+    # Idle keys disappear once their TTL has passed
+    limiter.hit("fresh", now=20.0)
+    assert len(store) == 1
+
+
+def test_unknown_algorithm_is_rejected():
+    with pytest.raises(ValueError):
+        RateLimiter(requests_limit=1, window_size=1, algorithm="leaky")
+
+
+def test_sqlite_store_enforces_one_budget_across_workers(tmp_path):
+    path = str(tmp_path / "rate_limits.db")
+    # Separate stores stand in for separate worker processes
+    worker_a = RateLimiter(5, 60, store=SQLiteRateLimitStore(path))
+    worker_b = RateLimiter(5, 60, store=SQLiteRateLimitStore(path))
+
+    allowed = [worker.hit("client", now=1000.0).allowed for worker in (worker_a, worker_b) * 4]
+    assert allowed.count(True) == 5
+    assert allowed[5:] == [False, False, False]
+
+
+def test_sqlite_store_expires_and_caps_keys(tmp_path):
+    store = SQLiteRateLimitStore(str(tmp_path / "rate_limits.db"), max_keys=2, cleanup_interval=0)
+    limiter = RateLimiter(1, 10, algorithm="token_bucket", store=store)
+
+    for i in range(4):
+        limiter.hit(f"client{i}", now=float(i))
+    assert len(store) <= 3
+
+    limiter.hit("fresh", now=100.0)
+    assert len(store) == 1
+
+
+def test_sqlite_store_fails_open_quickly_off_the_event_loop(tmp_path):
+    path = str(tmp_path / "rate_limits.db")
+    store = SQLiteRateLimitStore(path, busy_timeout_ms=20)
+    limiter = RateLimiter(1, 60, store=store)
+    limiter.hit("client")
+
+    threads = []
+    apply = store.apply
+    store.apply = lambda *args: threads.append(threading.get_ident()) or apply(*args)
+
+    # Another worker holding the write lock
+    other = sqlite3.connect(path, isolation_level=None)
+    other.execute("BEGIN IMMEDIATE")
+    try:
+        started = time.monotonic()
+        decision = asyncio.run(limiter.hit_async("client"))
+        assert time.monotonic() - started < 0.5
+        # Over the limit, but let through because the store was busy
+        assert decision.allowed
+        assert threads and threads[0] != threading.get_ident()
+    finally:
+        other.execute("ROLLBACK")
+        other.close()
+
+
+def make_client(**options):
+    async def ok(request):
+        return PlainTextResponse("ok")
+
+    async def bulk(request):
+        # Stands in for an endpoint that learns its item count from the body
+        decision = await request.state.rate_limit.charge_items(int(request.query_params["items"]) - 1)
+        return PlainTextResponse("ok" if decision.allowed else "over", status_code=200 if decision.allowed else 429)
+
+    app = Starlette(routes=[
+        Route("/cheap", ok),
+        Route("/login", ok, methods=["POST"]),
+        Route("/bulk", bulk, methods=["POST"]),
+    ])
+    app.add_middleware(RateLimitMiddleware, **options)
+    return TestClient(app)
+
+
+def test_middleware_weights_routes_into_separate_groups():
+    rejected = []
+    client = make_client(
+        groups={"default": (3, 60), "hashing": (10, 60)},
+        routes={"POST /login": ("hashing", 5)},
+        on_rejected=rejected.append,
+    )
+
+    assert client.post("/login").status_code == 200
+    assert client.post("/login").status_code == 200
+    response = client.post("/login")
+    assert response.status_code == 429
+    assert response.text == "Rate limit exceeded"
+    assert int(response.headers["Retry-After"]) > 0
+    assert rejected == ["hashing"]
+
+    # The cheap group keeps its own budget
+    response = client.get("/cheap")
+    assert response.status_code == 200
+    assert response.headers["X-RateLimit-Limit"] == "3"
+    assert response.headers["X-RateLimit-Remaining"] == "2"
+
+
+def test_middleware_keys_authenticated_requests_by_user():
+    client = make_client(
+        requests_limit=1,
+        identify=lambda token: {"token-a": 1, "token-b": 2}.get(token),
+    )
+
+    assert client.get("/cheap", headers={"Authorization": "Bearer token-a"}).status_code == 200
+    assert client.get("/cheap", headers={"Authorization": "Bearer token-a"}).status_code == 429
+    assert client.get("/cheap", headers={"Authorization": "Bearer token-b"}).status_code == 200
+    # Invalid tokens fall back to the client address
+    assert client.get("/cheap", headers={"Authorization": "Bearer junk"}).status_code == 200
+    assert client.get("/cheap").status_code == 429
+
+
+def test_middleware_lets_endpoints_charge_per_item():
+    rejected = []
+    client = make_client(
+        groups={"hashing": (10, 60)},
+        routes={"POST /bulk": ("hashing", 2)},
+        on_rejected=rejected.append,
+    )
+
+    assert client.post("/bulk", params={"items": 3}).status_code == 200
+    # Admission brings the budget to 8 of 10, so two more items do not fit
+    assert client.post("/bulk", params={"items": 3}).status_code == 429
+    assert rejected == ["hashing"]
+    # A single item is fully paid for on admission
+    assert client.post("/bulk", params={"items": 1}).status_code == 200
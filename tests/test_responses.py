@@ -0,0 +1,36 @@
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi.encoders import jsonable_encoder
+
+from src.application.dtos.user_dto import UserResponse, UsersPage
+from src.infrastructure.api import responses
+from src.infrastructure.api.responses import ModelJSONResponse
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_model_response_matches_default_encoding(monkeypatch, use_orjson):
+    if not use_orjson:
+        monkeypatch.setattr(responses, "orjson", None)
+    timestamps = [
+        datetime(2024, 1, 2, 3, 4, 5, 678901),
+        datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc),
+        datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone(timedelta(hours=2))),
+    ]
+    page = UsersPage(
+        items=[
+            UserResponse(
+                id=i, username=f"user{i}", email=f"user{i}@example.com", is_active=True,
+                created_at=created_at, updated_at=created_at,
+            )
+            for i, created_at in enumerate(timestamps)
+        ],
+        total=3, page=1, size=10, pages=1,
+    )
+
+    response = ModelJSONResponse(page, status_code=201)
+
+    assert response.status_code == 201
+    assert response.headers["content-type"] == "application/json"
+    assert json.loads(response.body) == jsonable_encoder(page)
@@ -0,0 +1,67 @@
+import os
+import signal
+import socket
+
+from fastapi import FastAPI
+
+from src.serve import SHUTDOWN_MARGIN, Supervisor, bind_socket, server_config, worker_settings
+from src.settings import Settings
+
+
+def test_server_config_reads_settings():
+    settings = Settings(
+        server_port=9000,
+        server_backlog=64,
+        server_keep_alive=9,
+        server_http="h11",
+        server_limit_concurrency=0,
+        server_graceful_timeout=7,
+        server_access_log=False,
+    )
+
+    config = server_config(FastAPI(), settings)
+
+    assert (config.port, config.backlog, config.timeout_keep_alive) == (9000, 64, 9)
+    assert config.http == "h11"
+    assert config.limit_concurrency is None
+    assert config.timeout_graceful_shutdown == 7
+    assert config.access_log is False
+
+
+def test_bound_socket_is_tcp_so_accepted_connections_get_nodelay():
+    sock = bind_socket("127.0.0.1", 0, backlog=16)
+    try:
+        assert sock.proto == socket.IPPROTO_TCP
+        assert sock.get_inheritable()
+    finally:
+        sock.close()
+
+
+def test_worker_settings_share_out_per_process_defaults():
+    settings = worker_settings(Settings(), workers=4)
+
+    assert settings.hashing_workers == max(1, (os.cpu_count() or 1) // 4)
+    assert settings.rate_limit_storage == "sqlite"
+
+    # Explicit choices and single-worker setups are left alone
+    explicit = worker_settings(Settings(hashing_workers=3, rate_limit_storage="memory"), workers=4)
+    assert (explicit.hashing_workers, explicit.rate_limit_storage) == (3, "memory")
+    assert worker_settings(Settings(), workers=1).rate_limit_storage == "memory"
+
+
+def test_supervisor_shutdown_tolerates_workers_that_already_exited():
+    # A pid that is gone by the time the supervisor kills it
+    pid = os.fork()
+    if pid == 0:
+        os._exit(0)
+    os.waitpid(pid, 0)
+
+    handlers = {sig: signal.getsignal(sig) for sig in (signal.SIGINT, signal.SIGTERM)}
+    try:
+        supervisor = Supervisor(config=None, sock=None, workers=0, graceful_timeout=-SHUTDOWN_MARGIN)
+        supervisor.stopping = True
+        supervisor.children[pid] = 0.0
+        assert supervisor.run() == 0
+    finally:
+        for sig, handler in handlers.items():
+            signal.signal(sig, handler)
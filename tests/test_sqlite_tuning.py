@@ -0,0 +1,72 @@
+from sqlalchemy import text
+from sqlalchemy.orm import sessionmaker
+
+from src.domain.entities.user import User
+from src.infrastructure.database.database import Base, RoutingSession
+from src.infrastructure.database.sqlite_tuning import create_tuned_engine, describe_engine, pool_options
+from src.infrastructure.repositories.sqlite_user_repository import SQLiteUserRepository
+from src.settings import Settings
+
+
+def test_tuning_profile_is_applied_to_every_connection(tmp_path):
+    settings = Settings(sqlite_mmap_size=1_048_576, sqlite_busy_timeout=1234, db_pool_size=3)
+    engine = create_tuned_engine(f"sqlite:///{tmp_path / 'tuned.db'}", settings)
+
+    profile = describe_engine(engine)
+
+    assert profile["journal_mode"] == "wal"
+    assert profile["synchronous"] == "NORMAL"
+    assert profile["mmap_size"] == 1_048_576
+    assert profile["busy_timeout"] == 1234
+    assert profile["temp_store"] == "MEMORY"
+    assert (profile["pool"], profile["pool_size"]) == ("QueuePool", 3)
+    engine.dispose()
+
+
+def test_readers_and_writer_do_not_block_each_other(tmp_path):
+    engine = create_tuned_engine(f"sqlite:///{tmp_path / 'tuned.db'}", Settings(sqlite_busy_timeout=0))
+    with engine.begin() as connection:
+        connection.execute(text("CREATE TABLE items (id INTEGER PRIMARY KEY)"))
+        connection.execute(text("INSERT INTO items VALUES (1)"))
+
+    with engine.connect() as reader, engine.connect() as writer:
+        reader.execute(text("BEGIN"))
+        assert reader.execute(text("SELECT COUNT(*) FROM items")).scalar() == 1
+
+        # With a rollback journal this commit would fail with "database is locked"
+        writer.execute(text("BEGIN IMMEDIATE"))
+        writer.execute(text("INSERT INTO items VALUES (2)"))
+        writer.execute(text("COMMIT"))
+
+        # The open read transaction keeps its snapshot
+        assert reader.execute(text("SELECT COUNT(*) FROM items")).scalar() == 1
+        reader.execute(text("COMMIT"))
+    engine.dispose()
+
+
+def test_in_memory_databases_keep_default_pools():
+    assert pool_options("sqlite:///:memory:", Settings()) == {}
+    assert pool_options("sqlite://", Settings()) == {}
+
+
+def test_routing_session_reads_from_the_pool_while_the_writer_is_busy(tmp_path):
+    url = f"sqlite:///{tmp_path / 'split.db'}"
+    settings = Settings(sqlite_busy_timeout=0, db_pool_timeout=0.1)
+    writer = create_tuned_engine(url, settings, writer=True)
+    Base.metadata.create_all(bind=writer)
+    reader = create_tuned_engine(url, settings, read_only=True)
+    Session = sessionmaker(class_=RoutingSession, writer=writer, reader=reader)
+
+    with Session() as db:
+        created = SQLiteUserRepository(db).create(
+            User(username="alice", email="alice@example.com", hashed_password="hashed_pw")
+        )
+
+    assert describe_engine(reader)["query_only"] is True
+    with writer.begin():
+        # The only writer connection is checked out and holds the write lock
+        with Session() as db:
+            assert SQLiteUserRepository(db).get_by_username("alice").id == created.id
+
+    writer.dispose()
+    reader.dispose()
@@ -0,0 +1,153 @@
+from datetime import datetime
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.exc import IntegrityError
+
+from src.domain.entities.user import User, UserView
+from src.infrastructure.repositories.sqlite_user_repository import SQLiteUserRepository
+
+
+def record_statements(db):
+    """Collect the SQL sent on ``db``'s connection, minus the fixture's savepoint bookkeeping."""
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        if statement.split()[0] not in ("SAVEPOINT", "RELEASE", "ROLLBACK"):
+            statements.append(statement)
+
+    event.listen(db.get_bind(), "before_cursor_execute", record)
+    return statements
+
+
+def create_users(repository, count, prefix="user"):
+    return [
+        repository.create(User(username=f"{prefix}{i}", email=f"{prefix}{i}@example.com", hashed_password="hashed_pw"))
+        for i in range(count)
+    ]
+
+
+def test_maintained_user_count_tracks_writes(db):
+    repository = SQLiteUserRepository(db)
+    users = create_users(repository, 5)
+
+    users[0].is_active = False
+    repository.update(users[0])
+    repository.delete(users[1].id)
+
+    assert repository.count_users() == 4
+    assert repository.count_users(is_active=True) == 3
+    assert repository.count_users(is_active=False) == 1
+    for is_active in (None, True, False):
+        assert repository.count_users(is_active=is_active) == repository.count_users(is_active=is_active, exact=True)
+
+    _, total = repository.list_users(skip=0, limit=2)
+    assert total == 4
+
+
+def test_listings_select_view_columns_without_orm_objects(db):
+    repository = SQLiteUserRepository(db)
+    users = create_users(repository, 3)
+    statements = record_statements(db)
+
+    page, total = repository.list_users(skip=1, limit=5)
+    keyset = repository.list_users_keyset(limit=1, before_id=users[2].id)
+
+    assert page == [
+        UserView(user.id, user.username, user.email, True, user.created_at, user.updated_at) for user in users[1:]
+    ]
+    assert keyset[0].username == "user1"
+    assert not any("hashed_password" in statement for statement in statements)
+    assert len(db.identity_map) == 0
+    assert repository.get_by_username("user0").hashed_password == "hashed_pw"
+
+
+def test_create_many_and_find_existing_identities(db):
+    repository = SQLiteUserRepository(db)
+    users = [
+        User(username=f"bulk{i}", email=f"bulk{i}@example.com", hashed_password="hashed_pw")
+        for i in range(3)
+    ]
+
+    created = repository.create_many(users)
+    assert [user.username for user in created] == ["bulk0", "bulk1", "bulk2"]
+    assert all(user.id is not None for user in created)
+    assert repository.count_users() == 3
+
+    usernames, emails = repository.find_existing_identities(["bulk1", "nobody"], ["bulk2@example.com"])
+    assert usernames == {"bulk1", "bulk2"}
+    assert emails == {"bulk1@example.com", "bulk2@example.com"}
+
+
+@pytest.mark.parametrize(
+    "username, email, message",
+    [
+        ("other", "alice@example.com", "User with email alice@example.com already exists"),
+        ("alice", "other@example.com", "User with username alice already exists"),
+    ],
+)
+def test_create_maps_unique_violations_to_value_errors(db, username, email, message):
+    repository = SQLiteUserRepository(db)
+    repository.create(User(username="alice", email="alice@example.com", hashed_password="hashed_pw"))
+
+    with pytest.raises(ValueError, match=message):
+        repository.create(User(username=username, email=email, hashed_password="hashed_pw"))
+
+
+def test_update_fields_sets_only_given_columns_in_one_statement(db):
+    repository = SQLiteUserRepository(db)
+    user = repository.create(User(username="alice", email="alice@example.com", hashed_password="hashed_pw"))
+    statements = record_statements(db)
+
+    updated = repository.update_fields(user.id, {"email": "alice@example.org", "id": 99})
+
+    assert [statement.split()[0] for statement in statements] == ["UPDATE"]
+    assert (updated.id, updated.username, updated.email) == (user.id, "alice", "alice@example.org")
+    assert updated.hashed_password == "hashed_pw"
+    assert repository.update_fields(12345, {"email": "nobody@example.com"}) is None
+
+
+def test_update_fields_maps_unique_violations_to_value_errors(db):
+    repository = SQLiteUserRepository(db)
+    repository.create(User(username="alice", email="alice@example.com", hashed_password="hashed_pw"))
+    bob = repository.create(User(username="bob", email="bob@example.com", hashed_password="hashed_pw"))
+
+    with pytest.raises(ValueError, match="User with username alice already exists"):
+        repository.update_fields(bob.id, {"username": "alice"})
+
+    # A NOT NULL violation on the same column is not reported as a duplicate
+    with pytest.raises(IntegrityError):
+        repository.update_fields(bob.id, {"username": None})
+
+
+def test_delete_is_a_single_statement(db):
+    repository = SQLiteUserRepository(db)
+    user = create_users(repository, 1)[0]
+    statements = record_statements(db)
+
+    assert repository.delete(user.id) is True
+    assert repository.delete(user.id) is False
+    assert [statement.split()[0] for statement in statements] == ["DELETE", "DELETE"]
+
+
+def test_bulk_writes_run_one_statement_per_chunk(db):
+    repository = SQLiteUserRepository(db)
+    users = create_users(repository, 5)
+    statements = record_statements(db)
+
+    ids = [user.id for user in users[:3]] + [12345]
+    changes = {"is_active": False, "updated_at": users[0].updated_at}
+    assert repository.update_fields_where(changes, user_ids=ids, is_active=True, chunk_size=2) == 3
+    assert [statement.split()[0] for statement in statements] == ["UPDATE", "UPDATE"]
+    # Already inactive users no longer match
+    assert repository.update_fields_where(changes, user_ids=ids, is_active=True) == 0
+
+    statements.clear()
+    far_future = datetime(2999, 1, 1)
+    assert repository.delete_where(created_before=far_future, is_active=False, chunk_size=2) == 3
+    # Two full windows, then an empty one ends the walk
+    assert [statement.split()[0] for statement in statements] == ["DELETE", "DELETE", "DELETE"]
+
+    assert [user.username for user in repository.list_users()[0]] == ["user3", "user4"]
+    for is_active in (None, True, False):
+        assert repository.count_users(is_active=is_active) == repository.count_users(is_active=is_active, exact=True)
@@ -0,0 +1,63 @@
+from datetime import timedelta
+
+from src.domain.services.auth_service import AuthService
+from src.infrastructure.api.token_cache import VerifiedTokenCache, verify_access_token
+
+
+class FakeVerifier:
+    """Accepts tokens named "user<id>", all expiring at ``exp``."""
+
+    def __init__(self, exp=100.0):
+        self.exp = exp
+        self.calls = 0
+
+    def __call__(self, token):
+        self.calls += 1
+        if not token.startswith("user"):
+            return None
+        return int(token[4:]), self.exp
+
+
+def test_repeated_tokens_skip_verification_until_they_expire():
+    now = [0.0]
+    verifier = FakeVerifier(exp=100.0)
+    cache = VerifiedTokenCache(verifier, clock=lambda: now[0])
+
+    assert [cache.user_id("user7") for _ in range(3)] == [7, 7, 7]
+    assert verifier.calls == 1
+
+    now[0] = 100.0
+    verifier.exp = 200.0
+    assert cache.user_id("user7") == 7
+    assert verifier.calls == 2
+    assert cache.stats()["hits"] == 2
+    assert cache.stats()["expirations"] == 1
+
+
+def test_invalid_tokens_are_not_cached_and_size_is_capped():
+    verifier = FakeVerifier()
+    cache = VerifiedTokenCache(verifier, max_size=2, clock=lambda: 0.0)
+
+    assert cache.user_id("forged") is None
+    assert cache.user_id("forged") is None
+    for token in ("user1", "user2", "user1", "user3"):
+        cache.user_id(token)
+
+    assert verifier.calls == 5
+    assert cache.stats()["size"] == 2
+    assert cache.stats()["evictions"] == 1
+    # user2 was least recently used
+    cache.user_id("user1")
+    cache.user_id("user2")
+    assert verifier.calls == 6
+
+
+def test_verify_access_token_returns_user_and_expiry():
+    auth_service = AuthService(secret_key="test_secret_key")
+    token = auth_service.create_access_token(data={"sub": "42"})
+    expired = auth_service.create_access_token(data={"sub": "42"}, expires_delta=timedelta(seconds=-1))
+
+    user_id, exp = verify_access_token(token, "test_secret_key", "HS256")
+    assert user_id == 42 and exp > 0
+    assert verify_access_token(token, "other_secret", "HS256") is None
+    assert verify_access_token(expired, "test_secret_key", "HS256") is None
@@ -1,8 +1,13 @@
+import asyncio
+import inspect
 from datetime import datetime
 from unittest.mock import MagicMock
 
 import pytest
 
+from src.application.dtos.user_dto import UserCreate
+from src.application.use_cases.user_import_use_case import UserImportUseCase
+from src.application.use_cases.user_use_case import UserUseCase
 from src.domain.entities.user import User
 from src.domain.services.user_service import UserService
 
@@ -13,11 +18,24 @@ class MockUserRepository:
         self.next_id = 1
         
     def create(self, user):
+        # Mirrors the unique indexes on email and username
+        if self.get_by_email(user.email):
+            raise ValueError(f"User with email {user.email} already exists")
+        if self.get_by_username(user.username):
+            raise ValueError(f"User with username {user.username} already exists")
         user.id = self.next_id
         self.next_id += 1
         self.users[user.id] = user
         return user
         
+    def create_many(self, users):
+        return [self.create(user) for user in users]
+
+    def find_existing_identities(self, usernames, emails):
+        usernames, emails = set(usernames), set(emails)
+        matches = [user for user in self.users.values() if user.username in usernames or user.email in emails]
+        return {user.username for user in matches}, {user.email for user in matches}
+
     def get_by_id(self, user_id):
         return self.users.get(user_id)
         
@@ -39,16 +57,36 @@ class MockUserRepository:
             return user
         return None
         
+    def update_fields(self, user_id, changes):
+        user = self.users.get(user_id)
+        if user is None:
+            return None
+        # Mirrors the unique indexes on email and username
+        for field in ("email", "username"):
+            if field in changes:
+                for other in self.users.values():
+                    if other.id != user_id and getattr(other, field) == changes[field]:
+                        raise ValueError(f"User with {field} {changes[field]} already exists")
+        for key, value in changes.items():
+            setattr(user, key, value)
+        return user
+
     def delete(self, user_id):
         if user_id in self.users:
             del self.users[user_id]
             return True
         return False
         
-    def list_users(self, skip, limit):
+    def list_users(self, skip, limit, exact=False):
         all_users = list(self.users.values())
         return all_users[skip:skip+limit], len(all_users)
 
+    def list_users_keyset(self, limit, after_id=None, before_id=None):
+        all_users = sorted(self.users.values(), key=lambda user: user.id)
+        if before_id is not None:
+            return [user for user in all_users if user.id < before_id][-limit:]
+        return [user for user in all_users if after_id is None or user.id > after_id][:limit]
+
 
 @pytest.fixture
 def user_repository():
@@ -261,3 +299,101 @@ def test_create_user_with_existing_inactive_user(user_service, user_repository):
     # Current implementation will still reject this even though the existing user is inactive
     with pytest.raises(ValueError):
         user_service.create_user(new_user)
+
+
+def test_list_users_keyset(user_service, user_repository):
+    for i in range(5):
+        user = User(username=f"test{i}", email=f"test{i}@example.com", hashed_password="hashed_pw")
+        user_repository.create(user)
+
+    first = user_service.list_users_keyset(limit=2)
+    assert [user.id for user in first] == [1, 2]
+
+    after = user_service.list_users_keyset(limit=2, after_id=2)
+    assert [user.id for user in after] == [3, 4]
+
+    before = user_service.list_users_keyset(limit=2, before_id=3)
+    assert [user.id for user in before] == [1, 2]
+
+
+def test_create_users_reports_conflicts_per_item(user_service, user_repository):
+    user_repository.create(User(username="existing", email="existing@example.com", hashed_password="hashed_pw"))
+
+    results = user_service.create_users([
+        User(username="new1", email="new1@example.com", hashed_password="hashed_pw"),
+        User(username="existing", email="other@example.com", hashed_password="hashed_pw"),
+        User(username="new2", email="new1@example.com", hashed_password="hashed_pw"),
+        User(username="new3", email="new3@example.com", hashed_password="hashed_pw"),
+    ])
+
+    assert [result.username for result in (results[0], results[3])] == ["new1", "new3"]
+    assert isinstance(results[1], ValueError)
+    assert isinstance(results[2], ValueError)
+    assert len(user_repository.users) == 3
+
+
+def recording_auth_service(hashed):
+    auth_service = MagicMock()
+
+    async def hash_many_async(passwords):
+        hashed.extend(passwords)
+        return [f"hashed-{password}" for password in passwords]
+
+    auth_service.hash_many_async = hash_many_async
+    return auth_service
+
+
+def test_bulk_create_hashes_only_insertable_items(user_service, user_repository):
+    user_repository.create(User(username="existing", email="existing@example.com", hashed_password="hashed_pw"))
+    hashed = []
+    use_case = UserUseCase(user_service, recording_auth_service(hashed))
+
+    response = asyncio.run(use_case.create_users([
+        UserCreate(username="existing", email="a@example.com", password="password-a"),
+        UserCreate(username="fresh", email="b@example.com", password="password-b"),
+        UserCreate(username="fresh", email="c@example.com", password="password-c"),
+    ]))
+
+    assert hashed == ["password-b"]
+    assert response.created == 1
+    assert user_repository.get_by_username("fresh").hashed_password == "hashed-password-b"
+
+
+def test_import_hashes_only_insertable_rows_within_bounds(user_service, user_repository):
+    user_repository.create(User(username="existing", email="existing@example.com", hashed_password="hashed_pw"))
+    hashed, admitted = [], []
+
+    async def admit_hashes(count):
+        admitted.append(count)
+        return len(admitted) == 1
+
+    use_case = UserImportUseCase(
+        user_service, recording_auth_service(hashed), chunk_size=3, max_plain_passwords=3, admit_hashes=admit_hashes
+    )
+    rows = [
+        {"username": "existing", "email": "a@example.com", "password": "password-a"},
+        {"username": "user-b", "email": "b@example.com", "password": "password-b"},
+        {"username": "user-c", "email": "c@example.com", "password": "password-c"},
+        # Second chunk: one more fits max_plain_passwords and is then refused by admit_hashes
+        {"username": "user-d", "email": "d@example.com", "password": "password-d"},
+        {"username": "user-e", "email": "e@example.com", "password": "password-e"},
+        {"username": "user-f", "email": "f@example.com", "password": "password-f"},
+    ]
+
+    async def run():
+        return [event async for event in use_case.import_users(enumerate(rows, 1))]
+
+    events = asyncio.run(run())
+
+    assert hashed == ["password-b", "password-c"]
+    assert admitted == [2, 1]
+    assert events[-1] == {"type": "summary", "processed": 6, "imported": 2, "rejected": 4}
+
+
+def test_sync_use_case_only_hashing_methods_are_coroutines():
+    # The documented contract run_use_case relies on to dispatch each method
+    coroutines = {
+        name for name, method in inspect.getmembers(UserUseCase, inspect.isfunction)
+        if not name.startswith("_") and inspect.iscoroutinefunction(method)
+    }
+    assert coroutines == {"create_user", "create_users", "update_user"}